@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+Launcher for headless batch translation (JSONL in, JSONL out)
+This script can be run from the project root directory
+"""
+
+import sys
+from pathlib import Path
+
+# Add the virtual environment to the path
+venv_path = Path(__file__).parent / ".venv" / "Lib" / "site-packages"
+if venv_path.exists():
+    sys.path.insert(0, str(venv_path))
+
+# Add src directory to path
+src_path = Path(__file__).parent / "src"
+if src_path.exists():
+    sys.path.insert(0, str(src_path))
+
+# Translation worker processes re-import this module; only the launch runs the CLI
+if __name__ == "__main__":
+    # Import and run the CLI (Tk is never imported)
+    from argos_translate_cli import main
+    
+    sys.exit(main())
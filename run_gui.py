@@ -18,15 +18,22 @@ src_path = Path(__file__).parent / "src"
 if src_path.exists():
     sys.path.insert(0, str(src_path))
 
-# Import and run the GUI
-try:
-    from argos_translate_gui_safe import main
+
+def main():
+    """Import and run the GUI"""
+    try:
+        from argos_translate_gui_safe import main as run_gui
+        run_gui()
+    except ImportError as e:
+        print(f"Error: {e}")
+        print("Please ensure Argos Translate is installed in the virtual environment")
+        print("You can install it with: pip install argostranslate")
+        input("Press Enter to exit...")
+    except Exception as e:
+        print(f"Unexpected error: {e}")
+        input("Press Enter to exit...")
+
+
+# Translation worker processes re-import this module; only the launch runs main()
+if __name__ == "__main__":
     main()
-except ImportError as e:
-    print(f"Error: {e}")
-    print("Please ensure Argos Translate is installed in the virtual environment")
-    print("You can install it with: pip install argostranslate")
-    input("Press Enter to exit...")
-except Exception as e:
-    print(f"Unexpected error: {e}")
-    input("Press Enter to exit...")
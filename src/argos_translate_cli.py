@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Argos Translate CLI
+Headless batch translation: JSONL requests in, JSONL results out (no Tk needed)
+
+Each input line is a JSON object such as
+    {"id": "a1", "q": "Hello world.", "source": "en", "target": "es"}
+and produces one output line such as
+    {"id": "a1", "translatedText": "Hola mundo.", "source": "en", "target": "es"}
+"source"/"target" fall back to --from/--to, "text" is accepted for "q" and
+"id" defaults to the line number. Failed requests produce {"id": ..., "error": ...}.
+
+With --serve, the engine is exposed over a local HTTP API instead (see translation_server).
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from batch_scheduler import BatchScheduler
+from gui_settings import get_engine_options, load_gui_settings
+from text_segmentation import join_segments, split_sentences
+from translation_engine import TranslationEngine, settings
+from translation_memory import TranslationMemory
+from translation_server import serve
+
+# Requests read (and results held) at a time; keeps memory bounded on huge inputs
+DEFAULT_CHUNK_SIZE = 64
+
+
+def read_requests(lines: Iterable[str], default_from: Optional[str] = None,
+                  default_to: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Parse JSONL request lines lazily, yielding normalized requests.
+    
+    Malformed lines are yielded with an "error" key so they still get a result.
+    """
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+            if not isinstance(data, dict):
+                raise ValueError("request must be a JSON object")
+            text = data.get('q', data.get('text'))
+            if not isinstance(text, str):
+                raise ValueError("missing text ('q')")
+            request = {
+                'id': data.get('id', line_number),
+                'q': text,
+                'source': data.get('source', default_from),
+                'target': data.get('target', default_to),
+            }
+            if not request['source'] or not request['target']:
+                raise ValueError("missing source or target language")
+            yield request
+        except ValueError as e:
+            yield {'id': line_number, 'error': f"Invalid request: {e}"}
+
+
+def translate_chunk(scheduler: BatchScheduler, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Translate a chunk of requests, batching the sentences of each language pair together"""
+    results: List[Optional[Dict[str, Any]]] = [None] * len(requests)
+    
+    # Group requests by pair so one engine call covers every sentence of the pair
+    groups: Dict[Tuple[str, str], List[int]] = {}
+    for index, request in enumerate(requests):
+        if 'error' in request:
+            results[index] = request
+        else:
+            groups.setdefault((request['source'], request['target']), []).append(index)
+    
+    # Pairs are submitted together so the scheduler translates them concurrently
+    submitted = []
+    for (from_code, to_code), indices in groups.items():
+        segmented = [split_sentences(requests[index]['q'], from_code) for index in indices]
+        sentences = [segment.text for segments in segmented for segment in segments]
+        if from_code == to_code:
+            future = BatchScheduler.completed(sentences)
+        else:
+            future = scheduler.submit(sentences, from_code, to_code)
+        submitted.append((from_code, to_code, indices, segmented, future))
+    
+    for from_code, to_code, indices, segmented, future in submitted:
+        try:
+            translations = future.result()
+        except Exception as e:
+            for index in indices:
+                results[index] = {'id': requests[index]['id'], 'error': str(e)}
+            continue
+        
+        position = 0
+        for index, segments in zip(indices, segmented):
+            request = requests[index]
+            translated = translations[position:position + len(segments)]
+            position += len(segments)
+            results[index] = {
+                'id': request['id'],
+                'translatedText': join_segments(request['q'], segments, translated),
+                'source': from_code,
+                'target': to_code,
+            }
+    return results
+
+
+def run(input_stream: TextIO, output_stream: TextIO, scheduler: BatchScheduler,
+        default_from: Optional[str] = None, default_to: Optional[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """Stream requests from input_stream to output_stream chunk by chunk.
+    
+    Returns:
+        The number of failed requests.
+    """
+    failed = 0
+    chunk: List[Dict[str, Any]] = []
+    
+    def flush():
+        nonlocal failed
+        for result in translate_chunk(scheduler, chunk):
+            failed += 'error' in result
+            output_stream.write(json.dumps(result, ensure_ascii=False) + "\n")
+        output_stream.flush()
+        chunk.clear()
+    
+    for request in read_requests(input_stream, default_from, default_to):
+        chunk.append(request)
+        if len(chunk) >= chunk_size:
+            flush()
+    if chunk:
+        flush()
+    return failed
+
+
+def create_engine(use_memory: bool = True) -> TranslationEngine:
+    """Create an engine with the GUI's performance settings and translation memory"""
+    gui_settings = load_gui_settings()
+    memory = None
+    if use_memory:
+        memory = TranslationMemory(
+            Path(settings.cache_dir) / "translation_memory.sqlite3",
+            gui_settings['memory_cache_mb'],
+            gui_settings['disk_cache_mb']
+        )
+    engine = TranslationEngine(memory=memory)
+    engine.configure(**get_engine_options(gui_settings))
+    engine.load_languages()
+    return engine
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main function to run headless batch translation"""
+    parser = argparse.ArgumentParser(description="Translate JSONL requests without starting the GUI")
+    parser.add_argument('input', nargs='?', default='-', help="JSONL request file (default: stdin)")
+    parser.add_argument('-o', '--output', default='-', help="JSONL result file (default: stdout)")
+    parser.add_argument('-f', '--from', dest='from_code', help="Default source language code")
+    parser.add_argument('-t', '--to', dest='to_code', help="Default target language code")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="Requests translated together (default: %(default)s)")
+    parser.add_argument('--no-memory', action='store_true', help="Do not use the translation memory")
+    parser.add_argument('--serve', action='store_true', help="Serve /translate and /languages over HTTP")
+    parser.add_argument('--host', default='127.0.0.1', help="Server address (default: %(default)s)")
+    parser.add_argument('--port', type=int, default=5000, help="Server port (default: %(default)s)")
+    parser.add_argument('--verbose', action='store_true', help="Log every server request")
+    parser.add_argument('--batch-delay-ms', type=float, default=20,
+                        help="Longest wait for concurrent requests to share a batch (default: %(default)s)")
+    args = parser.parse_args(argv)
+    
+    if settings is None:
+        print("Error: Argos Translate is not installed", file=sys.stderr)
+        return 2
+    
+    engine = create_engine(not args.no_memory)
+    if args.serve:
+        serve(engine, args.host, args.port, args.verbose, args.batch_delay_ms)
+        return 0
+    
+    scheduler = BatchScheduler(engine, engine.max_batch_size, args.batch_delay_ms)
+    input_stream = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+    output_stream = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    try:
+        failed = run(input_stream, output_stream, scheduler, args.from_code, args.to_code, max(1, args.chunk_size))
+    finally:
+        scheduler.shutdown()
+        if input_stream is not sys.stdin:
+            input_stream.close()
+        if output_stream is not sys.stdout:
+            output_stream.close()
+        if engine.memory is not None:
+            engine.memory.close()
+    
+    if failed:
+        print(f"Warning: {failed} request(s) failed", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
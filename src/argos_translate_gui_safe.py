@@ -10,40 +10,84 @@ import threading
 import queue
 import sys
 import os
-from typing import List, Optional, Dict, Any
+import time
+from typing import Callable, List, Optional, Dict, Any
 import json
 from pathlib import Path
+from types import SimpleNamespace
+
+from gui_support import (ChunkedTextReader, ChunkedTextView, UIMessageQueue, payload_size, tcl_uses_utf16,
+                         text_length, tk_length)
+from gui_settings import (COMPUTE_TYPES, get_engine_options, load_gui_settings, load_language_cache,
+                          save_gui_settings, save_language_cache)
+from lazy_imports import LazyModule, format_import_profile, import_module, is_available
+from package_manager import (REGISTRY_FILENAME, DownloadManager, InstalledPackageRegistry, PackageIndex,
+                             PackageIndexCache, package_checksum)
+from process_engine import ProcessPoolEngine
+from text_segmentation import join_segments, split_sentences
+from translation_engine import IncrementalTranslator, TargetResult, TranslationCancelled, TranslationEngine
+from translation_memory import MB, TranslationMemory
+from translation_worker import TranslationWorker
 
 # Add the virtual environment to the path
 venv_path = Path(__file__).parent / ".venv" / "Lib" / "site-packages"
 if venv_path.exists():
     sys.path.insert(0, str(venv_path))
 
-# Try to import Argos Translate with error handling
+# Try to import Argos Translate with error handling. Only the lightweight
+# settings module is imported here; package management (and the ML stack
+# behind translation) is imported on a background thread at first use.
 ARGOS_AVAILABLE = False
-translate = None
-package = None
+package = LazyModule('argostranslate.package')
 settings = None
 
-try:
-    import argostranslate.translate as translate
-    import argostranslate.package as package
-    import argostranslate.settings as settings
-    ARGOS_AVAILABLE = True
-    print("Argos Translate imported successfully")
-except ImportError as e:
-    print(f"Warning: Argos Translate not available: {e}")
-    print("GUI will run in demo mode")
-except Exception as e:
-    print(f"Warning: Error importing Argos Translate: {e}")
+if is_available('argostranslate'):
+    try:
+        settings = import_module('argostranslate.settings')
+        ARGOS_AVAILABLE = True
+    except Exception as e:
+        print(f"Warning: Error importing Argos Translate: {e}")
+        print("GUI will run in demo mode")
+else:
+    print("Warning: Argos Translate not available: No module named 'argostranslate'")
     print("GUI will run in demo mode")
 
 
 class ArgosTranslateGUI:
     """Main GUI application for Argos Translate"""
     
-    def __init__(self, root):
+    # Quiet period after the last edit before live translation runs
+    LIVE_TRANSLATION_DELAY_MS = 500
+    
+    # Messages whose delivery latency is reported in debug mode
+    RESULT_MESSAGES = ('translation_result', 'translation_error', 'target_result', 'multi_translation_done')
+    
+    # Time the UI thread spends on worker messages before it lets Tk redraw
+    MESSAGE_BUDGET_MS = 12
+    
+    # Bursts of refresh requests within this delay cause a single reload
+    REFRESH_COALESCE_MS = 250
+    
+    # Payloads at least this large (characters) get a frame of their own
+    LARGE_PAYLOAD_CHARS = 100000
+    
+    # Inputs longer than this (characters) are read from the widget in slices
+    LARGE_INPUT_CHARS = 512 * 1024
+    
+    # Tree item shown while packages are being discovered
+    PACKAGE_PLACEHOLDER = 'loading-packages'
+    
+    # Time per frame spent updating package rows; the rest waits for the next frame
+    PACKAGE_TREE_BUDGET_MS = 16
+    
+    # Selector text while languages are being discovered (and none are cached)
+    LANGUAGES_PLACEHOLDER = "Loading languages..."
+    
+    def __init__(self, root, import_profile: bool = False, eager_tabs: bool = False):
         self.root = root
+        self.startup_started = time.perf_counter()
+        self.import_profile = import_profile
+        self.eager_tabs = eager_tabs
         self.root.title("Argos Translate - Offline Translation")
         self.root.geometry("1200x800")
         self.root.minsize(1000, 700)
@@ -69,21 +113,81 @@ class ArgosTranslateGUI:
         self.languages: List = []
         self.available_packages = []
         self.installed_packages = []
+        # Lookup and search index over the packages, rebuilt on every load
+        self.package_index = PackageIndex()
+        # Values shown in the package tree, by package code
+        self.package_rows: Dict[str, tuple] = {}
+        self.package_tree_job = None
+        
+        # Package downloads, created on first install: code -> [bytes downloaded, total bytes]
+        self.download_manager: Optional[DownloadManager] = None
+        self.package_downloads: Dict[str, list] = {}
+        # Queued installs and uninstalls (code -> 'install' or 'uninstall') and
+        # the (code, action, error) results since the queue was last empty
+        self.package_jobs: Dict[str, str] = {}
+        self.package_job_results: List[tuple] = []
+        # Local package index with conditional refresh, created on first use
+        self.index_cache: Optional[PackageIndexCache] = None
+        # Installed packages and languages recorded by the last full scan
+        self.package_registry: Optional[InstalledPackageRegistry] = None
+        
         self.argos_available = ARGOS_AVAILABLE
         
+        # Persisted GUI preferences
+        self.gui_settings = load_gui_settings()
+        
+        # Translation memory in front of the resident translations
+        memory_path = None
+        if self.argos_available and settings:
+            memory_path = Path(settings.cache_dir) / "translation_memory.sqlite3"
+        self.translation_memory = TranslationMemory(
+            memory_path,
+            self.gui_settings['memory_cache_mb'],
+            self.gui_settings['disk_cache_mb']
+        )
+        
+        # Resident translations, shared by every translation request
+        self.translation_engine = TranslationEngine(memory=self.translation_memory)
+        self.incremental_translator = IncrementalTranslator(self.translation_engine)
+        self.apply_engine_settings()
+        self.apply_process_pool_setting()
+        self.apply_model_limits()
+        self.translation_engine.models.start_idle_monitor()
+        self.live_translation_job = None
+        self.input_reader = None
+        self.input_reader_live = False
+        
         # Create GUI elements
         self.create_widgets()
         
-        # Load initial data
+        # Message queue for thread communication; posting wakes the UI thread
+        self.drain_job = None
+        self.refresh_jobs = {}
+        self.message_queue = UIMessageQueue(self.root, self.check_queue)
+        
+        # Persistent translation worker (latest request wins)
+        self.translation_worker = TranslationWorker(self._translate_thread)
+        self.multi_translation_worker = TranslationWorker(self._translate_multi_thread, name="multi-translation-worker")
+        
+        # Startup milestones still to reach before the window counts as interactive
+        self.startup_pending = {'paint', 'languages'}
+        self.first_paint_binding = self.root.bind('<Expose>', self.on_first_expose, '+')
+        
+        # Discover languages in the background; the window paints first
+        self.language_load_id = 0
+        self.languages_loading = False
+        self.package_load_id = 0
         if self.argos_available:
             self.load_languages()
-            self.load_packages()
         else:
             self.show_demo_mode()
+            self.startup_step_done('languages')
         
-        # Message queue for thread communication
-        self.message_queue = queue.Queue()
-        self.check_queue()
+        # --eager-tabs builds (and loads) every tab up front, to compare startup times
+        if self.eager_tabs:
+            self.startup_pending.add('packages')
+            for frame_name in list(self.lazy_tabs):
+                self.build_tab(frame_name)
     
     def setup_styles(self):
         """Configure modern Windows 11-style application styles"""
@@ -249,15 +353,48 @@ class ArgosTranslateGUI:
         # Translation tab
         self.create_translation_tab()
         
-        # Package management tab
-        self.create_package_tab()
+        # Package management and settings tabs are built when first shown
+        self.lazy_tabs: Dict[str, Callable[[], None]] = {}
+        self.package_frame = self.add_lazy_tab("Package Management", self.create_package_tab)
+        self.settings_frame = self.add_lazy_tab("Settings", self.create_settings_tab)
+        self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
         
-        # Settings tab
-        self.create_settings_tab()
+        # Debug mode is shown in the Settings tab but read before it is built
+        self.debug_var = tk.BooleanVar(value=False)
+        if self.argos_available and settings:
+            self.debug_var.set(settings.debug)
         
         # Status bar
         self.create_status_bar()
     
+    def add_lazy_tab(self, text: str, build: Callable[[], None]) -> ttk.Frame:
+        """Add an empty tab whose content is built the first time it is selected"""
+        frame = ttk.Frame(self.notebook)
+        self.notebook.add(frame, text=text)
+        self.lazy_tabs[str(frame)] = build
+        return frame
+    
+    def build_tab(self, frame_name: str):
+        """Build a lazy tab's content if that has not happened yet"""
+        build = self.lazy_tabs.pop(str(frame_name), None)
+        if build is None:
+            return
+        started = time.perf_counter()
+        build()
+        if self.debug_var.get():
+            print(f"Debug: built tab {self.notebook.tab(frame_name, 'text')!r} in "
+                  f"{(time.perf_counter() - started) * 1000:.0f} ms")
+    
+    def is_tab_built(self, frame) -> bool:
+        """Return True once a tab's content exists"""
+        return str(frame) not in self.lazy_tabs
+    
+    def on_tab_changed(self, event=None):
+        """Build a tab on first selection and refresh what it shows"""
+        self.build_tab(self.notebook.select())
+        if self.notebook.select() == str(self.settings_frame):
+            self.update_resident_models()
+    
     def create_translation_tab(self):
         """Create the translation interface tab"""
         self.translation_frame = ttk.Frame(self.notebook)
@@ -313,6 +450,24 @@ class ArgosTranslateGUI:
         )
         self.to_combo.pack(side=tk.LEFT, padx=(10, 0))
         
+        # Additional targets translated concurrently, each into its own output tab
+        ttk.Label(to_frame, text="Also to:").pack(side=tk.LEFT, padx=(20, 0))
+        self.extra_targets_list = tk.Listbox(
+            to_frame, 
+            selectmode=tk.MULTIPLE,
+            exportselection=False,
+            height=3,
+            width=30,
+            font=('Segoe UI', 10),
+            relief='solid',
+            borderwidth=1
+        )
+        self.extra_targets_list.pack(side=tk.LEFT, padx=(10, 0))
+        
+        # Warm up the newly selected pair
+        self.from_combo.bind('<<ComboboxSelected>>', self.on_language_selected)
+        self.to_combo.bind('<<ComboboxSelected>>', self.on_language_selected)
+        
         # Text input frame
         text_frame = ttk.LabelFrame(self.translation_frame, text="Text Translation", padding=10)
         text_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
@@ -337,18 +492,63 @@ class ArgosTranslateGUI:
         self.input_text.pack(fill=tk.BOTH, expand=True, pady=(5, 10))
         
         # Translate button
+        button_frame = ttk.Frame(text_frame)
+        button_frame.pack(pady=5)
+        
         translate_btn = ttk.Button(
-            text_frame, 
+            button_frame, 
             text="Translate", 
             command=self.translate_text,
             style='Primary.TButton'
         )
-        translate_btn.pack(pady=5)
+        translate_btn.pack(side=tk.LEFT)
+        
+        # Streaming shows each sentence as soon as it is translated
+        self.stream_output_var = tk.BooleanVar(value=True)
+        stream_check = ttk.Checkbutton(
+            button_frame, 
+            text="Stream output", 
+            variable=self.stream_output_var
+        )
+        stream_check.pack(side=tk.LEFT, padx=(10, 0))
+        
+        # Live mode translates while typing, re-translating only changed sentences
+        self.live_translate_var = tk.BooleanVar(value=False)
+        live_check = ttk.Checkbutton(
+            button_frame, 
+            text="Live translation", 
+            variable=self.live_translate_var,
+            command=self.schedule_live_translation
+        )
+        live_check.pack(side=tk.LEFT, padx=(10, 0))
+        self.input_text.bind('<<Modified>>', self.on_input_modified)
         
         # Output text
         ttk.Label(text_frame, text="Translated Text:", style='Heading.TLabel').pack(anchor=tk.W, pady=(10, 0))
-        self.output_text = scrolledtext.ScrolledText(
+        self.output_notebook = ttk.Notebook(text_frame)
+        self.output_notebook.pack(fill=tk.BOTH, expand=True, pady=(5, 0))
+        self.output_text = self.create_output_text()
+        self.output_notebook.add(self.output_text.frame, text="Translation")
+        
+        # Extra output tabs of a multi-target translation, by target code
+        self.target_outputs: Dict[str, scrolledtext.ScrolledText] = {}
+        
+        # Source text shown while its translation is still streaming in
+        self.output_text.tag_configure('pending', foreground='#8a8886')
+        self.translation_stream = None
+        
+        # Copy button
+        copy_btn = ttk.Button(
             text_frame, 
+            text="Copy Translation", 
+            command=self.copy_translation
+        )
+        copy_btn.pack(pady=5)
+    
+    def create_output_text(self) -> scrolledtext.ScrolledText:
+        """Create a read-only text widget for an output tab"""
+        output = scrolledtext.ScrolledText(
+            self.output_notebook, 
             height=8, 
             wrap=tk.WORD,
             font=('Segoe UI', 11),
@@ -363,21 +563,12 @@ class ArgosTranslateGUI:
             pady=8,
             state=tk.DISABLED
         )
-        self.output_text.pack(fill=tk.BOTH, expand=True, pady=(5, 0))
-        
-        # Copy button
-        copy_btn = ttk.Button(
-            text_frame, 
-            text="Copy Translation", 
-            command=self.copy_translation
-        )
-        copy_btn.pack(pady=5)
+        # Large results are inserted in chunks, huge ones shown a page at a time
+        output.view = ChunkedTextView(output)
+        return output
     
     def create_package_tab(self):
         """Create the package management tab"""
-        self.package_frame = ttk.Frame(self.notebook)
-        self.notebook.add(self.package_frame, text="Package Management")
-        
         # Title
         title_label = ttk.Label(
             self.package_frame, 
@@ -416,6 +607,20 @@ class ArgosTranslateGUI:
         )
         self.progress_bar.pack(side=tk.RIGHT, fill=tk.X, expand=True, padx=(10, 0))
         
+        # Search box; the list is filtered as you type
+        search_frame = ttk.Frame(self.package_frame)
+        search_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        ttk.Label(search_frame, text="Search:").pack(side=tk.LEFT)
+        self.package_search_var = tk.StringVar()
+        search_entry = ttk.Entry(search_frame, textvariable=self.package_search_var, width=40)
+        search_entry.pack(side=tk.LEFT, padx=(10, 0))
+        
+        self.package_match_var = tk.StringVar()
+        ttk.Label(search_frame, textvariable=self.package_match_var, style='Status.TLabel').pack(side=tk.LEFT, padx=10)
+        
+        self.package_search_var.trace_add('write', lambda *args: self.filter_packages())
+        
         # Package list frame
         list_frame = ttk.LabelFrame(self.package_frame, text="Available Packages", padding=10)
         list_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
@@ -465,12 +670,16 @@ class ArgosTranslateGUI:
         
         # Bind selection event
         self.package_tree.bind('<<TreeviewSelect>>', self.on_package_select)
+        
+        # Package data is loaded along with the tab
+        if self.argos_available:
+            self.load_packages()
+        else:
+            self.update_package_tree()
+            self.startup_step_done('packages')
     
     def create_settings_tab(self):
         """Create the settings tab"""
-        self.settings_frame = ttk.Frame(self.notebook)
-        self.notebook.add(self.settings_frame, text="Settings")
-        
         # Title
         title_label = ttk.Label(
             self.settings_frame, 
@@ -505,10 +714,6 @@ class ArgosTranslateGUI:
         debug_frame = ttk.Frame(settings_frame)
         debug_frame.pack(fill=tk.X, pady=10)
         
-        self.debug_var = tk.BooleanVar(value=False)
-        if self.argos_available and settings:
-            self.debug_var.set(settings.debug)
-        
         debug_check = ttk.Checkbutton(
             debug_frame, 
             text="Enable Debug Mode", 
@@ -539,6 +744,177 @@ class ArgosTranslateGUI:
         )
         browse_btn.pack(side=tk.LEFT, padx=(10, 0))
         
+        # Translation memory size limits
+        memory_frame = ttk.Frame(settings_frame)
+        memory_frame.pack(fill=tk.X, pady=10)
+        
+        ttk.Label(memory_frame, text="Translation Memory:", style='Heading.TLabel').pack(anchor=tk.W)
+        memory_limits_frame = ttk.Frame(memory_frame)
+        memory_limits_frame.pack(fill=tk.X, pady=5)
+        
+        ttk.Label(memory_limits_frame, text="In-memory limit (MB):").pack(side=tk.LEFT)
+        self.memory_cache_var = tk.IntVar(value=self.gui_settings['memory_cache_mb'])
+        memory_spin = ttk.Spinbox(
+            memory_limits_frame, 
+            from_=0, 
+            to=4096, 
+            textvariable=self.memory_cache_var,
+            width=8
+        )
+        memory_spin.pack(side=tk.LEFT, padx=(10, 20))
+        
+        ttk.Label(memory_limits_frame, text="On-disk limit (MB):").pack(side=tk.LEFT)
+        self.disk_cache_var = tk.IntVar(value=self.gui_settings['disk_cache_mb'])
+        disk_spin = ttk.Spinbox(
+            memory_limits_frame, 
+            from_=0, 
+            to=65536, 
+            textvariable=self.disk_cache_var,
+            width=8
+        )
+        disk_spin.pack(side=tk.LEFT, padx=(10, 20))
+        
+        clear_memory_btn = ttk.Button(
+            memory_limits_frame, 
+            text="Clear Memory", 
+            command=self.clear_translation_memory
+        )
+        clear_memory_btn.pack(side=tk.LEFT)
+        
+        # Multi-process translation
+        performance_frame = ttk.Frame(settings_frame)
+        performance_frame.pack(fill=tk.X, pady=10)
+        
+        ttk.Label(performance_frame, text="Performance:", style='Heading.TLabel').pack(anchor=tk.W)
+        processes_frame = ttk.Frame(performance_frame)
+        processes_frame.pack(fill=tk.X, pady=5)
+        
+        ttk.Label(processes_frame, text="Translation processes (0 = in-process):").pack(side=tk.LEFT)
+        self.translation_processes_var = tk.IntVar(value=self.gui_settings['translation_processes'])
+        processes_spin = ttk.Spinbox(
+            processes_frame, 
+            from_=0, 
+            to=os.cpu_count() or 1, 
+            textvariable=self.translation_processes_var,
+            width=8
+        )
+        processes_spin.pack(side=tk.LEFT, padx=(10, 20))
+        
+        # Package downloads and index refresh
+        downloads_frame = ttk.Frame(performance_frame)
+        downloads_frame.pack(fill=tk.X, pady=5)
+        
+        ttk.Label(downloads_frame, text="Parallel downloads:").pack(side=tk.LEFT)
+        self.max_downloads_var = tk.IntVar(value=self.gui_settings['max_downloads'])
+        max_downloads_spin = ttk.Spinbox(
+            downloads_frame, 
+            from_=1, 
+            to=16, 
+            textvariable=self.max_downloads_var,
+            width=8
+        )
+        max_downloads_spin.pack(side=tk.LEFT, padx=(10, 20))
+        
+        ttk.Label(downloads_frame, text="Check package index every (hours):").pack(side=tk.LEFT)
+        self.index_ttl_var = tk.IntVar(value=self.gui_settings['index_ttl_hours'])
+        index_ttl_spin = ttk.Spinbox(
+            downloads_frame, 
+            from_=0, 
+            to=720, 
+            textvariable=self.index_ttl_var,
+            width=8
+        )
+        index_ttl_spin.pack(side=tk.LEFT, padx=(10, 20))
+        
+        # Resident model limits
+        models_frame = ttk.Frame(performance_frame)
+        models_frame.pack(fill=tk.X, pady=5)
+        
+        ttk.Label(models_frame, text="Model memory budget (MB, 0 = unlimited):").pack(side=tk.LEFT)
+        self.model_memory_var = tk.IntVar(value=self.gui_settings['model_memory_mb'])
+        model_memory_spin = ttk.Spinbox(
+            models_frame, 
+            from_=0, 
+            to=65536, 
+            textvariable=self.model_memory_var,
+            width=8
+        )
+        model_memory_spin.pack(side=tk.LEFT, padx=(10, 20))
+        
+        ttk.Label(models_frame, text="Unload idle models after (min, 0 = never):").pack(side=tk.LEFT)
+        self.model_idle_var = tk.IntVar(value=self.gui_settings['model_idle_minutes'])
+        model_idle_spin = ttk.Spinbox(
+            models_frame, 
+            from_=0, 
+            to=1440, 
+            textvariable=self.model_idle_var,
+            width=8
+        )
+        model_idle_spin.pack(side=tk.LEFT, padx=(10, 20))
+        
+        # CTranslate2 threading and weight type (models are rebuilt on save)
+        threads_frame = ttk.Frame(performance_frame)
+        threads_frame.pack(fill=tk.X, pady=5)
+        
+        ttk.Label(threads_frame, text="Inter threads:").pack(side=tk.LEFT)
+        self.inter_threads_var = tk.IntVar(value=self.gui_settings['inter_threads'])
+        inter_threads_spin = ttk.Spinbox(
+            threads_frame, 
+            from_=1, 
+            to=os.cpu_count() or 1, 
+            textvariable=self.inter_threads_var,
+            width=6
+        )
+        inter_threads_spin.pack(side=tk.LEFT, padx=(10, 20))
+        
+        ttk.Label(threads_frame, text="Intra threads (0 = auto):").pack(side=tk.LEFT)
+        self.intra_threads_var = tk.IntVar(value=self.gui_settings['intra_threads'])
+        intra_threads_spin = ttk.Spinbox(
+            threads_frame, 
+            from_=0, 
+            to=os.cpu_count() or 1, 
+            textvariable=self.intra_threads_var,
+            width=6
+        )
+        intra_threads_spin.pack(side=tk.LEFT, padx=(10, 20))
+        
+        ttk.Label(threads_frame, text="Compute type:").pack(side=tk.LEFT)
+        self.compute_type_var = tk.StringVar(value=self.gui_settings['compute_type'])
+        compute_type_combo = ttk.Combobox(
+            threads_frame, 
+            textvariable=self.compute_type_var,
+            values=COMPUTE_TYPES,
+            state='readonly',
+            width=14
+        )
+        compute_type_combo.pack(side=tk.LEFT, padx=(10, 0))
+        
+        # Decoding options (apply to the next translation)
+        decoding_frame = ttk.Frame(performance_frame)
+        decoding_frame.pack(fill=tk.X, pady=5)
+        
+        ttk.Label(decoding_frame, text="Beam size:").pack(side=tk.LEFT)
+        self.beam_size_var = tk.IntVar(value=self.gui_settings['beam_size'])
+        beam_size_spin = ttk.Spinbox(
+            decoding_frame, 
+            from_=1, 
+            to=16, 
+            textvariable=self.beam_size_var,
+            width=6
+        )
+        beam_size_spin.pack(side=tk.LEFT, padx=(10, 20))
+        
+        ttk.Label(decoding_frame, text="Max batch size:").pack(side=tk.LEFT)
+        self.max_batch_size_var = tk.IntVar(value=self.gui_settings['max_batch_size'])
+        max_batch_size_spin = ttk.Spinbox(
+            decoding_frame, 
+            from_=1, 
+            to=256, 
+            textvariable=self.max_batch_size_var,
+            width=6
+        )
+        max_batch_size_spin.pack(side=tk.LEFT, padx=(10, 20))
+        
         # Save settings button
         save_btn = ttk.Button(
             settings_frame, 
@@ -572,6 +948,12 @@ Status: Running in compatibility mode
         
         info_label = ttk.Label(info_frame, text=info_text, font=('Courier', 9))
         info_label.pack(anchor=tk.W)
+        
+        # Models currently loaded, refreshed whenever the tab is shown
+        self.resident_models_var = tk.StringVar()
+        resident_label = ttk.Label(info_frame, textvariable=self.resident_models_var, font=('Courier', 9))
+        resident_label.pack(anchor=tk.W, pady=(10, 0))
+        self.update_resident_models()
     
     def create_status_bar(self):
         """Create the status bar"""
@@ -594,9 +976,21 @@ Status: Running in compatibility mode
             style='Status.TLabel'
         )
         lang_count_label.pack(side=tk.RIGHT, padx=10, pady=5)
+        
+        # Translation memory hit/miss counters
+        self.cache_stats_var = tk.StringVar(value="Memory: 0 hits / 0 misses")
+        cache_stats_label = ttk.Label(
+            self.status_frame, 
+            textvariable=self.cache_stats_var, 
+            style='Status.TLabel'
+        )
+        cache_stats_label.pack(side=tk.RIGHT, padx=10, pady=5)
     
     def show_demo_mode(self):
         """Show demo mode when Argos Translate is not available"""
+        self.from_combo.config(state='readonly')
+        self.to_combo.config(state='readonly')
+        
         # Add demo languages
         demo_languages = [
             ("English", "en"),
@@ -626,96 +1020,300 @@ Status: Running in compatibility mode
         
         # Add demo packages
         demo_packages = [
-            ("translate-en_es", "English", "Spanish", "1.0", "Available"),
-            ("translate-en_fr", "English", "French", "1.0", "Available"),
-            ("translate-en_de", "English", "German", "1.0", "Available"),
-            ("translate-es_en", "Spanish", "English", "1.0", "Available"),
-            ("translate-fr_en", "French", "English", "1.0", "Available"),
+            ("en", "English", "es", "Spanish"),
+            ("en", "English", "fr", "French"),
+            ("en", "English", "de", "German"),
+            ("es", "Spanish", "en", "English"),
+            ("fr", "French", "en", "English"),
         ]
         
-        for pkg_data in demo_packages:
-            self.package_tree.insert('', 'end', values=pkg_data)
+        self.package_index = PackageIndex([
+            SimpleNamespace(code=f"translate-{from_code}_{to_code}", from_code=from_code, from_name=from_name,
+                            to_code=to_code, to_name=to_name, package_version="1.0")
+            for from_code, from_name, to_code, to_name in demo_packages
+        ])
+        self.available_packages = self.package_index.packages
+        if self.is_tab_built(self.package_frame):
+            self.update_package_tree()
     
     def load_languages(self):
-        """Load available languages"""
+        """Discover installed languages in the background"""
         if not self.argos_available:
             return
         
-        try:
-            self.status_var.set("Loading languages...")
-            self.languages = translate.get_installed_languages()
-            
-            # Update language comboboxes
-            lang_names = [f"{lang.name} ({lang.code})" for lang in self.languages]
-            self.from_combo['values'] = lang_names
-            self.to_combo['values'] = lang_names
-            
-            # Set default languages if available
-            if self.languages:
-                # Try to set English as default from language
-                en_lang = next((lang for lang in self.languages if lang.code == 'en'), None)
-                if en_lang:
-                    self.from_lang_var.set(f"{en_lang.name} ({en_lang.code})")
-                
-                # Set first non-English language as default to language
-                other_lang = next((lang for lang in self.languages if lang.code != 'en'), None)
-                if other_lang:
-                    self.to_lang_var.set(f"{other_lang.name} ({other_lang.code})")
-            
-            self.update_language_count()
-            self.status_var.set("Languages loaded successfully")
-            
-        except Exception as e:
-            self.status_var.set(f"Error loading languages: {str(e)}")
-            messagebox.showerror("Error", f"Failed to load languages: {str(e)}")
+        self.language_load_id += 1
+        load_id = self.language_load_id
+        registry = self.get_package_registry()
+        self.languages_loading = True
+        self.status_var.set("Loading languages...")
+        if not self.languages:
+            # Offer the languages found last time until the first load finishes
+            cached_languages = load_language_cache()
+            if cached_languages:
+                self.fill_language_selectors(cached_languages)
+            else:
+                for combo, var in ((self.from_combo, self.from_lang_var), (self.to_combo, self.to_lang_var)):
+                    combo['values'] = ()
+                    combo.config(state=tk.DISABLED)
+                    var.set(self.LANGUAGES_PLACEHOLDER)
+        
+        def load_thread():
+            try:
+                signature = registry.signature()
+                languages = registry.languages(signature)
+                package_paths = registry.package_paths(signature)
+                if languages is None or package_paths is None:
+                    languages = self.translation_engine.load_languages()
+                    registry.save_languages(signature, languages)
+                    registry.save_package_paths(signature, self.translation_engine.package_paths())
+                else:
+                    # The engine loads a pair from its own package directory
+                    # and only scans every package for pivot translations
+                    self.translation_engine.set_package_paths(package_paths)
+                self.message_queue.put(('languages_loaded', (load_id, languages)))
+            except ImportError as e:
+                # Argos Translate is installed but its ML stack is not usable
+                self.message_queue.put(('argos_unavailable', str(e)))
+            except Exception as e:
+                self.message_queue.put(('languages_error', (load_id, str(e))))
+        
+        thread = threading.Thread(target=load_thread, name="language-loader")
+        thread.daemon = True
+        thread.start()
+    
+    def fill_language_selectors(self, names_and_codes: List):
+        """Offer (name, code) languages, keeping the current choice if it is still offered"""
+        lang_names = [f"{name} ({code})" for name, code in names_and_codes]
+        self.from_combo['values'] = lang_names
+        self.to_combo['values'] = lang_names
+        self.from_combo.config(state='readonly')
+        self.to_combo.config(state='readonly')
+        self.extra_targets_list.delete(0, tk.END)
+        for lang_name in lang_names:
+            self.extra_targets_list.insert(tk.END, lang_name)
+        
+        # Try to set English as default from language
+        if self.from_lang_var.get() not in lang_names:
+            en_name = next((lang_name for (name, code), lang_name in zip(names_and_codes, lang_names)
+                            if code == 'en'), "")
+            self.from_lang_var.set(en_name)
+        
+        # Set first non-English language as default to language
+        if self.to_lang_var.get() not in lang_names:
+            other_name = next((lang_name for (name, code), lang_name in zip(names_and_codes, lang_names)
+                               if code != 'en'), "")
+            self.to_lang_var.set(other_name)
+    
+    def show_languages(self, languages: List):
+        """Fill the language selectors with freshly loaded languages"""
+        self.languages = languages
+        self.languages_loading = False
+        names_and_codes = [(lang.name, lang.code) for lang in self.languages]
+        self.fill_language_selectors(names_and_codes)
+        save_language_cache(names_and_codes)
+        
+        self.update_language_count()
+        self.status_var.set("Languages loaded successfully")
+        self.startup_step_done('languages')
+        
+        # Load the selected pair's model before the first click
+        self.warm_up_selected_pair()
+    
+    def show_languages_error(self, error: str):
+        """Report a failed language load"""
+        self.languages_loading = False
+        for combo, var in ((self.from_combo, self.from_lang_var), (self.to_combo, self.to_lang_var)):
+            combo.config(state='readonly')
+            if var.get() == self.LANGUAGES_PLACEHOLDER:
+                var.set("")
+        self.status_var.set(f"Error loading languages: {error}")
+        self.startup_step_done('languages')
+        messagebox.showerror("Error", f"Failed to load languages: {error}")
     
     def load_packages(self):
-        """Load available and installed packages"""
+        """Load available and installed packages in the background"""
         if not self.argos_available:
             return
-        
-        try:
-            self.status_var.set("Loading packages...")
-            
-            # Get installed packages
-            self.installed_packages = package.get_installed_packages()
-            installed_codes = {f"{pkg.from_code}-{pkg.to_code}" for pkg in self.installed_packages}
-            
-            # Get available packages
+        if not self.is_tab_built(self.package_frame):
+            return  # Loaded when the tab is first shown
+        
+        self.package_load_id += 1
+        load_id = self.package_load_id
+        index_cache = self.get_index_cache()
+        registry = self.get_package_registry()
+        self.status_var.set("Loading packages...")
+        if not self.package_tree.get_children():
+            # Placeholder row until the first load finishes
+            self.package_tree.insert('', 'end', iid=self.PACKAGE_PLACEHOLDER,
+                                     values=("Loading packages...", "", "", "", ""))
+        
+        def load_thread():
             try:
-                self.available_packages = package.get_available_packages()
-            except:
-                # If no package index, update it first
-                self.update_package_index()
-                self.available_packages = package.get_available_packages()
-            
-            # Update package tree
-            self.update_package_tree(installed_codes)
-            
-            self.status_var.set("Packages loaded successfully")
-            
-        except Exception as e:
-            self.status_var.set(f"Error loading packages: {str(e)}")
-            messagebox.showerror("Error", f"Failed to load packages: {str(e)}")
-    
-    def update_package_tree(self, installed_codes: set):
-        """Update the package tree view"""
-        # Clear existing items
-        for item in self.package_tree.get_children():
-            self.package_tree.delete(item)
-        
-        # Add packages to tree
-        for pkg in self.available_packages:
-            package_id = f"{pkg.from_code}-{pkg.to_code}"
-            status = "Installed" if package_id in installed_codes else "Available"
-            
-            self.package_tree.insert('', 'end', values=(
+                signature = registry.signature()
+                installed_packages = registry.packages(signature)
+                if installed_packages is None:
+                    installed_packages = package.get_installed_packages()
+                    registry.save_packages(signature, installed_packages)
+                try:
+                    index_cache.ensure_fresh()
+                except Exception as e:
+                    if not index_cache.path.exists():
+                        raise
+                    # Work offline from the last index downloaded
+                    print(f"Warning: Could not refresh the package index: {e}")
+                available_packages = package.get_available_packages()
+                package_index = PackageIndex(available_packages, installed_packages)
+                self.message_queue.put(('packages_loaded', (load_id, package_index)))
+            except ImportError as e:
+                self.message_queue.put(('argos_unavailable', str(e)))
+            except Exception as e:
+                self.message_queue.put(('packages_error', (load_id, str(e))))
+        
+        thread = threading.Thread(target=load_thread, name="package-loader")
+        thread.daemon = True
+        thread.start()
+    
+    def get_index_cache(self) -> PackageIndexCache:
+        """Create the package index cache on first use"""
+        if self.index_cache is None:
+            self.index_cache = PackageIndexCache(
+                settings.remote_package_index,
+                settings.local_package_index,
+                self.gui_settings['index_ttl_hours'] * 3600
+            )
+        return self.index_cache
+    
+    def get_package_registry(self) -> InstalledPackageRegistry:
+        """Create the installed package registry on first use"""
+        if self.package_registry is None:
+            self.package_registry = InstalledPackageRegistry(
+                settings.package_dirs,
+                settings.package_data_dir / REGISTRY_FILENAME
+            )
+        return self.package_registry
+    
+    def show_packages(self, package_index: PackageIndex):
+        """Show freshly loaded packages in the package tree"""
+        self.package_index = package_index
+        self.installed_packages = package_index.installed_packages
+        self.available_packages = package_index.packages
+        
+        # Update package tree
+        self.update_package_tree()
+        
+        self.status_var.set("Packages loaded successfully")
+        self.startup_step_done('packages')
+    
+    def show_packages_error(self, error: str):
+        """Report a failed package load"""
+        if self.package_tree.exists(self.PACKAGE_PLACEHOLDER):
+            self.package_tree.delete(self.PACKAGE_PLACEHOLDER)
+        self.status_var.set(f"Error loading packages: {error}")
+        self.startup_step_done('packages')
+        messagebox.showerror("Error", f"Failed to load packages: {error}")
+    
+    def on_first_expose(self, event=None):
+        """Note the first time the window is drawn"""
+        self.root.unbind('<Expose>', self.first_paint_binding)
+        # Widgets redraw in idle callbacks queued by the expose event
+        self.root.after_idle(self.startup_step_done, 'paint')
+    
+    def startup_step_done(self, step: str):
+        """Log time to first paint and, once everything is loaded, time to interactive"""
+        if step not in self.startup_pending:
+            return
+        self.startup_pending.discard(step)
+        elapsed_ms = (time.perf_counter() - self.startup_started) * 1000
+        if step == 'paint':
+            print(f"Startup: first paint after {elapsed_ms:.0f} ms")
+        if not self.startup_pending:
+            print(f"Startup: interactive after {elapsed_ms:.0f} ms")
+            if self.import_profile:
+                print(format_import_profile())
+    
+    def update_package_tree(self, keep_scroll: bool = True):
+        """Show the packages matching the search box, touching only rows that changed.
+        
+        Rows are keyed by package code, so refreshes after an install or an
+        index update keep the selection and scroll position. Large updates
+        are spread over several frames so typing in the search box stays
+        responsive.
+        """
+        rows: Dict[str, tuple] = {}
+        for pkg in self.package_index.search(self.package_search_var.get()):
+            status = "Installed" if self.package_index.is_installed(pkg) else "Available"
+            rows[pkg.code] = (
                 pkg.code,
                 pkg.from_name,
                 pkg.to_name,
-                pkg.package_version,
+                str(pkg.package_version),
                 status
-            ))
+            )
+        
+        total = len(self.package_index.packages)
+        self.package_match_var.set(f"{len(rows)} of {total} packages" if len(rows) != total else "")
+        
+        # A newer update supersedes one still in progress
+        if self.package_tree_job is not None:
+            self.root.after_cancel(self.package_tree_job)
+            self.package_tree_job = None
+        first_visible = self.package_tree.yview()[0] if keep_scroll else 0.0
+        self.run_package_tree_update(self.package_tree_changes(rows), first_visible)
+    
+    def package_tree_changes(self, rows: Dict[str, tuple]):
+        """Apply the changes that turn the tree into rows, yielding after each one"""
+        # Remove packages that went away (and placeholder or demo rows)
+        removed = [item for item in self.package_tree.get_children() if item not in rows]
+        if removed:
+            self.package_tree.delete(*removed)
+            for item in removed:
+                self.package_rows.pop(item, None)
+            yield
+        
+        # Rows keep their place unless the order itself changed
+        kept = [code for code in rows if code in self.package_rows]
+        reorder = kept != list(self.package_tree.get_children())
+        for index, (code, values) in enumerate(rows.items()):
+            if code not in self.package_rows:
+                self.package_tree.insert('', index, iid=code, values=values)
+            else:
+                if self.package_rows[code] != values:
+                    self.package_tree.item(code, values=values)
+                if reorder:
+                    self.package_tree.move(code, '', index)
+            self.package_rows[code] = values
+            yield
+    
+    def run_package_tree_update(self, changes, first_visible: float):
+        """Apply package tree changes until the frame budget is used up"""
+        self.package_tree_job = None
+        deadline = time.perf_counter() + self.PACKAGE_TREE_BUDGET_MS / 1000
+        for _ in changes:
+            if time.perf_counter() >= deadline:
+                self.package_tree_job = self.root.after(1, self.run_package_tree_update, changes, first_visible)
+                return
+        self.package_tree.yview_moveto(first_visible)
+    
+    def filter_packages(self):
+        """Filter the package list by the search box"""
+        self.update_package_tree(keep_scroll=False)
+    
+    def get_selected_language_codes(self):
+        """Return the (from_code, to_code) pair selected in the comboboxes"""
+        from_code = self.from_lang_var.get().split('(')[-1].rstrip(')')
+        to_code = self.to_lang_var.get().split('(')[-1].rstrip(')')
+        return from_code, to_code
+    
+    def on_language_selected(self, event=None):
+        """Handle a change of the source or target language"""
+        self.warm_up_selected_pair()
+        self.schedule_live_translation()
+    
+    def warm_up_selected_pair(self, event=None):
+        """Load the model for the selected language pair in the background"""
+        from_code, to_code = self.get_selected_language_codes()
+        if from_code and to_code and from_code != to_code:
+            self.translation_engine.start_warm_up([(from_code, to_code)])
     
     def update_language_count(self):
         """Update the language count in status bar"""
@@ -725,20 +1323,126 @@ Status: Running in compatibility mode
             count = 10  # Demo mode
         self.lang_count_var.set(f"Languages: {count}")
     
+    def update_cache_stats(self):
+        """Update the translation memory counters in the status bar"""
+        stats = self.translation_memory.stats()
+        self.cache_stats_var.set(
+            f"Memory: {stats['hits']} hits / {stats['misses']} misses "
+            f"({stats['disk_bytes'] / MB:.1f} MB on disk)"
+        )
+    
+    def apply_engine_settings(self) -> bool:
+        """Apply performance settings to the engine, rebuilding loaded models if needed"""
+        return self.translation_engine.configure(**get_engine_options(self.gui_settings))
+    
+    def apply_process_pool_setting(self):
+        """Start or stop the worker processes used for translation"""
+        processes = self.gui_settings['translation_processes']
+        if processes > 0:
+            self.translation_engine.set_process_pool(
+                ProcessPoolEngine(processes, engine_options=get_engine_options(self.gui_settings))
+            )
+        else:
+            self.translation_engine.set_process_pool(None)
+    
+    def apply_model_limits(self):
+        """Apply the resident model memory budget and idle timeout"""
+        self.translation_engine.models.configure(
+            self.gui_settings['model_memory_mb'],
+            self.gui_settings['model_idle_minutes'] * 60
+        )
+    
+    def update_resident_models(self, event=None):
+        """Show the loaded models and their estimated sizes in System Information"""
+        models = self.translation_engine.models.resident()
+        total = sum(model['size'] for model in models)
+        evictions = self.translation_engine.models.evictions
+        lines = [f"Resident Models: {len(models)} ({total / MB:.0f} MB, {evictions} unloaded so far)"]
+        for model in reversed(models):
+            state = "in use" if model['in_use'] else f"idle {model['idle_seconds'] / 60:.0f} min"
+            lines.append(f"  {model['from_code']} -> {model['to_code']}: {model['size'] / MB:.0f} MB, {state}")
+        self.resident_models_var.set("\n".join(lines))
+    
+    def clear_translation_memory(self):
+        """Remove every cached translation"""
+        if messagebox.askyesno("Confirm", "Clear all cached translations?"):
+            self.translation_memory.clear()
+            self.update_cache_stats()
+            self.status_var.set("Translation memory cleared")
+    
     def swap_languages(self):
         """Swap the from and to languages"""
         from_lang = self.from_lang_var.get()
         to_lang = self.to_lang_var.get()
         self.from_lang_var.set(to_lang)
         self.to_lang_var.set(from_lang)
+        self.on_language_selected()
+    
+    def on_input_modified(self, event=None):
+        """Schedule a live translation when the input text changes"""
+        if not self.input_text.edit_modified():
+            return
+        self.input_text.edit_modified(False)
+        if self.input_reader is not None:
+            # The input changed while it was being read: start over
+            live = self.input_reader_live
+            self.cancel_input_read()
+            if not live:
+                self.translate_text()
+        if self.live_translate_var.get():
+            self.schedule_live_translation()
+    
+    def schedule_live_translation(self):
+        """(Re)start the debounce timer for live translation"""
+        if self.live_translation_job is not None:
+            self.root.after_cancel(self.live_translation_job)
+            self.live_translation_job = None
+        if self.live_translate_var.get():
+            self.live_translation_job = self.root.after(self.LIVE_TRANSLATION_DELAY_MS, self.run_live_translation)
+    
+    def run_live_translation(self):
+        """Translate the input once typing has paused"""
+        self.live_translation_job = None
+        self.translate_text(live=True)
+    
+    def translate_text(self, live: bool = False):
+        """Translate the input text
+        
+        Args:
+            live: Triggered by live translation; skip dialogs for incomplete input.
+        """
+        self.cancel_input_read()
+        if text_length(self.input_text) > self.LARGE_INPUT_CHARS:
+            # Huge inputs are read a slice at a time so the window stays responsive
+            self.status_var.set("Reading input…")
+            self.input_reader = ChunkedTextReader(self.input_text, lambda text: self.translate_input(text, live))
+            self.input_reader_live = live
+            return
+        self.translate_input(self.input_text.get("1.0", tk.END), live)
     
-    def translate_text(self):
-        """Translate the input text"""
+    def cancel_input_read(self):
+        """Stop reading a huge input"""
+        if self.input_reader is not None:
+            self.input_reader.cancel()
+            self.input_reader = None
+    
+    def translate_input(self, input_text: str, live: bool = False):
+        """Translate text read from the input box
+        
+        Args:
+            input_text: Content of the input box.
+            live: Triggered by live translation; skip dialogs for incomplete input.
+        """
+        self.input_reader = None
         try:
-            # Get input text
-            input_text = self.input_text.get("1.0", tk.END).strip()
+            input_text = input_text.strip()
             if not input_text:
-                messagebox.showwarning("Warning", "Please enter text to translate")
+                if live:
+                    self.translation_worker.cancel()
+                    self.end_translation_stream()
+                    self.output_text.view.show("")
+                else:
+                    messagebox.showwarning("Warning", "Please enter text to translate")
                 return
             
             # Get language codes
@@ -746,19 +1450,27 @@ Status: Running in compatibility mode
             to_lang_str = self.to_lang_var.get()
             
             if not from_lang_str or not to_lang_str:
-                messagebox.showwarning("Warning", "Please select both source and target languages")
+                if not live:
+                    messagebox.showwarning("Warning", "Please select both source and target languages")
+                return
+            
+            if self.languages_loading and not self.languages:
+                if not live:
+                    messagebox.showinfo("Please Wait", "Languages are still loading")
                 return
             
             # Extract language codes
             from_code = from_lang_str.split('(')[-1].rstrip(')')
             to_code = to_lang_str.split('(')[-1].rstrip(')')
             
+            # Results still in flight for an older request are now stale
+            self.translation_worker.cancel()
+            self.multi_translation_worker.cancel()
+            self.end_translation_stream()
+            
             # Check if languages are the same
             if from_code == to_code:
-                self.output_text.config(state=tk.NORMAL)
-                self.output_text.delete("1.0", tk.END)
-                self.output_text.insert("1.0", input_text)
-                self.output_text.config(state=tk.DISABLED)
+                self.output_text.view.show(input_text)
                 return
             
             if not self.argos_available:
@@ -768,12 +1480,23 @@ Status: Running in compatibility mode
             
             # Perform translation
             self.status_var.set("Translating...")
-            self.root.update()
+            if not live:
+                self.root.update()
             
-            # Run translation in thread to prevent GUI freezing
-            thread = threading.Thread(target=self._translate_thread, args=(input_text, from_code, to_code))
-            thread.daemon = True
-            thread.start()
+            # Several targets fan out concurrently, one output tab each
+            extra_codes = [] if live else self.get_extra_target_codes(from_code, to_code)
+            self.reset_target_tabs(extra_codes)
+            if extra_codes:
+                self.multi_translation_worker.submit(input_text, from_code, [to_code] + extra_codes)
+                return
+            
+            # Hand the job to the translation worker; any request still
+            # waiting behind the running one is superseded
+            # Streaming inserts the source and marks every segment in one UI
+            # call, so only text that fits in a render chunk streams in place;
+            # longer text is rendered in chunks (or paged) once translated
+            stream = self.stream_output_var.get() and len(input_text) <= ChunkedTextView.CHUNK_CHARS
+            self.translation_worker.submit(input_text, from_code, to_code, stream)
             
         except Exception as e:
             self.status_var.set(f"Translation error: {str(e)}")
@@ -806,28 +1529,158 @@ Status: Running in compatibility mode
         if translation_key in demo_translations:
             demo_text = demo_translations[translation_key]
         
-        self.output_text.config(state=tk.NORMAL)
-        self.output_text.delete("1.0", tk.END)
-        self.output_text.insert("1.0", demo_text)
-        self.output_text.config(state=tk.DISABLED)
+        self.output_text.view.show(demo_text)
         self.status_var.set("Demo translation completed")
     
-    def _translate_thread(self, text: str, from_code: str, to_code: str):
-        """Translation thread function"""
+    def _translate_thread(self, request_id: int, text: str, from_code: str, to_code: str,
+                          stream: bool = False):
+        """Translation job run on the translation worker thread"""
+        def cancelled():
+            return not self.translation_worker.is_current(request_id)
+        
         try:
-            # Perform translation
-            translated_text = translate.translate(text, from_code, to_code)
+            segments = split_sentences(text, from_code)
+            on_segment = None
+            if stream:
+                # Tell the UI where each segment sits in the source text
+                offsets = [(segment.start, segment.end) for segment in segments]
+                self.message_queue.put(('translation_started', (request_id, text, offsets)))
+                
+                def on_segment(index: int, translated: str):
+                    segment = segments[index]
+                    self.message_queue.put(('translation_chunk',
+                                            (request_id, index, segment.start, segment.end, translated)))
+            
+            # Perform translation; sentences unchanged since the previous
+            # run (e.g. while live translating) reuse their translation
+            translations = self.incremental_translator.translate_segments(
+                [segment.text for segment in segments], from_code, to_code, on_segment, cancelled
+            )
+            translated_text = join_segments(text, segments, translations)
             
             # Queue the result for GUI update
-            self.message_queue.put(('translation_result', translated_text))
+            self.message_queue.put(('translation_result', (request_id, translated_text)))
             
+        except TranslationCancelled:
+            pass
+        except ImportError as e:
+            # The ML stack failed to import on first use (the loaders may
+            # never have imported it); finish the request in demo mode
+            self.message_queue.put(('argos_unavailable', str(e)))
+            self.message_queue.put(('demo_translation', (request_id, text, from_code, to_code)))
+        except Exception as e:
+            self.message_queue.put(('translation_error', (request_id, str(e))))
+    
+    def begin_translation_stream(self, request_id: int, source_text: str, offsets: list):
+        """Show the source text as a placeholder that translated segments replace"""
+        self.end_translation_stream()
+        self.output_text.view.reset()
+        self.output_text.config(state=tk.NORMAL)
+        self.output_text.delete("1.0", tk.END)
+        self.output_text.insert("1.0", source_text, 'pending')
+        
+        # One mark per segment start; marks are set relative to the previous
+        # one so placing them stays linear in the document size. Offsets are
+        # in Python characters and are converted to Tk index units.
+        utf16 = tcl_uses_utf16(self.output_text)
+        lengths = []
+        previous_mark, previous_start = "1.0", 0
+        for index, (start, end) in enumerate(offsets):
+            mark = f"segment_{index}"
+            gap = tk_length(source_text[previous_start:start], utf16)
+            self.output_text.mark_set(mark, f"{previous_mark} + {gap} chars")
+            lengths.append(tk_length(source_text[start:end], utf16))
+            previous_mark, previous_start = mark, start
+        self.output_text.config(state=tk.DISABLED)
+        
+        self.translation_stream = {'request_id': request_id, 'offsets': offsets, 'lengths': lengths}
+    
+    def apply_translation_chunk(self, index: int, translated: str):
+        """Replace one streamed segment with its translation"""
+        length = self.translation_stream['lengths'][index]
+        mark = f"segment_{index}"
+        self.output_text.config(state=tk.NORMAL)
+        self.output_text.delete(mark, f"{mark} + {length} chars")
+        # Marks have right gravity, so every segment mark at this position
+        # (including adjacent, not yet translated ones) moves past the insert
+        self.output_text.insert(mark, translated, ())
+        self.output_text.config(state=tk.DISABLED)
+    
+    def end_translation_stream(self):
+        """Drop the marks used while streaming"""
+        if self.translation_stream is None:
+            return
+        marks = [f"segment_{index}" for index in range(len(self.translation_stream['offsets']))]
+        if marks:
+            self.output_text.mark_unset(*marks)
+        self.output_text.tag_remove('pending', "1.0", tk.END)
+        self.translation_stream = None
+    
+    def is_streaming(self, request_id: int) -> bool:
+        """Return True if request_id is the translation currently streaming into the output"""
+        return self.translation_stream is not None and self.translation_stream['request_id'] == request_id
+    
+    def get_extra_target_codes(self, from_code: str, to_code: str) -> List[str]:
+        """Return the additional target codes selected in the "Also to" list"""
+        codes = []
+        for index in self.extra_targets_list.curselection():
+            code = self.extra_targets_list.get(index).split('(')[-1].rstrip(')')
+            if code not in (from_code, to_code) and code not in codes:
+                codes.append(code)
+        return codes
+    
+    def reset_target_tabs(self, extra_codes: List[str]):
+        """Replace the extra output tabs with empty ones for the given targets"""
+        for output in self.target_outputs.values():
+            self.output_notebook.forget(output.frame)
+            output.frame.destroy()
+        self.target_outputs = {}
+        self.output_notebook.tab(self.output_text.frame, text="Translation")
+        
+        for code in extra_codes:
+            output = self.create_output_text()
+            self.output_notebook.add(output.frame, text=f"{code} …")
+            self.target_outputs[code] = output
+        if extra_codes:
+            self.output_notebook.select(self.output_text.frame)
+    
+    def show_target_result(self, result: TargetResult, primary_code: str):
+        """Show one target of a multi-target translation in its output tab"""
+        output = self.output_text if result.to_code == primary_code else self.target_outputs.get(result.to_code)
+        if output is None:
+            return
+        
+        text = result.text if result.error is None else f"Error: {result.error}"
+        output.view.show(text)
+        self.output_notebook.tab(output.frame, text=f"{result.to_code} ({result.seconds:.2f} s)")
+    
+    def _translate_multi_thread(self, request_id: int, text: str, from_code: str, to_codes: List[str]):
+        """Multi-target translation job run on its own worker thread"""
+        def cancelled():
+            return not self.multi_translation_worker.is_current(request_id)
+        
+        def on_result(result: TargetResult):
+            self.message_queue.put(('target_result', (request_id, to_codes[0], result)))
+        
+        try:
+            started = time.perf_counter()
+            results = self.translation_engine.translate_multi(text, from_code, to_codes, on_result, cancelled)
+            self.message_queue.put(('multi_translation_done',
+                                    (request_id, results, time.perf_counter() - started)))
+        except TranslationCancelled:
+            pass
         except Exception as e:
-            self.message_queue.put(('translation_error', str(e)))
+            self.message_queue.put(('multi_translation_error', (request_id, str(e))))
     
     def copy_translation(self):
         """Copy the translated text to clipboard"""
         try:
-            translated_text = self.output_text.get("1.0", tk.END).strip()
+            # Copy the output tab currently shown
+            selected = self.output_notebook.select()
+            output = next((widget for widget in [self.output_text] + list(self.target_outputs.values())
+                           if str(widget.frame) == selected), self.output_text)
+            # A paged view only holds the current page
+            translated_text = (output.view.text if output.view.paged else output.get("1.0", tk.END)).strip()
             if translated_text:
                 self.root.clipboard_clear()
                 self.root.clipboard_append(translated_text)
@@ -843,16 +1696,20 @@ Status: Running in compatibility mode
             messagebox.showinfo("Demo Mode", "Package management is not available in demo mode")
             return
         
+        index_cache = self.get_index_cache()
+        
         def update_thread():
             try:
                 self.message_queue.put(('status', 'Updating package index...'))
                 self.progress_bar.start()
                 
-                package.update_package_index()
-                
-                self.message_queue.put(('status', 'Package index updated successfully'))
-                self.message_queue.put(('refresh_packages', None))
-                
+                # Shares the request with a load that is already refreshing the index
+                if index_cache.refresh():
+                    self.message_queue.put(('status', 'Package index updated successfully'))
+                    self.message_queue.put(('refresh_packages', None))
+                else:
+                    self.message_queue.put(('status', 'Package index is up to date'))
+                    
             except Exception as e:
                 self.message_queue.put(('error', f'Failed to update package index: {str(e)}'))
             finally:
@@ -865,14 +1722,14 @@ Status: Running in compatibility mode
     def on_package_select(self, event):
         """Handle package selection"""
         selection = self.package_tree.selection()
-        if selection:
+        if selection and selection[0] != self.PACKAGE_PLACEHOLDER:
             item = self.package_tree.item(selection[0])
             values = item['values']
             if values:
                 self.status_var.set(f"Selected: {values[0]} ({values[1]} → {values[2]})")
     
     def install_selected_package(self):
-        """Install the selected package"""
+        """Install the selected packages"""
         if not self.argos_available:
             messagebox.showinfo("Demo Mode", "Package installation is not available in demo mode")
             return
@@ -882,39 +1739,127 @@ Status: Running in compatibility mode
             messagebox.showwarning("Warning", "Please select a package to install")
             return
         
-        item = self.package_tree.item(selection[0])
-        values = item['values']
-        if values and values[4] == "Installed":
+        packages = [self.package_index.by_code[code] for code in selection if code in self.package_index.by_code]
+        packages = [pkg for pkg in packages if not self.package_index.is_installed(pkg)]
+        if not packages:
             messagebox.showinfo("Info", "Package is already installed")
             return
         
-        # Find the package
-        package_name = values[0]
-        pkg = next((p for p in self.available_packages if p.code == package_name), None)
-        
-        if pkg:
-            def install_thread():
+        for pkg in packages:
+            self.start_package_install(pkg)
+    
+    def get_download_manager(self) -> DownloadManager:
+        """Create the download manager on first use"""
+        if self.download_manager is None:
+            self.download_manager = DownloadManager(settings.downloads_dir, self.gui_settings['max_downloads'])
+        return self.download_manager
+    
+    def start_package_install(self, pkg):
+        """Download and install a package in the background"""
+        code = pkg.code
+        if code in self.package_jobs:
+            return  # Already queued
+        self.package_jobs[code] = 'install'
+        self.package_downloads[code] = [0, None]
+        self.update_package_progress()
+        manager = self.get_download_manager()
+        
+        if getattr(pkg, 'type', 'translate') == 'translate' and not getattr(settings, 'stanza_available', True):
+            # Argos Translate also fetches a sentence boundary package in this case
+            future = manager.submit_task(pkg.install)
+        else:
+            last_posted = [0.0]
+            
+            def on_progress(downloaded: int, total: Optional[int]):
+                # Runs on the download thread; about ten updates a second reach the UI
+                now = time.monotonic()
+                if now - last_posted[0] >= 0.1 or downloaded == total:
+                    last_posted[0] = now
+                    self.message_queue.put(('download_progress', (code, downloaded, total)))
+            
+            def install(path: Path):
                 try:
-                    self.message_queue.put(('status', f'Installing {package_name}...'))
-                    self.progress_bar.start()
-                    
-                    pkg.install()
-                    
-                    self.message_queue.put(('status', f'Package {package_name} installed successfully'))
-                    self.message_queue.put(('refresh_packages', None))
-                    self.message_queue.put(('refresh_languages', None))
-                    
-                except Exception as e:
-                    self.message_queue.put(('error', f'Failed to install package: {str(e)}'))
+                    package.install_from_path(path)
                 finally:
-                    self.progress_bar.stop()
+                    # A file that failed to install must not be handed to the next attempt
+                    manager.discard(path.name)
             
-            thread = threading.Thread(target=install_thread)
-            thread.daemon = True
-            thread.start()
+            # The file name has no version, so the download is tied to it separately
+            filename = package.argospm_package_name(pkg) + ".argosmodel"
+            future = manager.submit(filename, pkg.links, package_checksum(pkg), on_progress, install,
+                                    version=str(pkg.package_version))
+        
+        future.add_done_callback(self.package_job_callback(code))
+    
+    def start_package_uninstall(self, pkg):
+        """Uninstall a package in the background, queued with the installs"""
+        code = pkg.code
+        if code in self.package_jobs:
+            return  # Already queued
+        self.package_jobs[code] = 'uninstall'
+        self.update_package_progress()
+        future = self.get_download_manager().submit_task(lambda: package.uninstall(pkg))
+        future.add_done_callback(self.package_job_callback(code))
+    
+    def package_job_callback(self, code: str) -> Callable:
+        """Return a future callback that reports a finished package job to the UI"""
+        def done(future):
+            error = future.exception() if not future.cancelled() else "cancelled"
+            self.message_queue.put(('package_job_done', (code, None if error is None else str(error))))
+        return done
+    
+    def finish_package_job(self, code: str, error: Optional[str]):
+        """Record a finished job; refresh once when the queue has drained"""
+        action = self.package_jobs.pop(code, 'install')
+        self.package_downloads.pop(code, None)
+        self.package_job_results.append((code, action, error))
+        self.update_package_progress()
+        if self.package_jobs:
+            return
+        
+        results, self.package_job_results = self.package_job_results, []
+        failed = [(code, action, error) for code, action, error in results if error is not None]
+        if len(failed) < len(results):
+            # Cached pair resolutions and loaded models may belong to changed packages
+            self.translation_engine.invalidate()
+            # One tree update and language reload for the whole batch
+            self.schedule_refresh('packages')
+            self.schedule_refresh('languages')
+        
+        if len(results) == 1 and not failed:
+            self.status_var.set(f"Package {code} {action}ed successfully")
+        elif not failed:
+            self.status_var.set(f"{len(results)} packages updated successfully")
+        else:
+            self.status_var.set(f"Error: {len(failed)} of {len(results)} package operations failed")
+            messagebox.showerror("Error", "\n".join(
+                f"Failed to {action} package {code}: {error}" for code, action, error in failed
+            ))
+    
+    def update_package_progress(self):
+        """Show the combined progress of the queued package jobs"""
+        if not self.package_downloads:
+            self.progress_bar.config(mode='indeterminate')
+            self.progress_var.set(0)
+            count = len(self.package_jobs)
+            if count:
+                self.status_var.set(f"Uninstalling {count} package{'s' if count != 1 else ''}...")
+            return
+        
+        downloaded = sum(done for done, _ in self.package_downloads.values())
+        total = sum(size or 0 for _, size in self.package_downloads.values())
+        sizes_known = all(size for _, size in self.package_downloads.values())
+        self.progress_bar.config(mode='determinate', maximum=100)
+        self.progress_var.set(downloaded * 100 / total if total and sizes_known else 0)
+        
+        count = len(self.package_downloads)
+        status = f"Downloading {count} package{'s' if count != 1 else ''}: {downloaded / MB:.1f} MB"
+        if sizes_known:
+            status += f" of {total / MB:.1f} MB"
+        self.status_var.set(status)
     
     def uninstall_selected_package(self):
-        """Uninstall the selected package"""
+        """Uninstall the selected packages"""
         if not self.argos_available:
             messagebox.showinfo("Demo Mode", "Package management is not available in demo mode")
             return
@@ -924,37 +1869,22 @@ Status: Running in compatibility mode
             messagebox.showwarning("Warning", "Please select a package to uninstall")
             return
         
-        item = self.package_tree.item(selection[0])
-        values = item['values']
-        if values and values[4] != "Installed":
+        packages = [
+            self.package_index.installed_by_code[code] for code in selection
+            if code in self.package_index.installed_by_code
+        ]
+        if not packages:
             messagebox.showinfo("Info", "Package is not installed")
             return
         
         # Confirm uninstall
-        package_name = values[0]
-        if messagebox.askyesno("Confirm", f"Are you sure you want to uninstall {package_name}?"):
-            def uninstall_thread():
-                try:
-                    self.message_queue.put(('status', f'Uninstalling {package_name}...'))
-                    self.progress_bar.start()
-                    
-                    # Find and uninstall the package
-                    pkg = next((p for p in self.installed_packages if p.code == package_name), None)
-                    if pkg:
-                        package.uninstall_package(pkg)
-                    
-                    self.message_queue.put(('status', f'Package {package_name} uninstalled successfully'))
-                    self.message_queue.put(('refresh_packages', None))
-                    self.message_queue.put(('refresh_languages', None))
-                    
-                except Exception as e:
-                    self.message_queue.put(('error', f'Failed to uninstall package: {str(e)}'))
-                finally:
-                    self.progress_bar.stop()
-            
-            thread = threading.Thread(target=uninstall_thread)
-            thread.daemon = True
-            thread.start()
+        if len(packages) == 1:
+            question = f"Are you sure you want to uninstall {packages[0].code}?"
+        else:
+            question = f"Are you sure you want to uninstall {len(packages)} packages?"
+        if messagebox.askyesno("Confirm", question):
+            for pkg in packages:
+                self.start_package_uninstall(pkg)
     
     def browse_package_directory(self):
         """Browse for package directory"""
@@ -984,6 +1914,47 @@ Status: Running in compatibility mode
                     settings.package_data_dir = Path(new_pkg_dir)
                     settings.package_dirs = [settings.package_data_dir]
             
+            # Translation memory limits apply immediately and are persisted
+            self.gui_settings['memory_cache_mb'] = max(0, self.memory_cache_var.get())
+            self.gui_settings['disk_cache_mb'] = max(0, self.disk_cache_var.get())
+            self.translation_memory.configure(
+                self.gui_settings['memory_cache_mb'],
+                self.gui_settings['disk_cache_mb']
+            )
+            
+            # Engine options apply without a restart; models are rebuilt if needed
+            previous_engine_options = get_engine_options(self.gui_settings)
+            self.gui_settings['inter_threads'] = max(1, self.inter_threads_var.get())
+            self.gui_settings['intra_threads'] = max(0, self.intra_threads_var.get())
+            self.gui_settings['compute_type'] = self.compute_type_var.get()
+            self.gui_settings['beam_size'] = max(1, self.beam_size_var.get())
+            self.gui_settings['max_batch_size'] = max(1, self.max_batch_size_var.get())
+            self.apply_engine_settings()
+            
+            # Worker processes capture the engine options when they start, so
+            # they are restarted when those or the number of processes change
+            processes = max(0, self.translation_processes_var.get())
+            if (processes != self.gui_settings['translation_processes']
+                    or get_engine_options(self.gui_settings) != previous_engine_options):
+                self.gui_settings['translation_processes'] = processes
+                self.apply_process_pool_setting()
+            
+            # Model limits evict right away if the new budget is smaller
+            self.gui_settings['model_memory_mb'] = max(0, self.model_memory_var.get())
+            self.gui_settings['model_idle_minutes'] = max(0, self.model_idle_var.get())
+            self.apply_model_limits()
+            self.update_resident_models()
+            
+            # Applies to downloads started from now on
+            self.gui_settings['max_downloads'] = max(1, self.max_downloads_var.get())
+            if self.download_manager is not None:
+                self.download_manager.set_max_downloads(self.gui_settings['max_downloads'])
+            self.gui_settings['index_ttl_hours'] = max(0, self.index_ttl_var.get())
+            if self.index_cache is not None:
+                self.index_cache.ttl = self.gui_settings['index_ttl_hours'] * 3600
+            save_gui_settings(self.gui_settings)
+            self.update_cache_stats()
+            
             messagebox.showinfo("Success", "Settings saved successfully")
             self.status_var.set("Settings saved")
             
@@ -991,51 +1962,216 @@ Status: Running in compatibility mode
             messagebox.showerror("Error", f"Failed to save settings: {str(e)}")
     
     def check_queue(self):
-        """Check for messages from worker threads"""
-        try:
-            while True:
-                message_type, data = self.message_queue.get_nowait()
-                
-                if message_type == 'translation_result':
-                    self.output_text.config(state=tk.NORMAL)
-                    self.output_text.delete("1.0", tk.END)
-                    self.output_text.insert("1.0", data)
-                    self.output_text.config(state=tk.DISABLED)
-                    self.status_var.set("Translation completed")
-                
-                elif message_type == 'translation_error':
-                    self.status_var.set(f"Translation error: {data}")
-                    messagebox.showerror("Translation Error", data)
-                
-                elif message_type == 'status':
-                    self.status_var.set(data)
-                
-                elif message_type == 'error':
-                    self.status_var.set(f"Error: {data}")
-                    messagebox.showerror("Error", data)
-                
-                elif message_type == 'refresh_packages':
-                    self.load_packages()
-                
-                elif message_type == 'refresh_languages':
-                    self.load_languages()
-                
-        except queue.Empty:
-            pass
+        """Handle messages from worker threads (runs when a worker wakes the UI).
+        
+        Messages are handled until MESSAGE_BUDGET_MS is used up; the rest wait
+        for the next frame so the window keeps repainting. Consecutive status
+        messages collapse into the last one and refresh requests are merged.
+        """
+        self.drain_job = None
+        deadline = time.perf_counter() + self.MESSAGE_BUDGET_MS / 1000
+        handled = 0
+        pending_status = None
+        while True:
+            if handled and time.perf_counter() >= deadline:
+                self.schedule_drain()
+                break
+            try:
+                entry = self.message_queue.get_nowait()
+            except queue.Empty:
+                break
+            (message_type, data), enqueued_at = entry
+            
+            if message_type == 'status':
+                # Only the latest status of a burst is ever visible; it is
+                # handled before the next message or at the end of the frame
+                pending_status = data
+                continue
+            if handled and payload_size(data) >= self.LARGE_PAYLOAD_CHARS:
+                # Start the next frame with it instead of piling it on this one
+                self.message_queue.defer(entry)
+                self.schedule_drain()
+                break
+            
+            if pending_status is not None:
+                self.handle_message('status', pending_status)
+                pending_status = None
+            self.handle_message(message_type, data)
+            self.report_message_latency(message_type, enqueued_at)
+            handled += 1
+        
+        if pending_status is not None:
+            self.handle_message('status', pending_status)
+    
+    def schedule_drain(self):
+        """Continue draining messages on the next frame"""
+        if self.drain_job is None:
+            self.drain_job = self.root.after(1, self.check_queue)
+    
+    def schedule_refresh(self, target: str):
+        """Reload 'packages' or 'languages' once for a burst of refresh requests"""
+        if target not in self.refresh_jobs:
+            self.refresh_jobs[target] = self.root.after(self.REFRESH_COALESCE_MS, self.run_refresh, target)
+    
+    def run_refresh(self, target: str):
+        """Perform a coalesced refresh"""
+        self.refresh_jobs.pop(target, None)
+        if target == 'packages':
+            self.load_packages()
+        else:
+            self.load_languages()
+    
+    def report_message_latency(self, message_type: str, enqueued_at: float):
+        """Record how long a message took to reach the screen; print it in debug mode"""
+        debug = self.debug_var.get()
+        if debug and message_type in self.RESULT_MESSAGES:
+            # Let Tk redraw first so the figure spans "ready" to "on screen"
+            self.root.update_idletasks()
+        latency = self.message_queue.record_latency(message_type, enqueued_at)
+        if debug and message_type in self.RESULT_MESSAGES:
+            print(f"Debug: {message_type} on screen {latency * 1000:.1f} ms after it was ready")
+    
+    def print_message_latency_summary(self):
+        """Print how long each type of worker message waited for the UI this session"""
+        for message_type, stats in sorted(self.message_queue.latency_stats().items()):
+            print(f"Debug: {message_type}: {stats['count']} messages, "
+                  f"mean {stats['mean_ms']:.1f} ms, max {stats['max_ms']:.1f} ms")
+    
+    def handle_message(self, message_type: str, data: Any):
+        """Apply one message from a worker thread to the UI"""
+        if message_type == 'translation_started':
+            request_id, source_text, offsets = data
+            if self.translation_worker.is_current(request_id):
+                self.begin_translation_stream(request_id, source_text, offsets)
+        
+        elif message_type == 'translation_chunk':
+            request_id, index, start, end, translated = data
+            if self.is_streaming(request_id) and self.translation_worker.is_current(request_id):
+                self.apply_translation_chunk(index, translated)
+        
+        elif message_type == 'translation_result':
+            request_id, translated_text = data
+            if not self.translation_worker.is_current(request_id):
+                return  # Superseded by a newer request
+            if self.is_streaming(request_id):
+                # Every segment is already in place
+                self.end_translation_stream()
+            else:
+                self.end_translation_stream()
+                self.output_text.view.show(translated_text)
+            self.status_var.set("Translation completed")
+            self.update_cache_stats()
+        
+        elif message_type == 'translation_error':
+            request_id, error = data
+            if not self.translation_worker.is_current(request_id):
+                return
+            self.end_translation_stream()
+            self.status_var.set(f"Translation error: {error}")
+            messagebox.showerror("Translation Error", error)
         
-        # Schedule next check
-        self.root.after(100, self.check_queue)
+        elif message_type == 'demo_translation':
+            request_id, text, from_code, to_code = data
+            if not self.translation_worker.is_current(request_id):
+                return
+            self.end_translation_stream()
+            self.demo_translate(text, from_code, to_code)
+        
+        elif message_type == 'target_result':
+            request_id, primary_code, result = data
+            if self.multi_translation_worker.is_current(request_id):
+                self.show_target_result(result, primary_code)
+        
+        elif message_type == 'multi_translation_done':
+            request_id, results, elapsed = data
+            if not self.multi_translation_worker.is_current(request_id):
+                return
+            timings = ", ".join(f"{result.to_code} {result.seconds:.2f} s" for result in results)
+            failed = sum(1 for result in results if result.error is not None)
+            status = f"Translated into {len(results) - failed} languages in {elapsed:.2f} s ({timings})"
+            if failed:
+                status += f", {failed} failed"
+            self.status_var.set(status)
+            self.update_cache_stats()
+        
+        elif message_type == 'multi_translation_error':
+            request_id, error = data
+            if not self.multi_translation_worker.is_current(request_id):
+                return
+            self.status_var.set(f"Translation error: {error}")
+            messagebox.showerror("Translation Error", error)
+        
+        elif message_type == 'status':
+            self.status_var.set(data)
+        
+        elif message_type == 'error':
+            self.status_var.set(f"Error: {data}")
+            messagebox.showerror("Error", data)
+        
+        elif message_type == 'refresh_packages':
+            self.schedule_refresh('packages')
+        
+        elif message_type == 'refresh_languages':
+            self.schedule_refresh('languages')
+        
+        elif message_type == 'download_progress':
+            code, downloaded, total = data
+            if code in self.package_downloads:
+                self.package_downloads[code] = [downloaded, total]
+                self.update_package_progress()
+        
+        elif message_type == 'package_job_done':
+            self.finish_package_job(*data)
+        
+        elif message_type == 'languages_loaded':
+            load_id, languages = data
+            if load_id == self.language_load_id:
+                self.show_languages(languages)
+        
+        elif message_type == 'languages_error':
+            load_id, error = data
+            if load_id == self.language_load_id:
+                self.show_languages_error(error)
+        
+        elif message_type == 'packages_loaded':
+            load_id, package_index = data
+            if load_id == self.package_load_id:
+                self.show_packages(package_index)
+        
+        elif message_type == 'packages_error':
+            load_id, error = data
+            if load_id == self.package_load_id:
+                self.show_packages_error(error)
+        
+        elif message_type == 'argos_unavailable':
+            if self.argos_available:
+                # Both loaders report it; switch to demo mode once
+                print(f"Warning: Argos Translate not available: {data}")
+                print("GUI will run in demo mode")
+                self.argos_available = False
+                self.languages_loading = False
+                # Drop whatever the other loader still reports
+                self.language_load_id += 1
+                self.package_load_id += 1
+                self.show_demo_mode()
+                self.startup_step_done('languages')
+                self.startup_step_done('packages')
 
 
 def main():
     """Main function to run the GUI"""
     root = tk.Tk()
     
+    # --import-profile prints how long the deferred imports took once the GUI is interactive;
+    # --eager-tabs builds every tab at startup (the old behaviour) for comparison
+    import_profile = '--import-profile' in sys.argv[1:]
+    eager_tabs = '--eager-tabs' in sys.argv[1:]
+    
     # Set window icon and title
     root.title("Argos Translate - Offline Translation")
     
     # Create the application
-    app = ArgosTranslateGUI(root)
+    app = ArgosTranslateGUI(root, import_profile, eager_tabs)
     
     # Center the window on screen
     root.update_idletasks()
@@ -1050,6 +2186,16 @@ def main():
     
     # Start the GUI
     root.mainloop()
+    
+    if app.debug_var.get():
+        app.print_message_latency_summary()
+    
+    # Stop translation worker processes, if any
+    app.translation_engine.set_process_pool(None)
+    
+    # Interrupted downloads resume next time
+    if app.download_manager is not None:
+        app.download_manager.shutdown()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Batch Scheduler
+Collects concurrent translation requests per language pair into micro-batches
+"""
+
+import concurrent.futures
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from translation_engine import TranslationEngine
+
+
+class _PendingBatch:
+    """Requests waiting for one language pair"""
+    
+    def __init__(self, deadline: float):
+        self.deadline = deadline
+        self.size = 0
+        self.requests: List[Tuple[List[str], concurrent.futures.Future]] = []
+
+
+class BatchScheduler:
+    """Sits between concurrent callers and the engine and batches their segments.
+    
+    A request for a pair whose model is idle is translated right away, so
+    a lone request pays no extra latency. While a batch of the pair is
+    running, new segments are collected until either ``max_batch_size`` are
+    pending, ``max_delay_ms`` has passed since the first of them arrived, or
+    the running batch finishes; they are then translated in one engine call.
+    Each caller gets a future resolving to its own translations.
+    """
+    
+    def __init__(self, engine: TranslationEngine, max_batch_size: int = 32,
+                 max_delay_ms: float = 20, workers: int = 4):
+        """Start the dispatcher thread.
+        
+        Args:
+            engine: Engine that runs the batches.
+            max_batch_size: Pending segments that flush a pair right away.
+            max_delay_ms: Longest time a segment waits for others to join its batch.
+            workers: Batches (of different pairs) translated at the same time.
+        """
+        self.engine = engine
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_delay = max(0.0, max_delay_ms) / 1000
+        self.batches = 0
+        self.requests = 0
+        
+        self._pending: Dict[Tuple[str, str], _PendingBatch] = {}
+        self._running: Dict[Tuple[str, str], int] = {}
+        self._condition = threading.Condition()
+        self._closed = False
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max(1, workers),
+                                                               thread_name_prefix="translation-batch")
+        self._thread = threading.Thread(target=self._dispatch, name="batch-scheduler")
+        self._thread.daemon = True
+        self._thread.start()
+    
+    def submit(self, sentences: List[str], from_code: str, to_code: str) -> concurrent.futures.Future:
+        """Queue sentences for translation, returning a future of their translations"""
+        if not sentences:
+            return self.completed([])
+        
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Batch scheduler is shut down")
+            batch = self._pending.get((from_code, to_code))
+            if batch is None:
+                batch = self._pending[(from_code, to_code)] = _PendingBatch(time.monotonic() + self.max_delay)
+            batch.requests.append((list(sentences), future))
+            batch.size += len(sentences)
+            self.requests += 1
+            self._condition.notify()
+        return future
+    
+    @staticmethod
+    def completed(translations: List[str]) -> concurrent.futures.Future:
+        """Return a future that is already resolved (e.g. for same-language requests)"""
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        future.set_result(translations)
+        return future
+    
+    def translate_segments(self, sentences: List[str], from_code: str, to_code: str,
+                           timeout: Optional[float] = None) -> List[str]:
+        """Translate sentences, blocking until their batch is done"""
+        return self.submit(sentences, from_code, to_code).result(timeout)
+    
+    def _dispatch(self):
+        """Hand pairs whose batch is full or due to the executor"""
+        while True:
+            with self._condition:
+                while True:
+                    now = time.monotonic()
+                    due = [pair for pair, batch in self._pending.items()
+                           if batch.size >= self.max_batch_size or batch.deadline <= now
+                           or not self._running.get(pair) or self._closed]
+                    if due or (self._closed and not self._pending):
+                        break
+                    timeout = None
+                    if self._pending:
+                        timeout = min(batch.deadline for batch in self._pending.values()) - now
+                    self._condition.wait(timeout)
+                if not due:
+                    return
+                ready = [(pair, self._pending.pop(pair)) for pair in due]
+                for pair, _ in ready:
+                    self._running[pair] = self._running.get(pair, 0) + 1
+                    self.batches += 1
+            
+            for pair, batch in ready:
+                self._executor.submit(self._run_batch, pair, batch.requests)
+    
+    def _run_batch(self, pair: Tuple[str, str], requests: List[Tuple[List[str], concurrent.futures.Future]]):
+        """Translate a batch and route each caller's share of the results back"""
+        try:
+            self._translate_batch(pair, requests)
+        finally:
+            # The pair is free again: whatever queued up meanwhile can go now
+            with self._condition:
+                self._running[pair] -= 1
+                if not self._running[pair]:
+                    del self._running[pair]
+                self._condition.notify()
+    
+    def _translate_batch(self, pair: Tuple[str, str], requests: List[Tuple[List[str], concurrent.futures.Future]]):
+        """Run one engine call for a batch of requests"""
+        # Callers that gave up (cancelled futures) are left out
+        requests = [(sentences, future) for sentences, future in requests
+                    if future.set_running_or_notify_cancel()]
+        if not requests:
+            return
+        
+        combined = [sentence for sentences, _ in requests for sentence in sentences]
+        try:
+            translations = self.engine.translate_segments(combined, *pair)
+        except Exception as e:
+            for _, future in requests:
+                future.set_exception(e)
+            return
+        
+        position = 0
+        for sentences, future in requests:
+            future.set_result(translations[position:position + len(sentences)])
+            position += len(sentences)
+    
+    def stats(self) -> Dict[str, float]:
+        """Return request and batch counters"""
+        with self._condition:
+            return {
+                'requests': self.requests,
+                'batches': self.batches,
+                'requests_per_batch': self.requests / self.batches if self.batches else 0.0,
+            }
+    
+    def shutdown(self, wait: bool = True):
+        """Flush pending batches and stop the dispatcher"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+GUI Settings
+Persisted preferences of the Argos Translate GUI
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+# Weight types offered for CTranslate2 models ('default' keeps the model's own)
+COMPUTE_TYPES = ['default', 'int8', 'int8_float32', 'float32']
+
+# Default values for every persisted preference
+DEFAULT_SETTINGS: Dict[str, Any] = {
+    'memory_cache_mb': 32,
+    'disk_cache_mb': 256,
+    # Worker processes per language pair, 0 translates in the GUI process
+    'translation_processes': 0,
+    # Resident model budget (0 = unlimited) and idle unload timeout (0 = never)
+    'model_memory_mb': 0,
+    'model_idle_minutes': 0,
+    # CTranslate2 options (intra_threads 0 = automatic)
+    'inter_threads': 1,
+    'intra_threads': 0,
+    'compute_type': 'default',
+    'beam_size': 4,
+    'max_batch_size': 32,
+    # Package downloads running at the same time
+    'max_downloads': 3,
+    # Hours before the package index is checked for changes again
+    'index_ttl_hours': 24,
+}
+
+
+# Settings passed to TranslationEngine.configure
+ENGINE_OPTIONS = ('inter_threads', 'intra_threads', 'compute_type', 'beam_size', 'max_batch_size')
+
+
+def get_engine_options(values: Dict[str, Any]) -> Dict[str, Any]:
+    """Pick the TranslationEngine options out of the settings"""
+    return {name: values[name] for name in ENGINE_OPTIONS}
+
+
+def get_settings_path() -> Path:
+    """Return the path of the GUI settings file"""
+    config_home = os.getenv('XDG_CONFIG_HOME', str(Path.home() / ".config"))
+    return Path(config_home) / "argos-translate-gui" / "settings.json"
+
+
+def load_gui_settings() -> Dict[str, Any]:
+    """Load persisted settings, filling in defaults for anything missing"""
+    values = dict(DEFAULT_SETTINGS)
+    try:
+        with open(get_settings_path(), encoding='utf-8') as settings_file:
+            stored = json.load(settings_file)
+        if isinstance(stored, dict):
+            values.update({key: value for key, value in stored.items() if key in DEFAULT_SETTINGS})
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as e:
+        print(f"Warning: Could not read GUI settings: {e}")
+    return values
+
+
+def save_gui_settings(values: Dict[str, Any]):
+    """Persist settings"""
+    path = get_settings_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as settings_file:
+        json.dump(values, settings_file, indent=2)
+
+
+def get_language_cache_path() -> Path:
+    """Return the path of the cached list of installed languages"""
+    return get_settings_path().parent / "languages.json"
+
+
+def load_language_cache() -> List[Tuple[str, str]]:
+    """Return the (name, code) languages found on the last run, if any"""
+    try:
+        with open(get_language_cache_path(), encoding='utf-8') as cache_file:
+            stored = json.load(cache_file)
+        return [(str(name), str(code)) for name, code in stored]
+    except FileNotFoundError:
+        return []
+    except (OSError, ValueError, TypeError) as e:
+        print(f"Warning: Could not read language cache: {e}")
+        return []
+
+
+def save_language_cache(languages: List[Tuple[str, str]]):
+    """Remember the installed (name, code) languages for the next startup"""
+    path = get_language_cache_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as cache_file:
+            json.dump([list(language) for language in languages], cache_file)
+    except OSError as e:
+        print(f"Warning: Could not save language cache: {e}")
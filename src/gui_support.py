@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+GUI Support
+Helpers shared by both GUI versions for moving work between threads and the Tk loop
+"""
+
+import tkinter as tk
+from tkinter import ttk
+import os
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class UIMessageQueue:
+    """Message queue that wakes the Tk event loop when a worker posts to it.
+    
+    Instead of polling, ``put`` signals the Tk loop, which then calls
+    ``on_messages`` on the UI thread. On POSIX the signal is a byte written
+    to a pipe watched with a Tk file handler; elsewhere (Windows has no Tk
+    file handlers) it is a virtual event. Only one wakeup is outstanding at
+    a time, so a burst of messages costs a single wakeup, and the loop
+    sleeps fully while nothing is queued.
+    """
+    
+    WAKEUP_EVENT = '<<UIMessagesQueued>>'
+    
+    def __init__(self, root, on_messages: Callable[[], None]):
+        """Create the queue.
+        
+        Args:
+            root: The Tk root window.
+            on_messages: Called on the UI thread to drain the queue.
+        """
+        self._root = root
+        self._on_messages = on_messages
+        self._queue: "queue.Queue[Tuple[Any, float]]" = queue.Queue()
+        # Messages taken but put back for a later frame (UI thread only)
+        self._deferred: "deque[Tuple[Any, float]]" = deque()
+        self._lock = threading.Lock()
+        self._signalled = False
+        self._pipe = None
+        # Delivery latency per message type: [count, total seconds, max seconds]
+        self._latency: Dict[str, list] = {}
+        
+        if os.name != 'nt' and hasattr(root.tk, 'createfilehandler'):
+            read_fd, write_fd = os.pipe()
+            os.set_blocking(read_fd, False)
+            os.set_blocking(write_fd, False)
+            self._pipe = (read_fd, write_fd)
+            root.tk.createfilehandler(read_fd, tk.READABLE, self._on_pipe_readable)
+        else:
+            root.bind(self.WAKEUP_EVENT, lambda event: self._deliver())
+        
+        # Anything posted before the main loop started is delivered once it runs
+        root.after_idle(self._deliver)
+    
+    def put(self, message: Any):
+        """Queue a message and wake the UI thread"""
+        self._queue.put((message, time.perf_counter()))
+        with self._lock:
+            if self._signalled:
+                return
+            self._signalled = True
+        self._wake()
+    
+    def _wake(self):
+        """Signal the Tk loop that messages are waiting"""
+        try:
+            if threading.current_thread() is threading.main_thread():
+                self._root.after_idle(self._deliver)
+            elif self._pipe is not None:
+                os.write(self._pipe[1], b'\0')
+            else:
+                self._root.event_generate(self.WAKEUP_EVENT, when='tail')
+        except (BlockingIOError, InterruptedError):
+            pass  # The pipe is full, so a wakeup is already pending
+        except Exception:
+            # The Tk loop is not running (yet or anymore); the next put retries
+            with self._lock:
+                self._signalled = False
+    
+    def _on_pipe_readable(self, fd: int, mask: int):
+        """Tk file handler: empty the pipe and deliver messages"""
+        try:
+            while os.read(fd, 4096):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
+        self._deliver()
+    
+    def _deliver(self):
+        """Hand queued messages to on_messages"""
+        with self._lock:
+            self._signalled = False
+        if not self.empty():
+            self._on_messages()
+    
+    def get_nowait(self) -> Tuple[Any, float]:
+        """Return the next (message, enqueued_at) pair or raise queue.Empty"""
+        if self._deferred:
+            return self._deferred.popleft()
+        return self._queue.get_nowait()
+    
+    def defer(self, entry: Tuple[Any, float]):
+        """Put an entry taken with get_nowait back at the head of the queue"""
+        self._deferred.appendleft(entry)
+    
+    def empty(self) -> bool:
+        """Return True if no message is waiting"""
+        return not self._deferred and self._queue.empty()
+    
+    def record_latency(self, message_type: str, enqueued_at: float) -> float:
+        """Record how long a message waited before it was handled, in seconds"""
+        latency = time.perf_counter() - enqueued_at
+        stats = self._latency.setdefault(message_type, [0, 0.0, 0.0])
+        stats[0] += 1
+        stats[1] += latency
+        stats[2] = max(stats[2], latency)
+        return latency
+    
+    def latency_stats(self) -> Dict[str, Dict[str, float]]:
+        """Return count, mean and max delivery latency (ms) per message type"""
+        return {
+            message_type: {'count': count, 'mean_ms': total / count * 1000, 'max_ms': maximum * 1000}
+            for message_type, (count, total, maximum) in self._latency.items()
+        }
+    
+    def close(self):
+        """Stop watching the wakeup pipe"""
+        if self._pipe is not None:
+            self._root.tk.deletefilehandler(self._pipe[0])
+            for fd in self._pipe:
+                os.close(fd)
+            self._pipe = None
+
+
+def payload_size(data: Any) -> int:
+    """Rough size of a message payload: characters of the text it carries"""
+    if isinstance(data, str):
+        return len(data)
+    if isinstance(data, (tuple, list)):
+        return sum(len(item) for item in data if isinstance(item, str))
+    return 0
+
+
+def split_pages(text: str, page_size: int) -> List[Tuple[int, int]]:
+    """Split text into (start, end) pages of about page_size characters, at line breaks where possible"""
+    pages = []
+    start = 0
+    while len(text) - start > page_size:
+        end = text.rfind('\n', start, start + page_size) + 1
+        if end <= start:
+            end = start + page_size  # A single line longer than a page
+        pages.append((start, end))
+        start = end
+    pages.append((start, len(text)))
+    return pages
+
+
+class ChunkedTextView:
+    """Shows text in a read-only ScrolledText without blocking the Tk loop.
+    
+    Short text is inserted at once. Longer text is inserted CHUNK_CHARS at
+    a time from idle callbacks, with a "Rendering..." indicator below the
+    widget, so the window keeps repainting and handling input meanwhile.
+    Text longer than PAGE_CHARS is split into pages, and only the current
+    page is ever loaded into the widget.
+    """
+    
+    CHUNK_CHARS = 64 * 1024
+    PAGE_CHARS = 1024 * 1024
+    
+    def __init__(self, output):
+        """Attach to a ScrolledText (its bar goes into the widget's frame)"""
+        self.output = output
+        self.text = ""
+        self.pages: List[Tuple[int, int]] = [(0, 0)]
+        self.page = 0
+        self._job = None
+        self._position = 0
+        self._page_end = 0
+        
+        self.bar = ttk.Frame(output.frame)
+        self.progress_var = tk.StringVar()
+        ttk.Label(self.bar, textvariable=self.progress_var).pack(side=tk.LEFT, padx=5)
+        
+        self.page_frame = ttk.Frame(self.bar)
+        self.next_button = ttk.Button(self.page_frame, text="Next ▶",
+                                      command=lambda: self.show_page(self.page + 1))
+        self.next_button.pack(side=tk.RIGHT)
+        self.page_var = tk.StringVar()
+        ttk.Label(self.page_frame, textvariable=self.page_var).pack(side=tk.RIGHT, padx=10)
+        self.previous_button = ttk.Button(self.page_frame, text="◀ Previous",
+                                          command=lambda: self.show_page(self.page - 1))
+        self.previous_button.pack(side=tk.RIGHT)
+    
+    @property
+    def paged(self) -> bool:
+        """True if the text is split into several pages"""
+        return len(self.pages) > 1
+    
+    @property
+    def rendering(self) -> bool:
+        """True while chunks are still being inserted"""
+        return self._job is not None
+    
+    def show(self, text: str):
+        """Replace the shown text"""
+        self.cancel()
+        self.text = text
+        self.pages = split_pages(text, self.PAGE_CHARS)
+        if self.paged:
+            self.page_frame.pack(side=tk.RIGHT)
+        else:
+            self.page_frame.pack_forget()
+        self.show_page(0)
+    
+    def reset(self):
+        """Forget the text without touching the widget (e.g. before it is streamed into directly)"""
+        self.cancel()
+        self.text = ""
+        self.pages = [(0, 0)]
+        self.page_frame.pack_forget()
+        self._update_bar()
+    
+    def show_page(self, index: int):
+        """Load one page into the widget"""
+        self.cancel()
+        self.page = max(0, min(index, len(self.pages) - 1))
+        start, end = self.pages[self.page]
+        self.page_var.set(f"Page {self.page + 1} of {len(self.pages)}")
+        self.previous_button.config(state=tk.NORMAL if self.page > 0 else tk.DISABLED)
+        self.next_button.config(state=tk.NORMAL if self.page < len(self.pages) - 1 else tk.DISABLED)
+        
+        self.output.config(state=tk.NORMAL)
+        self.output.delete("1.0", tk.END)
+        if end - start <= self.CHUNK_CHARS:
+            self.output.insert("1.0", self.text[start:end])
+            self.output.config(state=tk.DISABLED)
+            self._update_bar()
+            return
+        self.output.config(state=tk.DISABLED)
+        self._position = start
+        self._page_end = end
+        self._render_chunk()
+    
+    def _render_chunk(self):
+        """Insert the next chunk and schedule the one after it"""
+        start, end = self._position, min(self._position + self.CHUNK_CHARS, self._page_end)
+        self.output.config(state=tk.NORMAL)
+        self.output.insert(tk.END, self.text[start:end])
+        self.output.config(state=tk.DISABLED)
+        self._position = end
+        
+        if end < self._page_end:
+            page_start = self.pages[self.page][0]
+            percent = (end - page_start) * 100 // (self._page_end - page_start)
+            self.progress_var.set(f"Rendering… {percent}%")
+            self._job = self.output.after_idle(self._render_chunk)
+        else:
+            self._job = None
+        self._update_bar()
+    
+    def cancel(self):
+        """Stop inserting chunks"""
+        if self._job is not None:
+            self.output.after_cancel(self._job)
+            self._job = None
+    
+    def _update_bar(self):
+        """Show the bar while rendering or paging"""
+        if not self.rendering:
+            self.progress_var.set("")
+        if self.rendering or self.paged:
+            if not self.bar.winfo_ismapped():
+                self.bar.pack(side=tk.BOTTOM, fill=tk.X, before=self.output.vbar)
+        else:
+            self.bar.pack_forget()
+
+
+class ChunkedTextReader:
+    """Reads the content of a Text widget a slice of lines per idle callback.
+    
+    Used for huge inputs, so one get() of the whole widget does not stall
+    the Tk loop. The result is the same as widget.get("1.0", tk.END).
+    """
+    
+    LINES_PER_CHUNK = 2000
+    
+    def __init__(self, widget, on_done: Callable[[str], None]):
+        self._widget = widget
+        self._on_done = on_done
+        self._parts: List[str] = []
+        self._line = 1
+        self._last_line = int(widget.index(tk.END).split('.')[0])
+        self._job: Optional[str] = widget.after_idle(self._read_chunk)
+    
+    def _read_chunk(self):
+        """Read the next slice of lines"""
+        end_line = self._line + self.LINES_PER_CHUNK
+        self._parts.append(self._widget.get(f"{self._line}.0", f"{end_line}.0"))
+        self._line = end_line
+        if self._line <= self._last_line:
+            self._job = self._widget.after_idle(self._read_chunk)
+            return
+        self._job = None
+        self._on_done("".join(self._parts))
+    
+    def cancel(self):
+        """Stop reading; on_done is not called"""
+        if self._job is not None:
+            self._widget.after_cancel(self._job)
+            self._job = None
+
+
+def tcl_uses_utf16(widget) -> bool:
+    """Return True if Tcl counts a character outside the BMP as two (Tcl 8.6)"""
+    return int(widget.tk.call('string', 'length', '\U0001F600')) == 2
+
+
+def tk_length(text: str, utf16: bool) -> int:
+    """Length of text in Tk index units ("+N chars").
+    
+    Tcl 8.6 stores strings as UTF-16, so emoji and other characters above
+    U+FFFF take two index positions there but one in Python.
+    """
+    if not utf16:
+        return len(text)
+    return len(text.encode('utf-16-le')) // 2
+
+
+def text_length(widget) -> int:
+    """Number of characters in a Text widget, without copying its content"""
+    count = widget.count("1.0", tk.END, "chars")
+    return count[0] if count else 0
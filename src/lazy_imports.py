@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Lazy Imports
+Defers importing Argos Translate's heavy dependencies until they are first used
+"""
+
+import importlib
+import importlib.util
+import sys
+import threading
+import time
+from typing import Any, Iterable, List, Tuple
+
+# Third-party modules argostranslate.translate pulls in; importing them one by
+# one first gives each its own line in the import profile
+TRANSLATE_DEPENDENCIES = ('ctranslate2', 'sentencepiece', 'stanza')
+
+# (module, seconds, thread name) of every import done through import_module
+_profile: List[Tuple[str, float, str]] = []
+_profile_lock = threading.Lock()
+
+
+def import_module(name: str):
+    """Import a module, recording how long it took if it was not loaded yet"""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    
+    started = time.perf_counter()
+    module = importlib.import_module(name)
+    elapsed = time.perf_counter() - started
+    with _profile_lock:
+        _profile.append((name, elapsed, threading.current_thread().name))
+    return module
+
+
+def is_available(name: str) -> bool:
+    """Return True if a top-level module can be found, without importing it"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+class LazyModule:
+    """Stand-in for a module that imports it on first attribute access.
+    
+    Whichever thread touches the module first pays for the import; the GUI
+    makes sure that is a background thread, so the window never waits on
+    CTranslate2, SentencePiece or Stanza.
+    """
+    
+    def __init__(self, name: str, requires: Iterable[str] = ()):
+        """Create the stand-in.
+        
+        Args:
+            name: Module to import.
+            requires: Modules to import (and time) before it.
+        """
+        self._name = name
+        self._requires = tuple(requires)
+        self._module = None
+        self._lock = threading.Lock()
+    
+    @property
+    def loaded(self) -> bool:
+        """True once the module has been imported"""
+        return self._module is not None
+    
+    def load(self):
+        """Import the module now (if needed) and return it.
+        
+        Raises:
+            ImportError: If the module or one it requires failed to import,
+                whatever exception the import itself raised (broken native
+                extensions and incompatible dependencies raise others).
+        """
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    try:
+                        for name in self._requires:
+                            import_module(name)
+                        self._module = import_module(self._name)
+                    except ImportError:
+                        raise
+                    except Exception as e:
+                        raise ImportError(f"Importing {self._name} failed: {type(e).__name__}: {e}") from e
+        return self._module
+    
+    def __getattr__(self, attribute: str) -> Any:
+        # Only called for attributes the stand-in itself does not have
+        return getattr(self.load(), attribute)
+    
+    def __repr__(self) -> str:
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def import_profile() -> List[Tuple[str, float, str]]:
+    """Return (module, seconds, thread name) for every timed import, in order"""
+    with _profile_lock:
+        return list(_profile)
+
+
+def format_import_profile() -> str:
+    """Describe the timed imports, one per line"""
+    profile = import_profile()
+    if not profile:
+        return "Import profile: no deferred imports yet"
+    lines = [f"Import profile ({sum(seconds for _, seconds, _ in profile) * 1000:.0f} ms total):"]
+    for name, seconds, thread_name in profile:
+        lines.append(f"  {seconds * 1000:8.1f} ms  {name}  [{thread_name}]")
+    return "\n".join(lines)
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Model Registry
+Tracks loaded CTranslate2 models and evicts them to stay within a memory budget
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from translation_memory import MB
+
+
+def estimate_model_size(model_path: Path) -> int:
+    """Estimate the memory a model takes once loaded (its size on disk)"""
+    try:
+        return sum(path.stat().st_size for path in Path(model_path).rglob('*') if path.is_file())
+    except OSError:
+        return 0
+
+
+class _ResidentModel:
+    """A loaded package translation and its bookkeeping"""
+    
+    def __init__(self, pkg_translation: Any, size: int):
+        self.pkg_translation = pkg_translation
+        self.size = size
+        self.last_used = time.monotonic()
+
+
+class ModelRegistry:
+    """LRU of loaded package translators with a memory budget and an idle timeout.
+    
+    Models are keyed by the (from_code, to_code) of their package. When the
+    estimated total exceeds the budget, or a model has not been used for
+    the idle timeout, its translator is dropped; the engine reloads it on
+    demand. Models that are loading or translating right now, and the most
+    recently used model, are never evicted for the budget.
+    """
+    
+    def __init__(self, memory_budget_mb: float = 0, idle_timeout: float = 0):
+        """Create the registry.
+        
+        Args:
+            memory_budget_mb: Budget for resident models, 0 for unlimited.
+            idle_timeout: Seconds after which an unused model is unloaded, 0 to keep it.
+        """
+        self.memory_budget = int(memory_budget_mb * MB)
+        self.idle_timeout = idle_timeout
+        self.evictions = 0
+        self._models: "OrderedDict[Tuple[str, str], _ResidentModel]" = OrderedDict()
+        # Uses of package translations loading or translating right now, by id()
+        self._pins: Dict[int, int] = {}
+        # Models dropped while in use, by id() of their package translation;
+        # unloaded as soon as they are released. A model loaded for the same
+        # pair meanwhile takes their key in _models.
+        self._stale: Dict[int, _ResidentModel] = {}
+        self._lock = threading.Lock()
+        self._monitor: Optional[threading.Thread] = None
+        self._monitor_wakeup = threading.Event()
+    
+    @staticmethod
+    def key(pkg_translation: Any) -> Tuple[str, str]:
+        """Registry key of a package translation"""
+        return (pkg_translation.pkg.from_code, pkg_translation.pkg.to_code)
+    
+    def configure(self, memory_budget_mb: Optional[float] = None, idle_timeout: Optional[float] = None):
+        """Change the limits, evicting models right away if needed"""
+        with self._lock:
+            if memory_budget_mb is not None:
+                self.memory_budget = int(memory_budget_mb * MB)
+            if idle_timeout is not None:
+                self.idle_timeout = idle_timeout
+            self._evict()
+        self._monitor_wakeup.set()
+    
+    def add(self, pkg_translation: Any):
+        """Register a freshly loaded package translation"""
+        size = estimate_model_size(Path(pkg_translation.pkg.package_path) / "model")
+        key = self.key(pkg_translation)
+        with self._lock:
+            previous = self._models.get(key)
+            if previous is not None and previous.pkg_translation is not pkg_translation:
+                self._retire(key)
+            self._models[key] = _ResidentModel(pkg_translation, size)
+            self._evict()
+    
+    @contextmanager
+    def use(self, pkg_translations: Iterable[Any]):
+        """Pin models while they load and translate, then mark them recently used"""
+        pinned = list(pkg_translations)
+        with self._lock:
+            for pkg_translation in pinned:
+                self._pins[id(pkg_translation)] = self._pins.get(id(pkg_translation), 0) + 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                now = time.monotonic()
+                for pkg_translation in pinned:
+                    ident = id(pkg_translation)
+                    self._pins[ident] -= 1
+                    if not self._pins[ident]:
+                        del self._pins[ident]
+                        stale = self._stale.pop(ident, None)
+                        if stale is not None:
+                            stale.pkg_translation.translator = None
+                            self.evictions += 1
+                    key = self.key(pkg_translation)
+                    model = self._models.get(key)
+                    if model is not None and model.pkg_translation is pkg_translation:
+                        model.last_used = now
+                        self._models.move_to_end(key)
+                self._evict()
+    
+    def _evict(self, idle_only: bool = False):
+        """Unload idle and least recently used models (caller holds the lock)"""
+        now = time.monotonic()
+        most_recent = next(reversed(self._models), None)
+        for key, model in list(self._models.items()):
+            if id(model.pkg_translation) in self._pins:
+                continue
+            idle = self.idle_timeout and now - model.last_used >= self.idle_timeout
+            over_budget = (not idle_only and self.memory_budget and key != most_recent
+                           and self.resident_size() > self.memory_budget)
+            if idle or over_budget:
+                self._unload(key)
+    
+    def _unload(self, key: Tuple[str, str]):
+        """Drop a model's translator (caller holds the lock)"""
+        model = self._models.pop(key)
+        model.pkg_translation.translator = None
+        self.evictions += 1
+    
+    def _retire(self, key: Tuple[str, str]):
+        """Unload a model now, or as soon as it is released if it is in use (caller holds the lock)"""
+        ident = id(self._models[key].pkg_translation)
+        if ident in self._pins:
+            self._stale[ident] = self._models.pop(key)
+        else:
+            self._unload(key)
+    
+    def resident_size(self) -> int:
+        """Estimated bytes of all resident models, including in-use ones waiting to be unloaded"""
+        return (sum(model.size for model in self._models.values())
+                + sum(model.size for model in self._stale.values()))
+    
+    def evict_idle(self):
+        """Unload models that have been idle longer than the idle timeout"""
+        with self._lock:
+            self._evict(idle_only=True)
+    
+    def clear(self):
+        """Unload every model (e.g. after packages or load options changed).
+        
+        Models in use are unloaded as soon as their translation finishes.
+        """
+        with self._lock:
+            for key in list(self._models):
+                self._retire(key)
+    
+    def resident(self) -> List[Dict[str, Any]]:
+        """Describe resident models, least recently used first"""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    'from_code': key[0],
+                    'to_code': key[1],
+                    'size': model.size,
+                    'idle_seconds': now - model.last_used,
+                    'in_use': id(model.pkg_translation) in self._pins,
+                }
+                for key, model in self._models.items()
+            ]
+    
+    def start_idle_monitor(self, interval: float = 30):
+        """Check for idle models periodically on a background thread"""
+        if self._monitor is not None:
+            return
+        
+        def monitor():
+            while True:
+                self._monitor_wakeup.wait(interval)
+                self._monitor_wakeup.clear()
+                if self.idle_timeout:
+                    self.evict_idle()
+        
+        self._monitor = threading.Thread(target=monitor, name="model-idle-monitor")
+        self._monitor.daemon = True
+        self._monitor.start()
@@ -0,0 +1,564 @@
+#!/usr/bin/env python3
+"""
+Package Manager
+Indexes, searches, downloads and registers Argos Translate language packages
+"""
+
+import concurrent.futures
+import hashlib
+import http.client
+import json
+import os
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+USER_AGENT = "ArgosTranslateGUI"
+
+# Installed package registry, kept in the package data directory
+REGISTRY_FILENAME = ".gui-registry.json"
+
+# Words of the searchable text are split on anything that is not a letter or digit
+WORD_SEPARATOR = re.compile(r'[\W_]+')
+
+
+def package_pair(pkg: Any) -> str:
+    """Return the 'from-to' pair of a package"""
+    return f"{pkg.from_code}-{pkg.to_code}"
+
+
+class PackageIndex:
+    """Lookup tables and a search index over the available and installed packages.
+    
+    Packages are found by code in O(1). Search terms shorter than three
+    characters match the start of a word (package code, language code or
+    language name) through a prefix table; longer terms are narrowed down
+    with a trigram table and then checked as substrings. Building the index
+    is linear in the number of packages, so it is rebuilt on every refresh.
+    """
+    
+    # Term length from which the trigram table is used instead of word prefixes
+    TRIGRAM_LENGTH = 3
+    
+    def __init__(self, available_packages: Iterable[Any] = (), installed_packages: Iterable[Any] = ()):
+        self.packages: List[Any] = list(available_packages)
+        self.installed_packages: List[Any] = list(installed_packages)
+        self.by_code: Dict[str, Any] = {pkg.code: pkg for pkg in self.packages}
+        self.installed_by_code: Dict[str, Any] = {pkg.code: pkg for pkg in self.installed_packages}
+        self.installed_pairs: Set[str] = {package_pair(pkg) for pkg in self.installed_packages}
+        
+        self._text: Dict[str, str] = {}
+        self._prefixes: Dict[str, Set[str]] = {}
+        self._trigrams: Dict[str, Set[str]] = {}
+        for pkg in self.packages:
+            text = " ".join(str(value) for value in (
+                pkg.code, package_pair(pkg), pkg.from_name, pkg.to_name
+            )).lower()
+            self._text[pkg.code] = text
+            for word in WORD_SEPARATOR.split(text):
+                for length in range(1, min(len(word), self.TRIGRAM_LENGTH - 1) + 1):
+                    self._prefixes.setdefault(word[:length], set()).add(pkg.code)
+            for start in range(len(text) - self.TRIGRAM_LENGTH + 1):
+                self._trigrams.setdefault(text[start:start + self.TRIGRAM_LENGTH], set()).add(pkg.code)
+    
+    def is_installed(self, pkg: Any) -> bool:
+        """Return True if a package for the same language pair is installed"""
+        return package_pair(pkg) in self.installed_pairs
+    
+    def search(self, query: str) -> List[Any]:
+        """Return the packages matching every term of the query, in index order"""
+        terms = query.lower().split()
+        if not terms:
+            return list(self.packages)
+        
+        matches = None
+        for term in terms:
+            codes = self._match_term(term)
+            matches = codes if matches is None else matches & codes
+            if not matches:
+                return []
+        return [pkg for pkg in self.packages if pkg.code in matches]
+    
+    def _match_term(self, term: str) -> Set[str]:
+        """Return the codes of packages containing one search term"""
+        if len(term) < self.TRIGRAM_LENGTH:
+            return self._prefixes.get(term, set())
+        
+        candidates = None
+        for start in range(len(term) - self.TRIGRAM_LENGTH + 1):
+            codes = self._trigrams.get(term[start:start + self.TRIGRAM_LENGTH], set())
+            candidates = codes if candidates is None else candidates & codes
+            if not candidates:
+                return set()
+        # Trigrams can match out of order, so confirm the substring
+        return {code for code in candidates if term in self._text[code]}
+
+
+class DownloadError(Exception):
+    """A package file could not be downloaded"""
+
+
+def package_checksum(pkg: Any) -> Optional[Tuple[str, str]]:
+    """Return (hash algorithm, hex digest) for a package if its index entry has one"""
+    for algorithm in ('sha256', 'sha1', 'md5'):
+        value = getattr(pkg, algorithm, None)
+        if value:
+            return algorithm, str(value).lower()
+    checksum = getattr(pkg, 'checksum', None)
+    if checksum:
+        # 'sha256:<digest>' or a bare SHA-256 digest
+        algorithm, _, digest = str(checksum).rpartition(':')
+        return (algorithm or 'sha256').lower(), digest.lower()
+    return None
+
+
+class DownloadManager:
+    """Downloads package files concurrently, resuming interrupted downloads.
+    
+    At most ``max_downloads`` files download at the same time. Each one
+    streams into '<name>.part' in the downloads directory; after a dropped
+    connection the next attempt asks for the rest with an HTTP Range
+    request (a server that ignores it sends the whole file again). The
+    version and links a file was downloaded for are kept in
+    '<name>.source.json'; a partial or finished file left over from another
+    version is discarded instead of resumed. The checksum, when the index
+    provides one, is computed while streaming. Progress callbacks run on
+    the download threads.
+    """
+    
+    CHUNK_SIZE = 64 * 1024
+    # Seconds to wait before the second round of attempts, doubling up to the maximum
+    RETRY_DELAY = 1
+    MAX_RETRY_DELAY = 10
+    
+    def __init__(self, downloads_dir: Path, max_downloads: int = 3, retries: int = 3, timeout: float = 30):
+        """Create the manager.
+        
+        Args:
+            downloads_dir: Where partial and finished downloads are kept.
+            max_downloads: Downloads running at the same time.
+            retries: Extra attempts (over all links) after a failed one.
+            timeout: Seconds to wait for a server before an attempt fails.
+        """
+        self.downloads_dir = Path(downloads_dir)
+        self.retries = retries
+        self.timeout = timeout
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._futures: Dict[str, concurrent.futures.Future] = {}
+        self._executor = self._create_executor(max_downloads)
+    
+    @staticmethod
+    def _create_executor(max_downloads: int) -> concurrent.futures.ThreadPoolExecutor:
+        return concurrent.futures.ThreadPoolExecutor(max_workers=max(1, max_downloads),
+                                                     thread_name_prefix="package-download")
+    
+    def set_max_downloads(self, max_downloads: int):
+        """Change the concurrency limit for downloads submitted from now on"""
+        with self._lock:
+            old_executor, self._executor = self._executor, self._create_executor(max_downloads)
+        # Downloads already queued on the old executor still run
+        old_executor.shutdown(wait=False)
+    
+    def submit(self, name: str, links: List[str], checksum: Optional[Tuple[str, str]] = None,
+               on_progress: Optional[Callable[[int, Optional[int]], None]] = None,
+               then: Optional[Callable[[Path], Any]] = None,
+               version: Optional[str] = None) -> concurrent.futures.Future:
+        """Download a file in the background.
+        
+        Args:
+            name: File name in the downloads directory.
+            links: Mirrors to download from.
+            checksum: (algorithm, hex digest) to verify, if known.
+            on_progress: Called with (bytes downloaded, total bytes or None).
+            then: Called with the downloaded path on the download thread
+                (e.g. to install it); the future resolves to its result.
+            version: Version of the file, if name does not include it.
+        
+        Returns:
+            A future; submitting a file that is already downloading returns
+            the running download's future.
+        """
+        with self._lock:
+            future = self._futures.get(name)
+            if future is not None and not future.done():
+                return future
+            
+            def run():
+                path = self.download(name, links, checksum, on_progress, version)
+                return then(path) if then is not None else path
+            
+            future = self._executor.submit(run)
+            self._futures[name] = future
+            return future
+    
+    def submit_task(self, task: Callable[[], Any]) -> concurrent.futures.Future:
+        """Run a task (e.g. an install that downloads by itself) under the same limit"""
+        with self._lock:
+            return self._executor.submit(task)
+    
+    def download(self, name: str, links: List[str], checksum: Optional[Tuple[str, str]] = None,
+                 on_progress: Optional[Callable[[int, Optional[int]], None]] = None,
+                 version: Optional[str] = None) -> Path:
+        """Download a file unless it is already there, blocking; returns its path"""
+        self.downloads_dir.mkdir(parents=True, exist_ok=True)
+        target = self.downloads_dir / name
+        part = self.downloads_dir / (name + ".part")
+        source_path = self.downloads_dir / (name + ".source.json")
+        source = {'version': version, 'links': sorted(links)}
+        if self._read_source(source_path) != source:
+            # Whatever is there belongs to another version of the file
+            self.discard(name)
+            with open(source_path, 'w', encoding='utf-8') as f:
+                json.dump(source, f)
+        elif target.exists():
+            return target
+        
+        error = "no download links"
+        for attempt in range(self.retries + 1):
+            if attempt:
+                # Back off before trying the mirrors again
+                if self._stopping.wait(min(self.RETRY_DELAY * 2 ** (attempt - 1), self.MAX_RETRY_DELAY)):
+                    break
+            for url in random.sample(links, len(links)):
+                if self._stopping.is_set():
+                    break
+                try:
+                    digest = self._fetch(url, part, checksum[0] if checksum else None, on_progress)
+                except DownloadError as e:
+                    error = str(e)
+                    continue
+                except (OSError, http.client.HTTPException) as e:
+                    # The partial file is kept, so the next attempt resumes it
+                    error = f"{url}: {e}"
+                    continue
+                if checksum is not None and digest != checksum[1]:
+                    part.unlink()
+                    error = f"{url}: checksum mismatch"
+                    continue
+                part.replace(target)
+                return target
+            if self._stopping.is_set():
+                break
+        raise DownloadError(f"Download failed for {name}: {error}")
+    
+    @staticmethod
+    def _read_source(source_path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with open(source_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def discard(self, name: str):
+        """Delete a downloaded (or partly downloaded) file so the next download starts over"""
+        for suffix in ("", ".part", ".source.json"):
+            try:
+                (self.downloads_dir / (name + suffix)).unlink()
+            except FileNotFoundError:
+                pass
+    
+    def _fetch(self, url: str, part: Path, algorithm: Optional[str],
+               on_progress: Optional[Callable[[int, Optional[int]], None]]) -> Optional[str]:
+        """Download (the rest of) url into part, returning the hex digest if asked for"""
+        offset = part.stat().st_size if part.exists() else 0
+        headers = {'User-Agent': USER_AGENT}
+        if offset:
+            headers['Range'] = f"bytes={offset}-"
+        try:
+            response = urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=self.timeout)
+        except urllib.error.HTTPError as e:
+            if e.code == 416 and offset:
+                # The partial file does not fit the file on the server any more
+                part.unlink()
+            raise
+        
+        with response:
+            total = None
+            if offset and response.status == 206:
+                # 'bytes <start>-<end>/<total>'
+                content_range = response.headers.get('Content-Range', '')
+                match = re.match(r'bytes (\d+)-\d+/(\d+|\*)', content_range)
+                if not match or int(match.group(1)) != offset:
+                    part.unlink()
+                    raise DownloadError(f"{url}: unexpected Content-Range {content_range!r}")
+                if match.group(2) != '*':
+                    total = int(match.group(2))
+            else:
+                offset = 0  # Not resumable: start over
+                length = response.headers.get('Content-Length')
+                total = int(length) if length and length.isdigit() else None
+            
+            hasher = hashlib.new(algorithm) if algorithm else None
+            if hasher is not None and offset:
+                with open(part, 'rb') as existing:
+                    for chunk in iter(lambda: existing.read(self.CHUNK_SIZE), b''):
+                        hasher.update(chunk)
+            
+            downloaded = offset
+            if on_progress is not None:
+                on_progress(downloaded, total)
+            with open(part, 'ab' if offset else 'wb') as part_file:
+                while True:
+                    if self._stopping.is_set():
+                        raise DownloadError(f"{url}: cancelled")
+                    chunk = response.read(self.CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    part_file.write(chunk)
+                    if hasher is not None:
+                        hasher.update(chunk)
+                    downloaded += len(chunk)
+                    if on_progress is not None:
+                        on_progress(downloaded, total)
+        
+        if total is not None and downloaded < total:
+            raise DownloadError(f"{url}: connection closed after {downloaded} of {total} bytes")
+        return hasher.hexdigest() if hasher is not None else None
+    
+    def shutdown(self):
+        """Stop running downloads (their partial files are kept) and drop queued ones"""
+        self._stopping.set()
+        with self._lock:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class PackageIndexCache:
+    """Keeps the local copy of the package index fresh.
+    
+    The ETag and Last-Modified headers of the last download are stored next
+    to the index, so refreshing an unchanged index costs one conditional
+    request answered with 304 Not Modified. Within ``ttl`` seconds of the
+    last check no request is made at all. Refreshes asked for while one is
+    running wait for it and share its result.
+    """
+    
+    def __init__(self, url: str, path: Path, ttl: float = 24 * 3600, timeout: float = 30):
+        """Create the cache.
+        
+        Args:
+            url: Remote package index.
+            path: Local index file, read by argostranslate.package.
+            ttl: Seconds after a check during which the index counts as fresh.
+            timeout: Seconds to wait for the server.
+        """
+        self.url = url
+        self.path = Path(path)
+        self.meta_path = self.path.with_suffix('.meta.json')
+        self.ttl = ttl
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._refresh: Optional[concurrent.futures.Future] = None
+    
+    def _read_meta(self) -> Dict[str, Any]:
+        try:
+            with open(self.meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            return meta if isinstance(meta, dict) else {}
+        except (OSError, ValueError):
+            return {}
+    
+    def is_fresh(self) -> bool:
+        """Return True if the index exists and was checked within the TTL"""
+        if not self.path.exists():
+            return False
+        checked = self._read_meta().get('checked', 0)
+        return 0 <= time.time() - checked < self.ttl
+    
+    def ensure_fresh(self) -> bool:
+        """Refresh the index if it is missing or older than the TTL; True if it changed"""
+        if self.is_fresh():
+            return False
+        return self.refresh()
+    
+    def refresh(self) -> bool:
+        """Revalidate the index with the server now; True if a new index was downloaded"""
+        with self._lock:
+            running = self._refresh
+            if running is None:
+                self._refresh = concurrent.futures.Future()
+        if running is not None:
+            # Another thread is already fetching the index
+            return running.result()
+        
+        try:
+            changed = self._fetch()
+        except BaseException as e:
+            self._finish(exception=e)
+            raise
+        self._finish(result=changed)
+        return changed
+    
+    def _finish(self, result: bool = False, exception: Optional[BaseException] = None):
+        with self._lock:
+            future, self._refresh = self._refresh, None
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
+    
+    def _fetch(self) -> bool:
+        meta = self._read_meta()
+        headers = {'User-Agent': USER_AGENT}
+        if self.path.exists():
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+        
+        changed = False
+        try:
+            response = urllib.request.urlopen(urllib.request.Request(self.url, headers=headers), timeout=self.timeout)
+        except urllib.error.HTTPError as e:
+            if e.code != 304:
+                raise
+        else:
+            with response:
+                data = response.read()
+                meta = {
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                }
+            # Never replace a working index with a truncated or broken one
+            json.loads(data)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_suffix('.tmp')
+            temp_path.write_bytes(data)
+            temp_path.replace(self.path)
+            changed = True
+        
+        meta['checked'] = time.time()
+        try:
+            with open(self.meta_path, 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+        except OSError as e:
+            print(f"Warning: Could not save package index metadata: {e}")
+        return changed
+
+
+class InstalledPackageRegistry:
+    """Remembers the installed packages and languages between runs.
+    
+    argostranslate finds installed packages by walking the package
+    directories, parsing every metadata.json and loading every tokenizer.
+    The registry stores what the last full scan found together with a
+    signature of the package directories: the name of every package
+    directory and the modification time and size of its metadata.json.
+    Computing the signature only needs a directory listing and one stat
+    per package, so as long as it matches, one small file replaces the
+    scan. Installing, updating or removing a package changes it. The
+    package directory of each language pair is recorded as well, so the
+    translation engine can load a pair without scanning every package.
+    """
+    
+    # Package attributes the GUI needs without the full package object
+    PACKAGE_FIELDS = ('code', 'type', 'package_version', 'from_code', 'from_name', 'to_code', 'to_name')
+    
+    def __init__(self, package_dirs: Iterable[Path], path: Path):
+        """Create the registry.
+        
+        Args:
+            package_dirs: Directories argostranslate looks for packages in.
+            path: Registry file.
+        """
+        self.package_dirs = [Path(directory) for directory in package_dirs]
+        self.path = Path(path)
+        self._lock = threading.Lock()
+    
+    def signature(self) -> str:
+        """Hash of the package directory listing and metadata file stats"""
+        manifest = []
+        for directory in self.package_dirs:
+            try:
+                entries = sorted(os.scandir(directory), key=lambda entry: entry.name)
+            except OSError:
+                manifest.append((str(directory), None))
+                continue
+            for entry in entries:
+                if not entry.is_dir():
+                    continue
+                try:
+                    stat = os.stat(os.path.join(entry.path, "metadata.json"))
+                    manifest.append((entry.path, stat.st_mtime_ns, stat.st_size))
+                except OSError:
+                    manifest.append((entry.path, None))
+        return hashlib.sha1(json.dumps(manifest).encode('utf-8')).hexdigest()
+    
+    def _read(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                registry = json.load(f)
+            return registry if isinstance(registry, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not read package registry: {e}")
+            return {}
+    
+    def _get(self, part: str, signature: str) -> Optional[List[Dict[str, Any]]]:
+        entry = self._read().get(part)
+        if not isinstance(entry, dict) or entry.get('signature') != signature:
+            return None
+        return entry.get('items')
+    
+    def _save(self, part: str, signature: str, items: List[Dict[str, Any]]):
+        with self._lock:
+            registry = self._read()
+            registry[part] = {'signature': signature, 'items': items}
+            temp_path = self.path.with_name(f"{self.path.name}.{threading.get_ident()}.tmp")
+            try:
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump(registry, f)
+                temp_path.replace(self.path)
+            except OSError as e:
+                print(f"Warning: Could not save package registry: {e}")
+    
+    def packages(self, signature: str) -> Optional[List[SimpleNamespace]]:
+        """Return the recorded installed packages, or None if they may have changed"""
+        items = self._get('packages', signature)
+        try:
+            return [SimpleNamespace(**{field: item.get(field) for field in self.PACKAGE_FIELDS},
+                                    package_path=Path(item['package_path'])) for item in items]
+        except (AttributeError, KeyError, TypeError):
+            return None  # Missing or damaged
+    
+    def save_packages(self, signature: str, packages: Iterable[Any]):
+        """Record the installed packages found by a full scan"""
+        self._save('packages', signature, [
+            dict({field: getattr(pkg, field, None) for field in self.PACKAGE_FIELDS},
+                 package_path=str(pkg.package_path))
+            for pkg in packages
+        ])
+    
+    def languages(self, signature: str) -> Optional[List[SimpleNamespace]]:
+        """Return the recorded installed languages (name and code), or None if they may have changed"""
+        items = self._get('languages', signature)
+        try:
+            return [SimpleNamespace(name=item['name'], code=item['code']) for item in items]
+        except (KeyError, TypeError):
+            return None  # Missing or damaged
+    
+    def save_languages(self, signature: str, languages: Iterable[Any]):
+        """Record the installed languages found by a full scan"""
+        self._save('languages', signature, [{'name': lang.name, 'code': lang.code} for lang in languages])
+    
+    def package_paths(self, signature: str) -> Optional[Dict[Tuple[str, str], Path]]:
+        """Return the recorded package directory of each pair, or None if they may have changed"""
+        items = self._get('package_paths', signature)
+        try:
+            return {(item['from_code'], item['to_code']): Path(item['package_path']) for item in items}
+        except (KeyError, TypeError):
+            return None  # Missing or damaged
+    
+    def save_package_paths(self, signature: str, package_paths: Dict[Tuple[str, str], Path]):
+        """Record the package directory behind each pair found by a full scan"""
+        self._save('package_paths', signature, [
+            {'from_code': from_code, 'to_code': to_code, 'package_path': str(path)}
+            for (from_code, to_code), path in package_paths.items()
+        ])
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Process Engine
+Spreads sentence batches for one language pair over a pool of worker processes
+"""
+
+import concurrent.futures
+import math
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from text_segmentation import make_batches
+
+# Seconds to wait for a pair's workers to start and load their model
+WARM_UP_TIMEOUT = 120
+
+# State of a worker process: the engine and the pair it serves
+_worker_engine = None
+_worker_pair: Optional[Tuple[str, str]] = None
+
+
+def _init_worker(from_code: str, to_code: str, intra_threads: int, engine_options: Dict[str, Any],
+                 package_paths: Dict[Tuple[str, str], Path]):
+    """Load the model for the pair this worker serves"""
+    global _worker_engine, _worker_pair
+    from translation_engine import TranslationEngine
+    
+    _worker_engine = TranslationEngine()
+    _worker_engine.configure(**engine_options)
+    _worker_engine.intra_threads = intra_threads
+    # With the pair's package directory known, the worker skips the package scan
+    _worker_engine.set_package_paths(package_paths)
+    _worker_engine.load_model(from_code, to_code)
+    _worker_pair = (from_code, to_code)
+
+
+def _translate_in_worker(sentences: List[str]) -> List[str]:
+    """Translate a chunk of sentences with the worker's resident model"""
+    from_code, to_code = _worker_pair
+    return _worker_engine.translate_segments(sentences, from_code, to_code)
+
+
+def _ping_worker() -> int:
+    """No-op task used to start worker processes ahead of time"""
+    return os.getpid()
+
+
+class ProcessPoolEngine:
+    """Translate sentences in worker processes, one process pool per language pair.
+    
+    Every worker of a pool loads the model of its pair once at start-up, so
+    the GIL-bound parts of translation (tokenization, decoding) run in
+    parallel across processes. Results are reassembled in input order.
+    """
+    
+    def __init__(self, processes: Optional[int] = None, threads_per_process: Optional[int] = None,
+                 max_pairs: int = 2, max_chunk_size: int = 32,
+                 engine_options: Optional[Dict[str, Any]] = None):
+        """Configure the pool (processes start lazily).
+        
+        Args:
+            processes: Worker processes per pair, defaults to the CPU count.
+            threads_per_process: CTranslate2 intra_threads of each worker. Defaults to
+                the intra_threads engine option, or when that is 0 (automatic)
+                to an equal share of the CPUs, so the workers do not oversubscribe them.
+            max_pairs: Pools kept alive at once; the least recently used is shut down.
+            max_chunk_size: Maximum sentences sent to a worker in one task.
+            engine_options: TranslationEngine.configure options for the workers.
+        """
+        self.processes = processes or os.cpu_count() or 1
+        self.max_pairs = max(1, max_pairs)
+        self.max_chunk_size = max_chunk_size
+        self.engine_options = dict(engine_options or {})
+        if threads_per_process is None:
+            threads_per_process = (self.engine_options.get('intra_threads')
+                                   or max(1, (os.cpu_count() or 1) // self.processes))
+        self.threads_per_process = threads_per_process
+        # Package directories known to the engine, passed on to new workers
+        self.package_paths: Dict[Tuple[str, str], Path] = {}
+        self._pools: "OrderedDict[Tuple[str, str], concurrent.futures.ProcessPoolExecutor]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Forking a process that runs Tk and several threads is unsafe
+        self._context = multiprocessing.get_context('spawn')
+    
+    def _get_pool(self, from_code: str, to_code: str) -> concurrent.futures.ProcessPoolExecutor:
+        """Return the pool serving a pair, starting it if needed"""
+        pair = (from_code, to_code)
+        retired = []
+        with self._lock:
+            pool = self._pools.get(pair)
+            if pool is not None:
+                self._pools.move_to_end(pair)
+                return pool
+            
+            pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=self._context,
+                initializer=_init_worker,
+                initargs=(from_code, to_code, self.threads_per_process, self.engine_options,
+                          {pair: self.package_paths[pair]} if pair in self.package_paths else {}),
+            )
+            self._pools[pair] = pool
+            while len(self._pools) > self.max_pairs:
+                retired.append(self._pools.popitem(last=False)[1])
+        
+        for old_pool in retired:
+            old_pool.shutdown(wait=False, cancel_futures=True)
+        return pool
+    
+    def warm_up(self, from_code: str, to_code: str, timeout: Optional[float] = WARM_UP_TIMEOUT):
+        """Start the workers of a pair so their models are loaded before first use.
+        
+        Raises TimeoutError if they are not ready within ``timeout`` seconds,
+        or BrokenProcessPool if one failed to start; the pool is discarded.
+        """
+        pool = self._get_pool(from_code, to_code)
+        futures = [pool.submit(_ping_worker) for _ in range(self.processes)]
+        try:
+            done, pending = concurrent.futures.wait(futures, timeout)
+            if pending:
+                raise TimeoutError(f"worker processes for {from_code}->{to_code} "
+                                   f"were not ready after {timeout} s")
+            for future in done:
+                future.result()
+        except Exception:
+            self._discard_pool((from_code, to_code), pool)
+            raise
+    
+    def translate_segments(self, sentences: List[str], from_code: str, to_code: str,
+                           on_segment: Optional[Callable[[int, str], None]] = None,
+                           cancelled: Optional[Callable[[], bool]] = None) -> List[str]:
+        """Translate sentences across the pair's worker processes"""
+        from translation_engine import TranslationCancelled
+        
+        if not sentences:
+            return []
+        
+        # Small, length-bucketed chunks keep every worker busy
+        chunk_size = min(self.max_chunk_size, math.ceil(len(sentences) / self.processes))
+        pool = self._get_pool(from_code, to_code)
+        futures = {}
+        for chunk in make_batches(sentences, chunk_size):
+            future = pool.submit(_translate_in_worker, [sentences[i] for i in chunk])
+            futures[future] = chunk
+        
+        results = [''] * len(sentences)
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                if cancelled is not None and cancelled():
+                    raise TranslationCancelled()
+                for index, translated in zip(futures[future], future.result()):
+                    results[index] = translated
+                    if on_segment is not None:
+                        on_segment(index, translated)
+        except concurrent.futures.process.BrokenProcessPool:
+            # A worker died (or could not load the model); start over next time
+            self._discard_pool((from_code, to_code), pool)
+            raise
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+        return results
+    
+    def _discard_pool(self, pair: Tuple[str, str], pool: concurrent.futures.ProcessPoolExecutor):
+        """Forget a broken pool"""
+        with self._lock:
+            if self._pools.get(pair) is pool:
+                del self._pools[pair]
+        pool.shutdown(wait=False, cancel_futures=True)
+    
+    def shutdown(self):
+        """Stop every worker process"""
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+        for pool in pools:
+            pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Text Segmentation
+Splits input text into sentence segments and groups them into translation batches
+"""
+
+import difflib
+import re
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+# A sentence ends at terminal punctuation (optionally followed by closing quotes
+# or brackets) and whitespace, at full-width terminators, or at a line break.
+SENTENCE_END = re.compile(r'[.!?…]+["\'”’»)\]]*\s+|[。！？]+["”」』）]*\s*|\n+')
+
+# Common English abbreviations that end with a period but not a sentence
+ABBREVIATIONS = {'mr', 'mrs', 'ms', 'dr', 'prof', 'sr', 'jr', 'st', 'vs', 'etc', 'fig'}
+
+# English abbreviations that only count as such before a number ("No. 5", not "No. I refuse.")
+NUMBER_ABBREVIATIONS = {'no'}
+
+# Dotted initialisms such as "U.S.", "e.g." or "Ph.D." (the last period excluded)
+INITIALISM = re.compile(r'(?:[^\W\d_]{1,2}\.)+[^\W\d_]{1,2}')
+
+
+class Segment(NamedTuple):
+    """A translatable piece of the input and its position in the original text"""
+    start: int
+    end: int
+    text: str
+
+
+def split_sentences(text: str, language: Optional[str] = None) -> List[Segment]:
+    """Split text into sentence segments.
+    
+    Whitespace between sentences is not part of any segment, so the original
+    layout can be restored with ``join_segments``. The English abbreviation
+    list is only used when ``language`` is English or not known.
+    """
+    english = language is None or language == 'en'
+    segments = []
+    position = 0
+    for match in SENTENCE_END.finditer(text):
+        if _is_abbreviation(text, match.start(), match.end(), english):
+            continue
+        segments.append(_make_segment(text, position, match.end()))
+        position = match.end()
+    if position < len(text):
+        segments.append(_make_segment(text, position, len(text)))
+    return [segment for segment in segments if segment.text]
+
+
+def _is_abbreviation(text: str, period_index: int, next_index: int, english: bool) -> bool:
+    """Return True if the period at period_index ends an abbreviation or initial.
+    
+    next_index is where the text continues after the period and whitespace.
+    """
+    if text[period_index] != '.':
+        return False
+    # Only look at a short window so long documents stay linear
+    before = text[max(0, period_index - 16):period_index].split()
+    word = before[-1].lstrip('("\'“‘«[').lower() if before else ''
+    if english and (word in ABBREVIATIONS
+                    or (word in NUMBER_ABBREVIATIONS and text[next_index:next_index + 1].isdigit())):
+        return True
+    return (len(word) == 1 and word.isalpha()) or INITIALISM.fullmatch(word) is not None
+
+
+def _make_segment(text: str, start: int, end: int) -> Segment:
+    """Build a segment with surrounding whitespace trimmed"""
+    piece = text[start:end]
+    stripped = piece.strip()
+    if not stripped:
+        return Segment(start, start, '')
+    start += len(piece) - len(piece.lstrip())
+    return Segment(start, start + len(stripped), stripped)
+
+
+def join_segments(text: str, segments: List[Segment], translations: List[str]) -> str:
+    """Rebuild a document, replacing each segment with its translation"""
+    pieces = []
+    position = 0
+    for segment, translation in zip(segments, translations):
+        pieces.append(text[position:segment.start])
+        pieces.append(translation)
+        position = segment.end
+    pieces.append(text[position:])
+    return ''.join(pieces)
+
+
+def make_batches(items: List, max_batch_size: int,
+                 length: Optional[Callable] = None) -> List[List[int]]:
+    """Group item indices into length-bucketed batches.
+    
+    Items of similar length end up in the same batch so the model wastes as
+    little work as possible on padding.
+    
+    Args:
+        items: Sequence of segments, strings or token lists.
+        max_batch_size: Maximum number of items per batch.
+        length: Function returning the length of an item, defaults to ``len``.
+    
+    Returns:
+        Lists of indices into items, shortest batches first.
+    """
+    length = length or len
+    order = sorted(range(len(items)), key=lambda i: length(items[i]))
+    size = max(1, max_batch_size)
+    return [order[i:i + size] for i in range(0, len(order), size)]
+
+
+def match_unchanged(previous: List[str], current: List[str]) -> Dict[int, int]:
+    """Map indices of current sentences to identical sentences of a previous run.
+    
+    Only sentences that line up in the diff of both lists are matched, so a
+    sentence moved elsewhere in the document is treated as changed.
+    
+    Returns:
+        {current_index: previous_index} for every unchanged sentence.
+    """
+    matcher = difflib.SequenceMatcher(None, previous, current, autojunk=False)
+    unchanged = {}
+    for block in matcher.get_matching_blocks():
+        for offset in range(block.size):
+            unchanged[block.b + offset] = block.a + offset
+    return unchanged
@@ -0,0 +1,624 @@
+#!/usr/bin/env python3
+"""
+Translation Engine
+Resolves and caches Argos Translate translation objects per language pair
+"""
+
+import concurrent.futures
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from lazy_imports import TRANSLATE_DEPENDENCIES, LazyModule, import_module
+from model_registry import ModelRegistry
+from text_segmentation import join_segments, make_batches, match_unchanged, split_sentences
+
+# Argos Translate is optional here as well; the GUI falls back to demo mode.
+# Only its lightweight settings module is imported up front: translate (and
+# with it CTranslate2, SentencePiece and Stanza) is imported on first use.
+try:
+    settings = import_module('argostranslate.settings')
+except Exception:
+    settings = None
+translate = LazyModule('argostranslate.translate', requires=TRANSLATE_DEPENDENCIES)
+package = LazyModule('argostranslate.package')
+
+
+def get_translation_package(translation):
+    """Return the package behind a translation, unwrapping cached translations"""
+    while translation is not None:
+        pkg = getattr(translation, 'pkg', None)
+        if pkg is not None:
+            return pkg
+        translation = getattr(translation, 'underlying', None)
+    return None
+
+
+def get_translation_version(translation) -> str:
+    """Return the package version(s) a translation depends on"""
+    pkg = get_translation_package(translation)
+    if pkg is not None:
+        return str(getattr(pkg, 'package_version', ''))
+    
+    # Pivot translations depend on both legs
+    t1 = getattr(translation, 't1', None)
+    t2 = getattr(translation, 't2', None)
+    if t1 is not None and t2 is not None:
+        return f"{get_translation_version(t1)}+{get_translation_version(t2)}"
+    return ''
+
+
+class TranslationCancelled(Exception):
+    """Raised when a translation is abandoned because a newer request superseded it"""
+
+
+class TargetResult(NamedTuple):
+    """Outcome of one target language of a multi-target translation"""
+    to_code: str
+    text: str
+    seconds: float
+    error: Optional[str] = None
+
+
+class TranslationEngine:
+    """Keeps resolved ITranslation objects (and their loaded models) resident.
+    
+    Translations are keyed by (from_code, to_code, package_version) and are
+    only dropped when the set of installed packages changes. Input is split
+    into sentences that are sent to CTranslate2 in length-bucketed batches.
+    """
+    
+    # Same defaults Argos Translate uses for packaged translations
+    max_batch_size = 32
+    beam_size = 4
+    
+    # CTranslate2 threading (0 lets CTranslate2 pick) and weight type
+    inter_threads = 1
+    intra_threads = 0
+    compute_type = 'default'
+    
+    # Options that only take effect when a model is loaded
+    LOAD_OPTIONS = ('inter_threads', 'intra_threads', 'compute_type')
+    
+    def __init__(self, memory=None):
+        """Create the engine.
+        
+        Args:
+            memory: Optional TranslationMemory consulted before the model.
+        """
+        self.memory = memory
+        # Optional ProcessPoolEngine that runs the model in worker processes
+        self.process_pool = None
+        # Loaded models, evicted to honour a memory budget and idle timeout
+        self.models = ModelRegistry()
+        self.languages: List = []
+        self._languages_by_code: Dict[str, object] = {}
+        self._package_versions: Dict[Tuple[str, str], str] = {}
+        self._signature: Optional[frozenset] = None
+        self._translations: Dict[Tuple[str, str, str], object] = {}
+        # Package directory of each pair, recorded by a scan in an earlier run
+        self._package_paths: Dict[Tuple[str, str], Path] = {}
+        # languages holds a scan made since the last invalidate()
+        self._languages_loaded = False
+        self._generation = 0
+        self._lock = threading.RLock()
+        # Serializes package scans; never taken while holding _lock
+        self._load_lock = threading.Lock()
+        self._pair_locks: Dict[Tuple[str, str], threading.Lock] = {}
+    
+    def configure(self, **options) -> bool:
+        """Change model options (inter_threads, intra_threads, compute_type,
+        beam_size, max_batch_size) without restarting.
+        
+        Returns:
+            True if a load option changed and resident models will be rebuilt.
+        """
+        reload = False
+        for name, value in options.items():
+            if name not in self.LOAD_OPTIONS + ('beam_size', 'max_batch_size'):
+                raise ValueError(f"Unknown engine option: {name}")
+            if value is not None and getattr(self, name) != value:
+                setattr(self, name, value)
+                reload = reload or name in self.LOAD_OPTIONS
+        if reload:
+            # Translators are recreated with the new options on next use
+            self.models.clear()
+        return reload
+    
+    def set_process_pool(self, process_pool):
+        """Route model work through a ProcessPoolEngine (None translates in-process)"""
+        previous, self.process_pool = self.process_pool, process_pool
+        if process_pool is not None:
+            process_pool.package_paths = self._package_paths
+        if previous is not None and previous is not process_pool:
+            previous.shutdown()
+    
+    def load_languages(self) -> List:
+        """Load installed languages, invalidating cached translations if packages changed.
+        
+        The package scan runs without holding the engine lock; a scan that
+        invalidate() overtook may have missed the change and is repeated.
+        """
+        while True:
+            generation = self._generation
+            languages = translate.get_installed_languages()
+            with self._lock:
+                if generation == self._generation:
+                    self.set_languages(languages)
+                    return languages
+    
+    def set_languages(self, languages: List):
+        """Adopt a freshly loaded language list"""
+        signature, versions = self._describe_packages(languages)
+        with self._lock:
+            if signature != self._signature:
+                if self._signature is None:
+                    # Nothing was scanned yet: keep the translations resolved
+                    # from a single package that the scan found unchanged
+                    self._translations = {key: translation for key, translation in self._translations.items()
+                                          if versions.get(key[:2]) == key[2]}
+                else:
+                    self._translations.clear()
+                    self.models.clear()
+                self._signature = signature
+            self.languages = list(languages)
+            self._languages_by_code = {lang.code: lang for lang in languages}
+            self._package_versions = versions
+            self._languages_loaded = True
+    
+    def invalidate(self):
+        """Forget languages, translations and models after packages were installed or removed.
+        
+        Everything is resolved and loaded again on next use.
+        """
+        with self._lock:
+            self._generation += 1
+            self._languages_loaded = False
+            self._translations.clear()
+            self._signature = None
+            self.languages = []
+            self._languages_by_code = {}
+            self._package_versions = {}
+            self._package_paths = {}
+        if self.process_pool is not None:
+            self.process_pool.package_paths = {}
+        self.models.clear()
+    
+    def set_package_paths(self, package_paths: Dict[Tuple[str, str], Path]):
+        """Use package directories recorded by an earlier scan (e.g. InstalledPackageRegistry).
+        
+        Until the languages are loaded, a pair with a known directory is
+        resolved from its own package instead of scanning every package.
+        """
+        with self._lock:
+            self._package_paths = dict(package_paths)
+            if self.process_pool is not None:
+                self.process_pool.package_paths = self._package_paths
+    
+    def package_paths(self) -> Dict[Tuple[str, str], Path]:
+        """Package directory of every pair an installed package translates directly"""
+        with self._lock:
+            languages = list(self.languages)
+        paths = {}
+        for lang in languages:
+            for translation in getattr(lang, 'translations_from', []):
+                pkg = get_translation_package(translation)
+                if pkg is not None:
+                    paths[(pkg.from_code, pkg.to_code)] = Path(pkg.package_path)
+        return paths
+    
+    @property
+    def package_signature(self) -> Optional[frozenset]:
+        """Signature of the installed packages the cached translations belong to"""
+        return self._signature
+    
+    def get_translation(self, from_code: str, to_code: str):
+        """Return the cached translation for a language pair, resolving it if needed"""
+        pair = (from_code, to_code)
+        while True:
+            with self._lock:
+                if self._languages_loaded:
+                    return self._resolve_translation(from_code, to_code)
+                translation = self._translations.get(pair + (self._package_versions.get(pair),))
+                if translation is not None:
+                    return translation  # Resolved from its package directory
+                package_path = self._package_paths.get(pair)
+            # Scan outside the engine lock so invalidate() (called on the UI
+            # thread) never waits for it; concurrent callers share one scan
+            with self._load_lock:
+                if self._languages_loaded or pair in self._package_versions:
+                    continue
+                if package_path is None or not self._load_package(pair, package_path):
+                    self.load_languages()
+    
+    def _load_package(self, pair: Tuple[str, str], package_path: Path) -> bool:
+        """Resolve a pair from its package directory alone; False if it cannot be loaded"""
+        generation = self._generation
+        try:
+            pkg = package.Package(package_path)
+            if (pkg.from_code, pkg.to_code) != pair:
+                raise ValueError(f"package is for {pkg.from_code}->{pkg.to_code}")
+        except ImportError:
+            raise
+        except Exception as e:
+            print(f"Warning: Could not load package {package_path}: {e}")
+            return False
+        
+        # The same objects get_installed_languages() builds for one package
+        from_lang = translate.Language(pkg.from_code, pkg.from_name)
+        to_lang = translate.Language(pkg.to_code, pkg.to_name)
+        translation = translate.CachedTranslation(translate.PackageTranslation(from_lang, to_lang, pkg))
+        from_lang.translations_from.append(translation)
+        to_lang.translations_to.append(translation)
+        
+        version = get_translation_version(translation)
+        with self._lock:
+            if generation == self._generation:
+                self._package_versions[pair] = version
+                self._translations[pair + (version,)] = translation
+        return True
+    
+    def _resolve_translation(self, from_code: str, to_code: str):
+        """Look up or resolve a translation in the loaded languages (caller holds the lock)"""
+        version = self._package_versions.get((from_code, to_code), 'pivot')
+        key = (from_code, to_code, version)
+        translation = self._translations.get(key)
+        if translation is not None:
+            return translation
+        
+        from_lang = self._languages_by_code.get(from_code)
+        to_lang = self._languages_by_code.get(to_code)
+        if from_lang is None or to_lang is None:
+            raise ValueError(f"Language not installed: {from_code if from_lang is None else to_code}")
+        
+        translation = from_lang.get_translation(to_lang)
+        if translation is None:
+            raise ValueError(f"No installed translation from {from_code} to {to_code}")
+        
+        self._translations[key] = translation
+        return translation
+    
+    def translate(self, text: str, from_code: str, to_code: str,
+                  on_segment: Optional[Callable[[int, str], None]] = None,
+                  cancelled: Optional[Callable[[], bool]] = None) -> str:
+        """Translate text sentence by sentence using the resident translation for the pair.
+        
+        Args:
+            text: The text to translate.
+            from_code: Source language code.
+            to_code: Target language code.
+            on_segment: Called as ``on_segment(index, translation)`` as soon as
+                each sentence of ``split_sentences(text, from_code)`` is translated.
+            cancelled: Polled between batches; raise TranslationCancelled
+                when it returns True.
+        """
+        segments = split_sentences(text, from_code)
+        translations = self.translate_segments([segment.text for segment in segments], from_code, to_code,
+                                               on_segment, cancelled)
+        return join_segments(text, segments, translations)
+    
+    def translate_segments(self, sentences: List[str], from_code: str, to_code: str,
+                           on_segment: Optional[Callable[[int, str], None]] = None,
+                           cancelled: Optional[Callable[[], bool]] = None,
+                           token_cache: Optional[Dict] = None) -> List[str]:
+        """Translate a list of sentences, batching them through the model.
+        
+        Sentences found in the translation memory are reported and returned
+        without running the model; only unique misses are translated.
+        ``token_cache`` shares tokenized sentences between calls that use the
+        same source model (see ``translate_multi``).
+        """
+        translation = self.get_translation(from_code, to_code)
+        if self.memory is None:
+            return self._translate_uncached(translation, sentences, from_code, to_code, on_segment, cancelled,
+                                            token_cache)
+        
+        version = get_translation_version(translation)
+        results: List[Optional[str]] = [None] * len(sentences)
+        for index, cached in self.memory.lookup(from_code, to_code, version, sentences).items():
+            results[index] = cached
+            if on_segment is not None:
+                on_segment(index, cached)
+        
+        # Translate each distinct missing sentence once
+        positions: Dict[str, List[int]] = {}
+        for index, result in enumerate(results):
+            if result is None:
+                positions.setdefault(sentences[index], []).append(index)
+        if positions:
+            unique = list(positions.keys())
+            
+            def on_unique(position: int, translated: str):
+                for index in positions[unique[position]]:
+                    on_segment(index, translated)
+            
+            translated = self._translate_uncached(translation, unique, from_code, to_code,
+                                                  on_unique if on_segment else None, cancelled, token_cache)
+            self.memory.store(from_code, to_code, version, unique, translated)
+            for sentence, translated_sentence in zip(unique, translated):
+                for index in positions[sentence]:
+                    results[index] = translated_sentence
+        return results
+    
+    def _translate_uncached(self, translation, sentences: List[str], from_code: str, to_code: str,
+                            on_segment: Optional[Callable[[int, str], None]] = None,
+                            cancelled: Optional[Callable[[], bool]] = None,
+                            token_cache: Optional[Dict] = None) -> List[str]:
+        """Run the model on sentences, in worker processes if a process pool is set"""
+        if self.process_pool is not None:
+            return self.process_pool.translate_segments(sentences, from_code, to_code, on_segment, cancelled)
+        # Models in use cannot be evicted until this translation is done
+        with self.models.use(self._package_translations(translation)):
+            self.load_model(from_code, to_code)
+            return self._run_translation(translation, sentences, on_segment, cancelled, token_cache)
+    
+    def translate_multi(self, text: str, from_code: str, to_codes: List[str],
+                        on_result: Optional[Callable[[TargetResult], None]] = None,
+                        cancelled: Optional[Callable[[], bool]] = None) -> List[TargetResult]:
+        """Translate one text into several target languages concurrently.
+        
+        The text is split into sentences once, and sentences are tokenized once
+        per source model, so targets reached through the same model (e.g. pivot
+        translations through English) share that work. A failing target does
+        not stop the others; its error is reported in its result.
+        
+        Args:
+            text: The text to translate.
+            from_code: Source language code.
+            to_codes: Target language codes.
+            on_result: Called with each TargetResult as soon as it is ready.
+            cancelled: Polled between batches of every target.
+        
+        Returns:
+            One TargetResult per target, in the order of to_codes.
+        """
+        segments = split_sentences(text, from_code)
+        sentences = [segment.text for segment in segments]
+        token_cache: Dict = {}
+        
+        def run_target(to_code: str) -> TargetResult:
+            started = time.perf_counter()
+            try:
+                translations = self.translate_segments(sentences, from_code, to_code, None, cancelled, token_cache)
+                result = TargetResult(to_code, join_segments(text, segments, translations),
+                                      time.perf_counter() - started)
+            except TranslationCancelled:
+                raise
+            except Exception as e:
+                result = TargetResult(to_code, '', time.perf_counter() - started, str(e))
+            if on_result is not None:
+                on_result(result)
+            return result
+        
+        # CTranslate2 releases the GIL, so one thread per target runs the models in parallel
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, len(to_codes)),
+                                                   thread_name_prefix="translation-target") as executor:
+            futures = [executor.submit(run_target, to_code) for to_code in to_codes]
+            return [future.result() for future in futures]
+    
+    def load_model(self, from_code: str, to_code: str):
+        """Make sure the CTranslate2 model(s) for a pair are loaded"""
+        with self._pair_lock(from_code, to_code):
+            for pkg_translation in self._package_translations(self.get_translation(from_code, to_code)):
+                if getattr(pkg_translation, 'translator', None) is None:
+                    import ctranslate2
+                    
+                    model_path = str(pkg_translation.pkg.package_path / "model")
+                    pkg_translation.translator = ctranslate2.Translator(
+                        model_path,
+                        device=settings.device,
+                        compute_type=self.compute_type,
+                        inter_threads=self.inter_threads,
+                        intra_threads=self.intra_threads,
+                    )
+                    self.models.add(pkg_translation)
+                
+                # Tokenizers load their model lazily on first use
+                tokenizer = getattr(pkg_translation.pkg, 'tokenizer', None)
+                if tokenizer is not None:
+                    tokenizer.encode("")
+    
+    def warm_up(self, pairs: Iterable[Tuple[str, str]]):
+        """Resolve translations and load models for the given pairs"""
+        for from_code, to_code in pairs:
+            try:
+                process_pool = self.process_pool
+                if process_pool is not None:
+                    try:
+                        process_pool.warm_up(from_code, to_code)
+                        continue
+                    except Exception as e:
+                        print(f"Warning: Translation worker processes failed ({e}); translating in-process")
+                        if self.process_pool is process_pool:
+                            self.set_process_pool(None)
+                self.load_model(from_code, to_code)
+            except Exception as e:
+                print(f"Warning: Could not warm up {from_code}->{to_code}: {e}")
+    
+    def start_warm_up(self, pairs: Iterable[Tuple[str, str]]) -> threading.Thread:
+        """Warm up pairs on a background thread"""
+        thread = threading.Thread(target=self.warm_up, args=(list(pairs),), name="translation-warm-up")
+        thread.daemon = True
+        thread.start()
+        return thread
+    
+    def _run_translation(self, translation, sentences: List[str],
+                         on_segment: Optional[Callable[[int, str], None]] = None,
+                         cancelled: Optional[Callable[[], bool]] = None,
+                         token_cache: Optional[Dict] = None) -> List[str]:
+        """Translate sentences with a translation, batching where the model allows it"""
+        if not sentences:
+            return []
+        
+        while getattr(translation, 'underlying', None) is not None:
+            translation = translation.underlying
+        
+        pkg = getattr(translation, 'pkg', None)
+        if (pkg is not None and getattr(pkg, 'tokenizer', None) is not None
+                and getattr(translation, 'translator', None) is not None):
+            return self._translate_batched(translation, sentences, on_segment, cancelled, token_cache)
+        
+        # Pivot translations run both legs over the whole list
+        t1 = getattr(translation, 't1', None)
+        t2 = getattr(translation, 't2', None)
+        if t1 is not None and t2 is not None:
+            intermediate = self._run_translation(t1, sentences, None, cancelled, token_cache)
+            return self._run_translation(t2, intermediate, on_segment, cancelled, token_cache)
+        
+        results = []
+        for index, sentence in enumerate(sentences):
+            self._check_cancelled(cancelled)
+            results.append(translation.translate(sentence))
+            if on_segment is not None:
+                on_segment(index, results[-1])
+        return results
+    
+    def _translate_batched(self, pkg_translation, sentences: List[str],
+                           on_segment: Optional[Callable[[int, str], None]] = None,
+                           cancelled: Optional[Callable[[], bool]] = None,
+                           token_cache: Optional[Dict] = None) -> List[str]:
+        """Tokenize sentences and send them to CTranslate2 in length-bucketed batches"""
+        pkg = pkg_translation.pkg
+        target_prefix = getattr(pkg, 'target_prefix', '')
+        tokenized = self._tokenize(pkg, sentences, token_cache)
+        
+        results = [''] * len(sentences)
+        for batch in make_batches(tokenized, self.max_batch_size):
+            self._check_cancelled(cancelled)
+            batch_tokens = [tokenized[i] for i in batch]
+            translated_batch = pkg_translation.translator.translate_batch(
+                batch_tokens,
+                target_prefix=[[target_prefix]] * len(batch_tokens) if target_prefix else None,
+                replace_unknowns=True,
+                max_batch_size=self.max_batch_size,
+                beam_size=self.beam_size,
+                num_hypotheses=1,
+                length_penalty=0.2,
+            )
+            for index, result in zip(batch, translated_batch):
+                results[index] = self._decode(pkg, result.hypotheses[0], target_prefix)
+                if on_segment is not None:
+                    on_segment(index, results[index])
+        return results
+    
+    @staticmethod
+    def _tokenize(pkg, sentences: List[str], token_cache: Optional[Dict] = None) -> List[List[str]]:
+        """Tokenize sentences, reusing tokens another target already computed"""
+        if token_cache is None:
+            return [pkg.tokenizer.encode(sentence) for sentence in sentences]
+        
+        tokenized = []
+        for sentence in sentences:
+            # Keyed by tokenizer object: packages sharing a source model share it
+            key = (id(pkg.tokenizer), sentence)
+            tokens = token_cache.get(key)
+            if tokens is None:
+                tokens = token_cache[key] = pkg.tokenizer.encode(sentence)
+            tokenized.append(tokens)
+        return tokenized
+    
+    @staticmethod
+    def _check_cancelled(cancelled: Optional[Callable[[], bool]]):
+        """Abort the translation if the caller no longer wants the result"""
+        if cancelled is not None and cancelled():
+            raise TranslationCancelled()
+    
+    @staticmethod
+    def _decode(pkg, tokens: List[str], target_prefix: str) -> str:
+        """Detokenize a hypothesis the way Argos Translate does"""
+        value = pkg.tokenizer.decode(tokens)
+        if target_prefix and value.startswith(target_prefix):
+            value = value[len(target_prefix):]
+        if value.startswith(' '):
+            # Remove the space the tokenizer adds at the beginning
+            value = value[1:]
+        return value
+    
+    def _pair_lock(self, from_code: str, to_code: str) -> threading.Lock:
+        """Lock serializing model loads for one pair"""
+        with self._lock:
+            return self._pair_locks.setdefault((from_code, to_code), threading.Lock())
+    
+    @staticmethod
+    def _package_translations(translation) -> List:
+        """Return the package-backed translations a (possibly pivot) translation runs"""
+        if translation is None:
+            return []
+        if getattr(translation, 'pkg', None) is not None:
+            return [translation]
+        underlying = getattr(translation, 'underlying', None)
+        if underlying is not None:
+            return TranslationEngine._package_translations(underlying)
+        return (TranslationEngine._package_translations(getattr(translation, 't1', None))
+                + TranslationEngine._package_translations(getattr(translation, 't2', None)))
+    
+    @staticmethod
+    def _describe_packages(languages: List) -> Tuple[frozenset, Dict[Tuple[str, str], str]]:
+        """Build a signature of the installed packages from a language list"""
+        versions = {}
+        for lang in languages:
+            for translation in getattr(lang, 'translations_from', []):
+                pkg = get_translation_package(translation)
+                if pkg is not None:
+                    versions[(pkg.from_code, pkg.to_code)] = get_translation_version(translation)
+        signature = frozenset((from_code, to_code, version) for (from_code, to_code), version in versions.items())
+        return signature, versions
+
+
+class IncrementalTranslator:
+    """Re-translates only the sentences that changed since the previous run.
+    
+    Used by live translation: on every edit the new sentence list is diffed
+    against the previous one and unchanged sentences reuse their translation.
+    """
+    
+    def __init__(self, engine: TranslationEngine):
+        self.engine = engine
+        self._lock = threading.Lock()
+        self._key = None
+        self._sentences: List[str] = []
+        self._translations: List[str] = []
+    
+    def reset(self):
+        """Forget the previous run"""
+        with self._lock:
+            self._key = None
+            self._sentences = []
+            self._translations = []
+    
+    def translate_segments(self, sentences: List[str], from_code: str, to_code: str,
+                           on_segment: Optional[Callable[[int, str], None]] = None,
+                           cancelled: Optional[Callable[[], bool]] = None) -> List[str]:
+        """Translate sentences, reusing translations of unchanged ones"""
+        # Previous results are only valid for the same pair and packages
+        key = (from_code, to_code, self.engine.package_signature)
+        with self._lock:
+            reused = {}
+            if key == self._key:
+                for index, previous_index in match_unchanged(self._sentences, sentences).items():
+                    reused[index] = self._translations[previous_index]
+        
+        results: List[str] = [''] * len(sentences)
+        for index, translated in reused.items():
+            results[index] = translated
+            if on_segment is not None:
+                on_segment(index, translated)
+        
+        changed = [index for index in range(len(sentences)) if index not in reused]
+        if changed:
+            def on_changed(position: int, translated: str):
+                on_segment(changed[position], translated)
+            
+            translated = self.engine.translate_segments(
+                [sentences[index] for index in changed], from_code, to_code,
+                on_changed if on_segment else None, cancelled
+            )
+            for index, translated_sentence in zip(changed, translated):
+                results[index] = translated_sentence
+        
+        with self._lock:
+            self._key = (from_code, to_code, self.engine.package_signature)
+            self._sentences = list(sentences)
+            self._translations = results
+        return results
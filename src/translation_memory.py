@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Translation Memory
+Two-tier cache of translated segments: an in-process LRU backed by SQLite
+"""
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+MB = 1024 * 1024
+
+
+def normalize_segment(segment: str) -> str:
+    """Normalize a segment for lookup (collapse whitespace)"""
+    return ' '.join(segment.split())
+
+
+class TranslationMemory:
+    """Cache of segment translations keyed by (from_code, to_code, package_version, segment).
+    
+    Lookups go to a bounded in-memory LRU first and then to an optional
+    SQLite store. Both tiers evict least recently used entries once they
+    exceed their size budget.
+    """
+    
+    def __init__(self, db_path: Optional[Path] = None, memory_limit_mb: float = 32,
+                 disk_limit_mb: float = 256):
+        """Open the translation memory.
+        
+        Args:
+            db_path: SQLite file for the persistent tier, None for memory only.
+            memory_limit_mb: Size budget of the in-memory LRU.
+            disk_limit_mb: Size budget of the SQLite store.
+        """
+        self.memory_limit = int(memory_limit_mb * MB)
+        self.disk_limit = int(disk_limit_mb * MB)
+        self.hits = 0
+        self.misses = 0
+        
+        self._lru: "OrderedDict[Tuple[str, str, str, str], str]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self._db = None
+        if db_path is not None:
+            self._open_db(Path(db_path))
+    
+    def _open_db(self, db_path: Path):
+        """Open (and create if needed) the SQLite store"""
+        try:
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(db_path), check_same_thread=False)
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS memory (
+                    from_code TEXT NOT NULL,
+                    to_code TEXT NOT NULL,
+                    package_version TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    translation TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (from_code, to_code, package_version, source)
+                )
+            """)
+            self._db.execute("CREATE INDEX IF NOT EXISTS memory_last_used ON memory (last_used)")
+            self._db.commit()
+            self._disk_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM memory").fetchone()[0]
+        except sqlite3.Error as e:
+            print(f"Warning: Translation memory database unavailable: {e}")
+            self._db = None
+    
+    @staticmethod
+    def _entry_size(source: str, translation: str) -> int:
+        """Approximate storage size of an entry in bytes"""
+        return len(source.encode('utf-8')) + len(translation.encode('utf-8')) + 64
+    
+    def configure(self, memory_limit_mb: Optional[float] = None, disk_limit_mb: Optional[float] = None):
+        """Change the size budgets, evicting entries right away if needed"""
+        with self._lock:
+            if memory_limit_mb is not None:
+                self.memory_limit = int(memory_limit_mb * MB)
+            if disk_limit_mb is not None:
+                self.disk_limit = int(disk_limit_mb * MB)
+            self._evict_memory()
+            self._evict_disk()
+    
+    def lookup(self, from_code: str, to_code: str, package_version: str,
+               segments: List[str]) -> Dict[int, str]:
+        """Look up segments, returning {index: translation} for every hit"""
+        found = {}
+        missing = []
+        with self._lock:
+            for index, segment in enumerate(segments):
+                key = (from_code, to_code, package_version, normalize_segment(segment))
+                translation = self._lru.get(key)
+                if translation is not None:
+                    self._lru.move_to_end(key)
+                    found[index] = translation
+                else:
+                    missing.append((index, key))
+            
+            if missing and self._db is not None:
+                found.update(self._lookup_disk(missing))
+                self._evict_memory()
+            
+            self.hits += len(found)
+            self.misses += len(segments) - len(found)
+        return found
+    
+    def _lookup_disk(self, missing: List[Tuple[int, Tuple[str, str, str, str]]]) -> Dict[int, str]:
+        """Look up keys in the SQLite store and promote hits to the LRU"""
+        found = {}
+        used = []
+        now = time.time()
+        try:
+            for index, key in missing:
+                row = self._db.execute(
+                    "SELECT translation FROM memory WHERE from_code = ? AND to_code = ? "
+                    "AND package_version = ? AND source = ?", key
+                ).fetchone()
+                if row is not None:
+                    found[index] = row[0]
+                    used.append((now,) + key)
+                    self._remember(key, row[0])
+            if used:
+                self._db.executemany(
+                    "UPDATE memory SET last_used = ? WHERE from_code = ? AND to_code = ? "
+                    "AND package_version = ? AND source = ?", used
+                )
+                self._db.commit()
+        except sqlite3.Error as e:
+            print(f"Warning: Translation memory lookup failed: {e}")
+        return found
+    
+    def store(self, from_code: str, to_code: str, package_version: str,
+              segments: List[str], translations: List[str]):
+        """Remember translations for segments"""
+        rows = []
+        now = time.time()
+        with self._lock:
+            for segment, translation in zip(segments, translations):
+                key = (from_code, to_code, package_version, normalize_segment(segment))
+                self._remember(key, translation)
+                rows.append(key + (translation, self._entry_size(key[3], translation), now))
+            self._evict_memory()
+            
+            if rows and self._db is not None:
+                try:
+                    # Account for rows that replace an existing entry
+                    for row in rows:
+                        previous = self._db.execute(
+                            "SELECT size FROM memory WHERE from_code = ? AND to_code = ? "
+                            "AND package_version = ? AND source = ?", row[:4]
+                        ).fetchone()
+                        self._disk_bytes += row[5] - (previous[0] if previous else 0)
+                    self._db.executemany("INSERT OR REPLACE INTO memory VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+                    self._db.commit()
+                    self._evict_disk()
+                except sqlite3.Error as e:
+                    print(f"Warning: Translation memory store failed: {e}")
+    
+    def _remember(self, key: Tuple[str, str, str, str], translation: str):
+        """Insert an entry into the LRU (caller holds the lock)"""
+        previous = self._lru.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= self._entry_size(key[3], previous)
+        self._lru[key] = translation
+        self._memory_bytes += self._entry_size(key[3], translation)
+    
+    def _evict_memory(self):
+        """Drop least recently used LRU entries over budget (caller holds the lock)"""
+        while self._lru and self._memory_bytes > self.memory_limit:
+            key, translation = self._lru.popitem(last=False)
+            self._memory_bytes -= self._entry_size(key[3], translation)
+    
+    def _evict_disk(self):
+        """Drop least recently used rows until the store is back under budget"""
+        if self._db is None or self._disk_bytes <= self.disk_limit:
+            return
+        try:
+            # Evict down to 90% of the budget so we do not evict on every store
+            target = int(self.disk_limit * 0.9)
+            while self._disk_bytes > target:
+                rows = self._db.execute(
+                    "SELECT rowid, size FROM memory ORDER BY last_used LIMIT 256"
+                ).fetchall()
+                if not rows:
+                    self._disk_bytes = 0
+                    break
+                evicted = []
+                for rowid, size in rows:
+                    evicted.append((rowid,))
+                    self._disk_bytes -= size
+                    if self._disk_bytes <= target:
+                        break
+                self._db.executemany("DELETE FROM memory WHERE rowid = ?", evicted)
+            self._db.commit()
+        except sqlite3.Error as e:
+            print(f"Warning: Translation memory eviction failed: {e}")
+    
+    def clear(self):
+        """Remove every entry from both tiers"""
+        with self._lock:
+            self._lru.clear()
+            self._memory_bytes = 0
+            if self._db is not None:
+                try:
+                    self._db.execute("DELETE FROM memory")
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    print(f"Warning: Could not clear translation memory: {e}")
+            self._disk_bytes = 0
+    
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and tier sizes"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'memory_entries': len(self._lru),
+                'memory_bytes': self._memory_bytes,
+                'disk_bytes': self._disk_bytes,
+            }
+    
+    def close(self):
+        """Close the SQLite store"""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Translation Server
+Local HTTP API (LibreTranslate-style /translate and /languages) over one shared engine
+"""
+
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+from urllib.parse import parse_qs, urlparse
+
+from batch_scheduler import BatchScheduler
+from text_segmentation import join_segments, split_sentences
+from translation_engine import TranslationEngine
+
+# Largest request body accepted, in bytes
+MAX_BODY_SIZE = 1024 * 1024
+
+
+class TranslationRequestHandler(BaseHTTPRequestHandler):
+    """HTTP handler for the translation API"""
+    
+    server_version = "ArgosTranslateGUI"
+    
+    def do_GET(self):
+        """Serve GET /languages and GET /stats"""
+        path = urlparse(self.path).path
+        if path == '/languages':
+            self.send_json(200, self.server.list_languages())
+        elif path == '/stats':
+            self.send_json(200, self.server.stats())
+        else:
+            self.send_json(404, {'error': "Not found"})
+    
+    def do_POST(self):
+        """Serve POST /translate"""
+        if urlparse(self.path).path != '/translate':
+            self.send_json(404, {'error': "Not found"})
+            return
+        
+        try:
+            params = self.read_params()
+            result = self.server.translate(params.get('q'), params.get('source'), params.get('target'))
+            self.send_json(200, {'translatedText': result})
+        except ValueError as e:
+            self.send_json(400, {'error': str(e)})
+        except Exception as e:
+            self.send_json(500, {'error': str(e)})
+    
+    def read_params(self) -> Dict[str, Any]:
+        """Read request parameters from a JSON or form-encoded body"""
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_BODY_SIZE:
+            raise ValueError("Request body too large")
+        body = self.rfile.read(length).decode('utf-8') if length else ''
+        
+        if self.headers.get('Content-Type', '').startswith('application/json'):
+            params = json.loads(body or '{}')
+            if not isinstance(params, dict):
+                raise ValueError("Request body must be a JSON object")
+            return params
+        # Form-encoded (or query string) parameters
+        query = body or urlparse(self.path).query
+        return {key: values[0] if len(values) == 1 else values for key, values in parse_qs(query).items()}
+    
+    def send_json(self, status: int, data: Any):
+        """Send a JSON response"""
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        """Keep request logging off stderr unless the server is verbose"""
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class TranslationServer(ThreadingHTTPServer):
+    """HTTP server sharing one warm TranslationEngine between all clients"""
+    
+    daemon_threads = True
+    
+    def __init__(self, engine: TranslationEngine, host: str = '127.0.0.1', port: int = 5000,
+                 verbose: bool = False, max_delay_ms: float = 20):
+        super().__init__((host, port), TranslationRequestHandler)
+        self.engine = engine
+        # Concurrent requests for a pair are merged into micro-batches
+        self.scheduler = BatchScheduler(engine, engine.max_batch_size, max_delay_ms)
+        self.verbose = verbose
+    
+    def list_languages(self) -> List[Dict[str, Any]]:
+        """Return installed languages and the targets each can be translated into"""
+        return [
+            {
+                'code': lang.code,
+                'name': lang.name,
+                # Includes pivot translations through an intermediate language
+                'targets': sorted({translation.to_lang.code
+                                   for translation in getattr(lang, 'translations_from', [])}),
+            }
+            for lang in self.engine.languages
+        ]
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return batching counters and the resident models"""
+        models = self.engine.models
+        return {
+            'scheduler': self.scheduler.stats(),
+            'models': {'resident': models.resident(), 'evictions': models.evictions},
+        }
+    
+    def translate(self, q: Any, source: Any, target: Any) -> Any:
+        """Translate one text or a list of texts"""
+        if not isinstance(source, str) or not isinstance(target, str) or not source or not target:
+            raise ValueError("Parameters 'source' and 'target' are required")
+        if source == 'auto':
+            raise ValueError("Language detection is not supported; pass a source language")
+        texts = q if isinstance(q, list) else [q]
+        if not texts or not all(isinstance(text, str) for text in texts):
+            raise ValueError("Parameter 'q' must be a string or a list of strings")
+        if source == target:
+            return q
+        
+        # Same path as the GUI: split, translate (coalesced with other clients), rejoin
+        segmented = [split_sentences(text, source) for text in texts]
+        sentences = [segment.text for segments in segmented for segment in segments]
+        translations = self.scheduler.translate_segments(sentences, source, target)
+        
+        results = []
+        position = 0
+        for text, segments in zip(texts, segmented):
+            results.append(join_segments(text, segments, translations[position:position + len(segments)]))
+            position += len(segments)
+        return results if isinstance(q, list) else results[0]
+
+
+def serve(engine: TranslationEngine, host: str = '127.0.0.1', port: int = 5000, verbose: bool = False,
+          max_delay_ms: float = 20):
+    """Run the translation server until interrupted"""
+    server = TranslationServer(engine, host, port, verbose, max_delay_ms)
+    print(f"Serving translations on http://{host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.scheduler.shutdown()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Translation Worker
+A long-lived background worker that runs translation jobs for the GUI
+"""
+
+import itertools
+import queue
+import threading
+from typing import Any, Callable, Optional, Tuple
+
+
+class TranslationWorker:
+    """Run translation jobs on one persistent thread with "latest request wins" semantics.
+    
+    Every submitted job is tagged with an increasing request ID. Submitting a
+    new job drops any job that is still waiting in the queue, and handlers or
+    callers can use ``is_current`` to discard results that were superseded
+    while the model was busy.
+    """
+    
+    def __init__(self, handler: Callable[..., Any], max_pending: int = 1,
+                 name: str = "translation-worker"):
+        """Start the worker thread.
+        
+        Args:
+            handler: Called as ``handler(request_id, *args)`` for each job.
+            max_pending: Maximum number of jobs waiting behind the running one.
+            name: Name of the worker thread.
+        """
+        self.handler = handler
+        self.jobs: "queue.Queue[Optional[Tuple[int, tuple]]]" = queue.Queue(maxsize=max_pending)
+        self._request_ids = itertools.count(1)
+        self._latest_request_id = 0
+        self._submit_lock = threading.Lock()
+        
+        self._thread = threading.Thread(target=self._run, name=name)
+        self._thread.daemon = True
+        self._thread.start()
+    
+    @property
+    def latest_request_id(self) -> int:
+        """ID of the most recently submitted request"""
+        return self._latest_request_id
+    
+    def is_current(self, request_id: int) -> bool:
+        """Return True if no newer request has been submitted since request_id"""
+        return request_id == self._latest_request_id
+    
+    def submit(self, *args) -> int:
+        """Queue a job, superseding every job that has not started yet.
+        
+        Returns:
+            The request ID assigned to the job.
+        """
+        with self._submit_lock:
+            request_id = next(self._request_ids)
+            self._latest_request_id = request_id
+            self._drop_pending()
+            self.jobs.put_nowait((request_id, args))
+        return request_id
+    
+    def cancel(self):
+        """Supersede the current request without submitting a new one"""
+        with self._submit_lock:
+            self._latest_request_id = next(self._request_ids)
+            self._drop_pending()
+    
+    def shutdown(self, timeout: Optional[float] = None):
+        """Stop the worker once the running job (if any) has finished"""
+        self.cancel()
+        self.jobs.put(None)
+        self._thread.join(timeout)
+    
+    def _drop_pending(self):
+        """Remove queued jobs that have not been picked up yet"""
+        try:
+            while True:
+                self.jobs.get_nowait()
+        except queue.Empty:
+            pass
+    
+    def _run(self):
+        """Worker loop"""
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+            
+            request_id, args = job
+            if not self.is_current(request_id):
+                continue
+            
+            try:
+                self.handler(request_id, *args)
+            except Exception as e:
+                # Handlers report their own errors; never let one kill the worker
+                print(f"Warning: Translation job {request_id} failed: {e}")
@@ -0,0 +1,11 @@
+"""
+Test configuration
+Makes the flat modules in src importable, like the launchers do
+"""
+
+import sys
+from pathlib import Path
+
+src_path = Path(__file__).parent.parent / "src"
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
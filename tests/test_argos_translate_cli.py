@@ -0,0 +1,117 @@
+"""
+Tests for headless JSONL batch translation
+"""
+
+import io
+import json
+
+import pytest
+
+from argos_translate_cli import main, read_requests, run
+from batch_scheduler import BatchScheduler
+
+
+class FakeEngine:
+    """Tags sentences with the target language; only en->de and en->fr are installed"""
+    
+    def __init__(self):
+        self.calls = []
+    
+    def translate_segments(self, sentences, from_code, to_code):
+        self.calls.append((list(sentences), from_code, to_code))
+        if (from_code, to_code) not in (('en', 'de'), ('en', 'fr')):
+            raise ValueError(f"No installed translation from {from_code} to {to_code}")
+        return [f"[{to_code}] {sentence}" for sentence in sentences]
+
+
+@pytest.fixture
+def engine():
+    return FakeEngine()
+
+
+@pytest.fixture
+def scheduler(engine):
+    batch_scheduler = BatchScheduler(engine, max_batch_size=32, max_delay_ms=1)
+    yield batch_scheduler
+    batch_scheduler.shutdown()
+
+
+def run_lines(scheduler, lines, **options):
+    output = io.StringIO()
+    failed = run(io.StringIO("\n".join(json.dumps(line) if isinstance(line, dict) else line
+                                       for line in lines) + "\n"),
+                 output, scheduler, **options)
+    return failed, [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+def test_read_requests_applies_defaults_and_aliases():
+    lines = ['{"q": "Hi."}', '', '{"id": "b", "text": "Yo.", "source": "es"}']
+    assert list(read_requests(lines, 'en', 'de')) == [
+        {'id': 1, 'q': "Hi.", 'source': 'en', 'target': 'de'},
+        {'id': 'b', 'q': "Yo.", 'source': 'es', 'target': 'de'},
+    ]
+
+
+@pytest.mark.parametrize("line, message", [
+    ('not json', "Invalid request"),
+    ('[1, 2]', "must be a JSON object"),
+    ('{"source": "en", "target": "de"}', "missing text"),
+    ('{"q": "Hi."}', "missing source or target"),
+])
+def test_read_requests_reports_malformed_lines(line, message):
+    [request] = read_requests([line])
+    assert request['id'] == 1
+    assert message in request['error']
+
+
+def test_results_keep_input_order_and_layout(scheduler):
+    failed, results = run_lines(scheduler, [
+        {'id': 'a', 'q': "One. Two.", 'source': 'en', 'target': 'de'},
+        {'id': 'b', 'q': "Three.", 'source': 'en', 'target': 'fr'},
+        {'id': 'c', 'q': "Four.\n\nFive.", 'source': 'en', 'target': 'de'},
+    ])
+    
+    assert failed == 0
+    assert results == [
+        {'id': 'a', 'translatedText': "[de] One. [de] Two.", 'source': 'en', 'target': 'de'},
+        {'id': 'b', 'translatedText': "[fr] Three.", 'source': 'en', 'target': 'fr'},
+        {'id': 'c', 'translatedText': "[de] Four.\n\n[de] Five.", 'source': 'en', 'target': 'de'},
+    ]
+
+
+def test_requests_of_a_pair_share_one_engine_call(scheduler, engine):
+    run_lines(scheduler, [{'q': f"Sentence {index}.", 'source': 'en', 'target': 'de'} for index in range(5)])
+    assert len(engine.calls) == 1
+    assert len(engine.calls[0][0]) == 5
+
+
+def test_failed_requests_do_not_stop_the_batch(scheduler):
+    failed, results = run_lines(scheduler, [
+        'broken',
+        {'id': 'x', 'q': "Hi.", 'source': 'en', 'target': 'ja'},
+        {'id': 'y', 'q': "Hi.", 'source': 'en', 'target': 'de'},
+    ])
+    
+    assert failed == 2
+    assert "Invalid request" in results[0]['error']
+    assert results[1] == {'id': 'x', 'error': "No installed translation from en to ja"}
+    assert results[2]['translatedText'] == "[de] Hi."
+
+
+def test_same_language_is_passed_through(scheduler, engine):
+    failed, results = run_lines(scheduler, [{'q': "Hallo.", 'source': 'de', 'target': 'de'}])
+    assert results[0]['translatedText'] == "Hallo."
+    assert engine.calls == []
+
+
+def test_small_chunks_stream_results(scheduler, engine):
+    failed, results = run_lines(scheduler, [{'id': index, 'q': "Hi.", 'source': 'en', 'target': 'de'}
+                                            for index in range(5)], chunk_size=2)
+    assert [result['id'] for result in results] == [0, 1, 2, 3, 4]
+    assert len(engine.calls) == 3
+
+
+def test_main_requires_argos_translate(monkeypatch, capsys):
+    monkeypatch.setattr('argos_translate_cli.settings', None)
+    assert main([]) == 2
+    assert "not installed" in capsys.readouterr().err
@@ -0,0 +1,137 @@
+"""
+Tests for micro-batching concurrent requests
+"""
+
+import threading
+import time
+
+import pytest
+
+from batch_scheduler import BatchScheduler
+
+
+class FakeEngine:
+    """Upper-cases sentences; can hold a batch until released"""
+    
+    def __init__(self, block_first: bool = False):
+        self.calls = []
+        self.release = threading.Event()
+        self.started = threading.Event()
+        if not block_first:
+            self.release.set()
+    
+    def translate_segments(self, sentences, from_code, to_code):
+        self.calls.append((list(sentences), from_code, to_code))
+        self.started.set()
+        self.release.wait(5)
+        if any(sentence == 'fail' for sentence in sentences):
+            raise RuntimeError("model failed")
+        return [sentence.upper() for sentence in sentences]
+
+
+@pytest.fixture
+def make_scheduler():
+    schedulers = []
+    
+    def make(engine, **options):
+        scheduler = BatchScheduler(engine, **options)
+        schedulers.append(scheduler)
+        return scheduler
+    
+    yield make
+    for scheduler in schedulers:
+        scheduler.shutdown()
+
+
+def test_idle_pair_translates_right_away(make_scheduler):
+    engine = FakeEngine()
+    scheduler = make_scheduler(engine, max_delay_ms=5000)
+    
+    started = time.monotonic()
+    assert scheduler.translate_segments(["a", "b"], 'en', 'de', timeout=5) == ["A", "B"]
+    assert time.monotonic() - started < 1
+    assert scheduler.stats()['batches'] == 1
+
+
+def test_requests_wait_for_running_batch_and_share_the_next(make_scheduler):
+    engine = FakeEngine(block_first=True)
+    scheduler = make_scheduler(engine, max_batch_size=100, max_delay_ms=5000)
+    
+    first = scheduler.submit(["one"], 'en', 'de')
+    assert engine.started.wait(5)
+    second = scheduler.submit(["two"], 'en', 'de')
+    third = scheduler.submit(["three", "four"], 'en', 'de')
+    engine.release.set()
+    
+    assert first.result(5) == ["ONE"]
+    assert second.result(5) == ["TWO"]
+    assert third.result(5) == ["THREE", "FOUR"]
+    assert [call[0] for call in engine.calls] == [["one"], ["two", "three", "four"]]
+    stats = scheduler.stats()
+    assert stats['requests'] == 3
+    assert stats['batches'] == 2
+
+
+def test_full_batch_flushes_before_deadline(make_scheduler):
+    engine = FakeEngine(block_first=True)
+    scheduler = make_scheduler(engine, max_batch_size=2, max_delay_ms=5000, workers=2)
+    
+    scheduler.submit(["busy"], 'en', 'de')
+    assert engine.started.wait(5)
+    full = scheduler.submit(["a", "b"], 'en', 'de')
+    
+    # Runs while the first batch is still held
+    deadline = time.monotonic() + 2
+    while len(engine.calls) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert engine.calls[1][0] == ["a", "b"]
+    engine.release.set()
+    assert full.result(5) == ["A", "B"]
+
+
+def test_deadline_flushes_partial_batch(make_scheduler):
+    engine = FakeEngine(block_first=True)
+    scheduler = make_scheduler(engine, max_batch_size=100, max_delay_ms=50, workers=2)
+    
+    scheduler.submit(["busy"], 'en', 'de')
+    assert engine.started.wait(5)
+    waiting = scheduler.submit(["late"], 'en', 'de')
+    
+    deadline = time.monotonic() + 2
+    while len(engine.calls) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert engine.calls[1][0] == ["late"]
+    engine.release.set()
+    assert waiting.result(5) == ["LATE"]
+
+
+def test_pairs_are_batched_separately(make_scheduler):
+    engine = FakeEngine()
+    scheduler = make_scheduler(engine)
+    
+    assert scheduler.translate_segments(["x"], 'en', 'de', timeout=5) == ["X"]
+    assert scheduler.translate_segments(["y"], 'en', 'fr', timeout=5) == ["Y"]
+    assert {(call[1], call[2]) for call in engine.calls} == {('en', 'de'), ('en', 'fr')}
+
+
+def test_errors_reach_every_caller_of_the_batch(make_scheduler):
+    engine = FakeEngine(block_first=True)
+    scheduler = make_scheduler(engine, max_delay_ms=5000)
+    
+    scheduler.submit(["busy"], 'en', 'de')
+    assert engine.started.wait(5)
+    failing = scheduler.submit(["fail"], 'en', 'de')
+    sharing = scheduler.submit(["ok"], 'en', 'de')
+    engine.release.set()
+    
+    with pytest.raises(RuntimeError):
+        failing.result(5)
+    with pytest.raises(RuntimeError):
+        sharing.result(5)
+
+
+def test_empty_request_needs_no_batch(make_scheduler):
+    engine = FakeEngine()
+    scheduler = make_scheduler(engine)
+    assert scheduler.submit([], 'en', 'de').result(1) == []
+    assert engine.calls == []
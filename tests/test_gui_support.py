@@ -0,0 +1,43 @@
+"""
+Tests for the Tk-independent helpers in gui_support
+"""
+
+import tkinter as tk
+
+import pytest
+
+from gui_support import payload_size, split_pages, tcl_uses_utf16, tk_length
+
+
+@pytest.fixture(scope="module")
+def tcl():
+    return tk.Tcl()
+
+
+@pytest.mark.parametrize("text", ["", "plain", "a😀b", "🎉🎉 mixed 漢字 text 𠀋"])
+def test_tk_length_matches_tcl(tcl, text):
+    utf16 = tcl_uses_utf16(tcl)
+    assert tk_length(text, utf16) == int(tcl.tk.call('string', 'length', text))
+
+
+def test_tk_length_without_utf16_is_python_length():
+    assert tk_length("a😀b", False) == 3
+    assert tk_length("a😀b", True) == 4
+
+
+def test_split_pages_breaks_at_lines():
+    text = "line\n" * 1000
+    pages = split_pages(text, 700)
+    assert "".join(text[start:end] for start, end in pages) == text
+    assert all(end - start <= 700 for start, end in pages)
+    assert all(text[end - 1] == "\n" for _, end in pages)
+
+
+def test_split_pages_splits_long_lines():
+    assert split_pages("x" * 25, 10) == [(0, 10), (10, 20), (20, 25)]
+
+
+def test_payload_size_counts_strings():
+    assert payload_size("abc") == 3
+    assert payload_size((1, "abcd", ["ef"])) == 4
+    assert payload_size(None) == 0
@@ -0,0 +1,49 @@
+"""
+Tests for deferred imports
+"""
+
+import sys
+
+import pytest
+
+from lazy_imports import LazyModule
+
+
+@pytest.fixture
+def module_dir(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield tmp_path
+    for name in ('lazy_ok', 'lazy_broken', 'lazy_dependent'):
+        sys.modules.pop(name, None)
+
+
+def test_imports_on_first_attribute_access(module_dir):
+    (module_dir / "lazy_ok.py").write_text("VALUE = 42\n")
+    module = LazyModule('lazy_ok')
+    assert not module.loaded
+    assert module.VALUE == 42
+    assert module.loaded
+
+
+def test_missing_module_raises_import_error():
+    module = LazyModule('lazy_does_not_exist')
+    with pytest.raises(ImportError):
+        module.load()
+
+
+def test_any_import_failure_raises_import_error(module_dir):
+    # e.g. "module 'pkgutil' has no attribute 'ImpImporter'" from an old dependency
+    (module_dir / "lazy_broken.py").write_text("import pkgutil\npkgutil.NoSuchImporter\n")
+    module = LazyModule('lazy_broken')
+    with pytest.raises(ImportError) as excinfo:
+        module.load()
+    assert isinstance(excinfo.value.__cause__, AttributeError)
+    assert not module.loaded
+
+
+def test_failing_requirement_raises_import_error(module_dir):
+    (module_dir / "lazy_broken.py").write_text("raise RuntimeError('native library missing')\n")
+    (module_dir / "lazy_dependent.py").write_text("VALUE = 1\n")
+    module = LazyModule('lazy_dependent', requires=['lazy_broken'])
+    with pytest.raises(ImportError, match="native library missing"):
+        module.VALUE
@@ -0,0 +1,121 @@
+"""
+Tests for the memory-budgeted model registry
+"""
+
+import time
+from types import SimpleNamespace
+
+from model_registry import ModelRegistry
+from translation_memory import MB
+
+
+def make_translation(tmp_path, from_code: str, to_code: str, size_mb: float):
+    package_path = tmp_path / f"translate-{from_code}_{to_code}"
+    (package_path / "model").mkdir(parents=True)
+    (package_path / "model" / "model.bin").write_bytes(b"\0" * int(size_mb * MB))
+    pkg = SimpleNamespace(from_code=from_code, to_code=to_code, package_path=package_path)
+    return SimpleNamespace(pkg=pkg, translator=object())
+
+
+def resident_pairs(registry):
+    return [(model['from_code'], model['to_code']) for model in registry.resident()]
+
+
+def test_unlimited_budget_keeps_everything(tmp_path):
+    registry = ModelRegistry()
+    for to_code in ('de', 'fr', 'es'):
+        registry.add(make_translation(tmp_path, 'en', to_code, 1))
+    assert len(registry.resident()) == 3
+    assert registry.evictions == 0
+
+
+def test_budget_evicts_least_recently_used(tmp_path):
+    registry = ModelRegistry(memory_budget_mb=2.5)
+    german = make_translation(tmp_path, 'en', 'de', 1)
+    french = make_translation(tmp_path, 'en', 'fr', 1)
+    registry.add(german)
+    registry.add(french)
+    with registry.use([german]):
+        pass
+    
+    spanish = make_translation(tmp_path, 'en', 'es', 1)
+    registry.add(spanish)
+    
+    assert resident_pairs(registry) == [('en', 'de'), ('en', 'es')]
+    assert french.translator is None
+    assert german.translator is not None
+    assert registry.evictions == 1
+
+
+def test_most_recent_model_survives_a_small_budget(tmp_path):
+    registry = ModelRegistry(memory_budget_mb=0.5)
+    registry.add(make_translation(tmp_path, 'en', 'de', 1))
+    assert resident_pairs(registry) == [('en', 'de')]
+
+
+def test_models_in_use_are_not_evicted(tmp_path):
+    registry = ModelRegistry(memory_budget_mb=1.5)
+    german = make_translation(tmp_path, 'en', 'de', 1)
+    french = make_translation(tmp_path, 'en', 'fr', 1)
+    registry.add(german)
+    with registry.use([german]):
+        registry.add(french)
+        assert german.translator is not None
+    # Released: now the least recently used one goes
+    assert len(registry.resident()) == 1
+
+
+def test_shrinking_the_budget_evicts_right_away(tmp_path):
+    registry = ModelRegistry()
+    for to_code in ('de', 'fr', 'es'):
+        registry.add(make_translation(tmp_path, 'en', to_code, 1))
+    registry.configure(memory_budget_mb=1.5)
+    assert resident_pairs(registry) == [('en', 'es')]
+    assert registry.evictions == 2
+
+
+def test_idle_models_are_unloaded(tmp_path):
+    registry = ModelRegistry(idle_timeout=0.05)
+    german = make_translation(tmp_path, 'en', 'de', 0.1)
+    registry.add(german)
+    time.sleep(0.1)
+    registry.evict_idle()
+    assert registry.resident() == []
+    assert german.translator is None
+
+
+def test_clear_waits_for_models_in_use(tmp_path):
+    registry = ModelRegistry()
+    german = make_translation(tmp_path, 'en', 'de', 0.1)
+    registry.add(german)
+    with registry.use([german]):
+        registry.clear()
+        assert german.translator is not None
+    assert german.translator is None
+    assert registry.resident() == []
+
+
+def test_release_of_a_stale_model_keeps_its_replacement(tmp_path):
+    registry = ModelRegistry()
+    old = make_translation(tmp_path, 'en', 'de', 0.1)
+    registry.add(old)
+    with registry.use([old]):
+        # Packages changed while translating; the pair is loaded again meanwhile
+        registry.clear()
+        new = SimpleNamespace(pkg=old.pkg, translator=object())
+        registry.add(new)
+    
+    assert old.translator is None
+    assert new.translator is not None
+    assert resident_pairs(registry) == [('en', 'de')]
+
+
+def test_replacing_a_model_unloads_the_previous_one(tmp_path):
+    registry = ModelRegistry()
+    old = make_translation(tmp_path, 'en', 'de', 0.1)
+    registry.add(old)
+    
+    registry.add(SimpleNamespace(pkg=old.pkg, translator=object()))
+    
+    assert old.translator is None
+    assert len(registry.resident()) == 1
@@ -0,0 +1,424 @@
+"""
+Tests for package_manager against a stub HTTP server on localhost
+"""
+
+import hashlib
+import json
+import threading
+import time
+from types import SimpleNamespace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from package_manager import (DownloadError, DownloadManager, InstalledPackageRegistry, PackageIndex,
+                             PackageIndexCache)
+
+
+def available_package(from_code: str, from_name: str, to_code: str, to_name: str):
+    return SimpleNamespace(code=f"translate-{from_code}_{to_code}", from_code=from_code, from_name=from_name,
+                           to_code=to_code, to_name=to_name, package_version='1.0')
+
+
+@pytest.fixture
+def package_index():
+    return PackageIndex([
+        available_package('en', 'English', 'de', 'German'),
+        available_package('de', 'German', 'en', 'English'),
+        available_package('en', 'English', 'es', 'Spanish'),
+        available_package('pt', 'Portuguese', 'en', 'English'),
+    ], [available_package('en', 'English', 'de', 'German')])
+
+
+def search_codes(package_index, query):
+    return [pkg.code for pkg in package_index.search(query)]
+
+
+def test_empty_query_returns_every_package(package_index):
+    assert search_codes(package_index, "  ") == [pkg.code for pkg in package_index.packages]
+
+
+def test_short_terms_match_word_prefixes(package_index):
+    assert search_codes(package_index, "es") == ["translate-en_es"]
+    assert search_codes(package_index, "p") == ["translate-pt_en"]
+    # "es" inside "portuguese" is not the start of a word
+    assert "translate-pt_en" not in search_codes(package_index, "es")
+
+
+def test_long_terms_match_substrings(package_index):
+    assert search_codes(package_index, "erman") == ["translate-en_de", "translate-de_en"]
+    assert search_codes(package_index, "GERMAN") == ["translate-en_de", "translate-de_en"]
+    assert search_codes(package_index, "en-es") == ["translate-en_es"]
+
+
+def test_trigrams_out_of_order_do_not_match(package_index):
+    # "man" (german) and "ans" (translate) are both in the en-de text, "mans" is not
+    assert search_codes(package_index, "mans") == []
+
+
+def test_every_term_must_match(package_index):
+    assert search_codes(package_index, "english spanish") == ["translate-en_es"]
+    assert search_codes(package_index, "german spanish") == []
+
+
+def test_lookup_by_code_and_installed_pair(package_index):
+    assert package_index.by_code["translate-pt_en"].from_name == 'Portuguese'
+    assert package_index.is_installed(package_index.by_code["translate-en_de"])
+    assert not package_index.is_installed(package_index.by_code["translate-de_en"])
+
+
+class StubServer:
+    """Serves files from memory and records the requests it gets"""
+    
+    def __init__(self):
+        self.files = {}
+        self.requests = []
+        # path -> bytes to send before dropping the connection (once)
+        self.drop_after = {}
+        # paths that answer a Range request with the whole file
+        self.ignore_range = set()
+        # path -> ETag sent with the file and matched against If-None-Match
+        self.etags = {}
+        # Seconds to wait before answering
+        self.delay = 0
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+            
+            def do_GET(self):
+                server.handle(self)
+        
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+    
+    def url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}{path}"
+    
+    def handle(self, request: BaseHTTPRequestHandler):
+        self.requests.append((request.path, dict(request.headers)))
+        time.sleep(self.delay)
+        data = self.files.get(request.path)
+        if data is None:
+            request.send_error(404)
+            return
+        etag = self.etags.get(request.path)
+        if etag is not None and request.headers.get('If-None-Match') == etag:
+            request.send_response(304)
+            request.end_headers()
+            return
+        
+        start = 0
+        range_header = request.headers.get('Range')
+        if range_header and request.path not in self.ignore_range:
+            start = int(range_header.split('=')[1].split('-')[0])
+            request.send_response(206)
+            request.send_header('Content-Range', f"bytes {start}-{len(data) - 1}/{len(data)}")
+        else:
+            request.send_response(200)
+        request.send_header('Content-Length', str(len(data) - start))
+        if etag is not None:
+            request.send_header('ETag', etag)
+        request.end_headers()
+        
+        body = data[start:]
+        limit = self.drop_after.pop(request.path, None)
+        if limit is not None:
+            request.wfile.write(body[:limit])
+            request.wfile.flush()
+            request.close_connection = True
+            request.connection.shutdown(2)
+            return
+        request.wfile.write(body)
+    
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    stub = StubServer()
+    yield stub
+    stub.close()
+
+
+@pytest.fixture
+def manager(tmp_path):
+    download_manager = DownloadManager(tmp_path / "downloads", max_downloads=2, retries=2, timeout=5)
+    download_manager.RETRY_DELAY = 0.01
+    yield download_manager
+    download_manager.shutdown()
+
+
+def sha256(data: bytes):
+    return 'sha256', hashlib.sha256(data).hexdigest()
+
+
+def test_download(server, manager):
+    data = bytes(range(256)) * 1000
+    server.files['/a.argosmodel'] = data
+    progress = []
+    
+    path = manager.download('a.argosmodel', [server.url('/a.argosmodel')], sha256(data),
+                            lambda done, total: progress.append((done, total)))
+    
+    assert path.read_bytes() == data
+    assert progress[-1] == (len(data), len(data))
+    assert not (manager.downloads_dir / 'a.argosmodel.part').exists()
+
+
+def test_resume_after_dropped_connection(server, manager):
+    data = bytes(range(256)) * 1000
+    server.files['/a.argosmodel'] = data
+    server.drop_after['/a.argosmodel'] = 100000
+    
+    path = manager.download('a.argosmodel', [server.url('/a.argosmodel')], sha256(data))
+    
+    assert path.read_bytes() == data
+    ranges = [headers.get('Range') for _, headers in server.requests]
+    assert ranges == [None, 'bytes=100000-']
+
+
+def test_restart_when_range_is_ignored(server, manager):
+    data = bytes(range(256)) * 1000
+    server.files['/a.argosmodel'] = data
+    server.drop_after['/a.argosmodel'] = 100000
+    server.ignore_range.add('/a.argosmodel')
+    
+    path = manager.download('a.argosmodel', [server.url('/a.argosmodel')], sha256(data))
+    
+    # The second response is a 200 with the whole file, which replaces the partial one
+    assert path.read_bytes() == data
+    assert server.requests[1][1].get('Range') == 'bytes=100000-'
+
+
+def test_checksum_mismatch(server, manager):
+    server.files['/a.argosmodel'] = b'not the expected content'
+    
+    with pytest.raises(DownloadError, match='checksum mismatch'):
+        manager.download('a.argosmodel', [server.url('/a.argosmodel')], ('sha256', '0' * 64))
+    assert not (manager.downloads_dir / 'a.argosmodel').exists()
+    assert not (manager.downloads_dir / 'a.argosmodel.part').exists()
+
+
+def test_falls_back_to_other_mirror(server, manager):
+    data = b'package' * 100
+    server.files['/good.argosmodel'] = data
+    
+    path = manager.download('a.argosmodel', [server.url('/missing'), server.url('/good.argosmodel')])
+    
+    assert path.read_bytes() == data
+
+
+def test_submit_deduplicates_and_runs_then(server, manager):
+    data = b'package' * 100
+    server.files['/a.argosmodel'] = data
+    installed = []
+    
+    first = manager.submit('a.argosmodel', [server.url('/a.argosmodel')],
+                           then=lambda path: installed.append(path.read_bytes()) or 'installed')
+    second = manager.submit('a.argosmodel', [server.url('/a.argosmodel')])
+    
+    assert first.result(timeout=10) == 'installed'
+    second.result(timeout=10)
+    # Either the running download was shared or the finished file was reused
+    assert len(server.requests) == 1
+    assert installed == [data]
+
+
+def test_partial_download_resumed_in_next_run(server, manager):
+    data = bytes(range(256)) * 1000
+    server.files['/a.argosmodel'] = data
+    server.drop_after['/a.argosmodel'] = 100000
+    manager.retries = 0
+    with pytest.raises(DownloadError):
+        manager.download('a.argosmodel', [server.url('/a.argosmodel')], version='1.0')
+    
+    path = manager.download('a.argosmodel', [server.url('/a.argosmodel')], sha256(data), version='1.0')
+    
+    assert path.read_bytes() == data
+    assert server.requests[-1][1].get('Range') == 'bytes=100000-'
+
+
+def test_partial_download_of_other_version_is_discarded(server, manager):
+    old = b'old version' * 1000
+    new = b'new version' * 1000
+    server.files['/a.argosmodel'] = old
+    server.drop_after['/a.argosmodel'] = 5000
+    manager.retries = 0
+    with pytest.raises(DownloadError):
+        manager.download('a.argosmodel', [server.url('/a.argosmodel')], version='1.0')
+    
+    server.files['/a.argosmodel'] = new
+    path = manager.download('a.argosmodel', [server.url('/a.argosmodel')], version='1.1')
+    
+    assert path.read_bytes() == new
+    assert server.requests[-1][1].get('Range') is None
+
+
+def test_finished_download_reused_only_for_same_version(server, manager):
+    server.files['/a.argosmodel'] = b'first'
+    manager.download('a.argosmodel', [server.url('/a.argosmodel')], version='1.0')
+    server.files['/a.argosmodel'] = b'second'
+    
+    assert manager.download('a.argosmodel', [server.url('/a.argosmodel')], version='1.0').read_bytes() == b'first'
+    assert manager.download('a.argosmodel', [server.url('/a.argosmodel')], version='1.1').read_bytes() == b'second'
+
+
+def test_discard_forgets_the_file(server, manager):
+    server.files['/a.argosmodel'] = b'package'
+    manager.download('a.argosmodel', [server.url('/a.argosmodel')], version='1.0')
+    
+    manager.discard('a.argosmodel')
+    
+    assert list(manager.downloads_dir.iterdir()) == []
+    manager.download('a.argosmodel', [server.url('/a.argosmodel')], version='1.0')
+    assert len(server.requests) == 2
+
+
+@pytest.fixture
+def index_cache(server, tmp_path):
+    server.files['/index.json'] = json.dumps([{'code': 'translate-en_de'}]).encode()
+    server.etags['/index.json'] = '"v1"'
+    return PackageIndexCache(server.url('/index.json'), tmp_path / "index.json", ttl=3600, timeout=5)
+
+
+def test_index_downloaded_when_missing(server, index_cache):
+    assert not index_cache.is_fresh()
+    assert index_cache.ensure_fresh()
+    assert json.loads(index_cache.path.read_text()) == [{'code': 'translate-en_de'}]
+    assert index_cache.is_fresh()
+
+
+def test_index_not_requested_within_ttl(server, index_cache):
+    index_cache.ensure_fresh()
+    assert not index_cache.ensure_fresh()
+    assert len(server.requests) == 1
+
+
+def test_unchanged_index_is_revalidated(server, index_cache):
+    index_cache.refresh()
+    modified = index_cache.path.stat().st_mtime_ns
+    
+    assert not index_cache.refresh()
+    assert server.requests[-1][1].get('If-None-Match') == '"v1"'
+    assert index_cache.path.stat().st_mtime_ns == modified
+
+
+def test_changed_index_is_replaced(server, index_cache):
+    index_cache.refresh()
+    server.files['/index.json'] = json.dumps([{'code': 'translate-de_en'}]).encode()
+    server.etags['/index.json'] = '"v2"'
+    
+    assert index_cache.refresh()
+    assert json.loads(index_cache.path.read_text()) == [{'code': 'translate-de_en'}]
+
+
+def test_expired_index_is_checked_again(server, index_cache):
+    index_cache.ensure_fresh()
+    index_cache.ttl = 0
+    assert not index_cache.is_fresh()
+    index_cache.ensure_fresh()
+    assert len(server.requests) == 2
+
+
+def test_broken_index_keeps_old_one(server, index_cache):
+    index_cache.refresh()
+    server.files['/index.json'] = b'[{"code": '
+    server.etags['/index.json'] = '"v2"'
+    
+    with pytest.raises(ValueError):
+        index_cache.refresh()
+    assert json.loads(index_cache.path.read_text()) == [{'code': 'translate-en_de'}]
+
+
+def test_concurrent_refreshes_share_one_request(server, index_cache):
+    server.delay = 0.3
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(index_cache.refresh())) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert results == [True] * 5
+    assert len(server.requests) == 1
+
+
+def install_package(package_dir, from_code: str, to_code: str):
+    path = package_dir / f"translate-{from_code}_{to_code}"
+    path.mkdir()
+    (path / "metadata.json").write_text(json.dumps({'from_code': from_code, 'to_code': to_code}))
+    return SimpleNamespace(code=f"translate-{from_code}_{to_code}", type='translate', package_version='1.0',
+                           from_code=from_code, from_name=from_code.upper(), to_code=to_code,
+                           to_name=to_code.upper(), package_path=path)
+
+
+@pytest.fixture
+def package_dir(tmp_path):
+    path = tmp_path / "packages"
+    path.mkdir()
+    return path
+
+
+@pytest.fixture
+def registry(package_dir):
+    return InstalledPackageRegistry([package_dir], package_dir / ".gui-registry.json")
+
+
+def test_registry_round_trip(package_dir, registry):
+    packages = [install_package(package_dir, 'en', 'de'), install_package(package_dir, 'de', 'en')]
+    signature = registry.signature()
+    assert registry.packages(signature) is None
+    
+    registry.save_packages(signature, packages)
+    registry.save_languages(signature, [SimpleNamespace(name='English', code='en')])
+    
+    # Writing the registry file itself does not change the signature
+    assert registry.signature() == signature
+    assert registry.packages(signature) == packages
+    assert [(lang.name, lang.code) for lang in registry.languages(signature)] == [('English', 'en')]
+
+
+def test_registry_records_package_paths(package_dir, registry):
+    pkg = install_package(package_dir, 'en', 'de')
+    signature = registry.signature()
+    assert registry.package_paths(signature) is None
+    
+    registry.save_package_paths(signature, {('en', 'de'): pkg.package_path})
+    
+    assert registry.package_paths(signature) == {('en', 'de'): pkg.package_path}
+    install_package(package_dir, 'en', 'fr')
+    assert registry.package_paths(registry.signature()) is None
+
+
+def test_registry_invalidated_by_install_and_uninstall(package_dir, registry):
+    pkg = install_package(package_dir, 'en', 'de')
+    signature = registry.signature()
+    registry.save_packages(signature, [pkg])
+    
+    install_package(package_dir, 'en', 'fr')
+    assert registry.signature() != signature
+    
+    signature = registry.signature()
+    (pkg.package_path / "metadata.json").unlink()
+    pkg.package_path.rmdir()
+    assert registry.signature() != signature
+
+
+def test_registry_invalidated_by_update(package_dir, registry):
+    pkg = install_package(package_dir, 'en', 'de')
+    signature = registry.signature()
+    (pkg.package_path / "metadata.json").write_text(json.dumps({'from_code': 'en', 'to_code': 'de',
+                                                                 'package_version': '2.0'}))
+    assert registry.signature() != signature
+
+
+def test_damaged_registry_is_ignored(package_dir, registry):
+    signature = registry.signature()
+    registry.path.write_text('not json')
+    assert registry.packages(signature) is None
+    assert registry.languages(signature) is None
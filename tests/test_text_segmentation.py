@@ -0,0 +1,103 @@
+"""
+Tests for sentence splitting, reassembly and batching
+"""
+
+import pytest
+
+from text_segmentation import join_segments, make_batches, match_unchanged, split_sentences
+
+
+def texts(text):
+    return [segment.text for segment in split_sentences(text)]
+
+
+def test_split_on_terminal_punctuation():
+    assert texts("One. Two! Three? Four") == ["One.", "Two!", "Three?", "Four"]
+
+
+def test_split_on_line_breaks():
+    assert texts("Title\n\nFirst line.\nSecond line") == ["Title", "First line.", "Second line"]
+
+
+def test_closing_quotes_stay_with_sentence():
+    assert texts('He said "Stop." Then he left.') == ['He said "Stop."', "Then he left."]
+
+
+def test_full_width_terminators():
+    assert texts("今日は晴れ。明日は雨！") == ["今日は晴れ。", "明日は雨！"]
+
+
+@pytest.mark.parametrize("text", [
+    "Dr. Smith arrived. He sat down.",
+    "See fig. 3 for details. It shows the trend.",
+    "J. R. Tolkien wrote it. It is long.",
+    "The U.S. economy grew. Prices fell.",
+    "Use a tool, e.g. a hammer. Then stop.",
+    "She has a Ph.D. in physics. She teaches.",
+    "See No. 5 on the list. It is marked.",
+])
+def test_abbreviations_do_not_end_sentences(text):
+    assert len(texts(text)) == 2
+
+
+def test_no_ends_a_sentence_unless_a_number_follows():
+    assert texts("No. I refuse.") == ["No.", "I refuse."]
+
+
+def test_english_abbreviations_only_apply_to_english():
+    assert [segment.text for segment in split_sentences("Dijo que no. Luego se fue.", 'es')] == [
+        "Dijo que no.", "Luego se fue."]
+    assert [segment.text for segment in split_sentences("Es el fig. Luego.", 'es')] == ["Es el fig.", "Luego."]
+    assert len(split_sentences("See fig. 3 for details.", 'en')) == 1
+    # Initials are not language specific
+    assert len(split_sentences("J. R. Tolkien wrote it. It is long.", 'de')) == 2
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "   ",
+    "Plain text without punctuation",
+    "  Leading and trailing space.  Next one.  \n\n  Last\n",
+    "Mixed 😀 emoji. And 漢字。 Done!",
+])
+def test_offsets_round_trip(text):
+    segments = split_sentences(text)
+    for segment in segments:
+        assert text[segment.start:segment.end] == segment.text
+        assert segment.text == segment.text.strip()
+    assert join_segments(text, segments, [segment.text for segment in segments]) == text
+
+
+def test_join_keeps_layout():
+    text = "First.  Second.\n\nThird."
+    segments = split_sentences(text)
+    assert join_segments(text, segments, ["1", "2", "3"]) == "1  2\n\n3"
+
+
+def test_make_batches_covers_every_item_once():
+    items = ["x" * length for length in (5, 50, 6, 48, 7, 300)]
+    batches = make_batches(items, 2)
+    assert sorted(index for batch in batches for index in batch) == list(range(len(items)))
+    assert all(len(batch) <= 2 for batch in batches)
+
+
+def test_match_unchanged_after_an_edit():
+    previous = ["One.", "Two.", "Three."]
+    current = ["One.", "Two, edited.", "Three."]
+    assert match_unchanged(previous, current) == {0: 0, 2: 2}
+
+
+def test_match_unchanged_after_an_insertion():
+    previous = ["One.", "Two."]
+    current = ["Zero.", "One.", "Two."]
+    assert match_unchanged(previous, current) == {1: 0, 2: 1}
+
+
+def test_moved_sentence_is_not_matched():
+    previous = ["A.", "B.", "C.", "D."]
+    current = ["B.", "C.", "D.", "A."]
+    assert match_unchanged(previous, current) == {0: 1, 1: 2, 2: 3}
+
+
+def test_repeated_sentences_match_once_each():
+    assert match_unchanged(["Yes."], ["Yes.", "Yes."]) == {0: 0}
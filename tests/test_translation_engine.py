@@ -0,0 +1,275 @@
+"""
+Tests for the translation engine and incremental translation, with fake Argos Translate languages
+"""
+
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+import translation_engine
+from translation_engine import IncrementalTranslator, TranslationEngine
+
+
+class FakeTranslation:
+    """Package-backed translation whose model is already loaded"""
+    
+    def __init__(self, from_lang, to_lang, version: str):
+        self.from_lang = from_lang
+        self.to_lang = to_lang
+        self.pkg = SimpleNamespace(from_code=from_lang.code, to_code=to_lang.code, package_version=version)
+        self.translator = object()
+    
+    def translate(self, sentence: str) -> str:
+        return f"{self.to_lang.code}:{sentence}"
+
+
+class FakeLanguage:
+    def __init__(self, code: str, name: str = ''):
+        self.code = code
+        self.name = name or code.upper()
+        self.translations_from = []
+        self.translations_to = []
+        self.resolved = 0
+    
+    def get_translation(self, to_lang):
+        self.resolved += 1
+        return next((t for t in self.translations_from if t.to_lang.code == to_lang.code), None)
+
+
+class FakeArgos:
+    """Stands in for argostranslate.translate, counting package scans"""
+    
+    def __init__(self, pairs, version: str = '1.0'):
+        self.scans = 0
+        self.install(pairs, version)
+    
+    def install(self, pairs, version: str = '1.0'):
+        self.languages = {}
+        for from_code, to_code in pairs:
+            from_lang = self.languages.setdefault(from_code, FakeLanguage(from_code))
+            to_lang = self.languages.setdefault(to_code, FakeLanguage(to_code))
+            from_lang.translations_from.append(FakeTranslation(from_lang, to_lang, version))
+    
+    def get_installed_languages(self):
+        self.scans += 1
+        return list(self.languages.values())
+
+
+@pytest.fixture
+def argos(monkeypatch):
+    fake = FakeArgos([('en', 'de'), ('de', 'en')])
+    monkeypatch.setattr(translation_engine, 'translate', fake)
+    return fake
+
+
+def test_languages_are_loaded_on_first_use(argos):
+    engine = TranslationEngine()
+    
+    assert engine.translate_segments(["Hello."], 'en', 'de') == ["de:Hello."]
+    assert argos.scans == 1
+
+
+def test_first_resolution_is_cached_under_the_package_version(argos):
+    engine = TranslationEngine()
+    
+    first = engine.get_translation('en', 'de')
+    second = engine.get_translation('en', 'de')
+    
+    assert first is second
+    assert argos.languages['en'].resolved == 1
+
+
+def test_unknown_language(argos):
+    engine = TranslationEngine()
+    with pytest.raises(ValueError, match="Language not installed: fr"):
+        engine.get_translation('en', 'fr')
+
+
+def test_invalidate_reloads_installed_packages(argos):
+    engine = TranslationEngine()
+    engine.get_translation('en', 'de')
+    
+    argos.install([('en', 'de'), ('en', 'fr')], version='1.1')
+    engine.invalidate()
+    
+    assert engine.translate_segments(["Hello."], 'en', 'fr') == ["fr:Hello."]
+    assert engine.get_translation('en', 'de').pkg.package_version == '1.1'
+    assert argos.scans == 2
+
+
+def test_invalidate_does_not_wait_for_a_package_scan(argos):
+    engine = TranslationEngine()
+    scanning = threading.Event()
+    release = threading.Event()
+    scan = argos.get_installed_languages
+    
+    def slow_scan():
+        scanning.set()
+        release.wait(5)
+        return scan()
+    
+    argos.get_installed_languages = slow_scan
+    resolved = []
+    thread = threading.Thread(target=lambda: resolved.append(engine.get_translation('en', 'de')))
+    thread.start()
+    assert scanning.wait(5)
+    
+    # Returns while the other thread is still scanning
+    finished = threading.Event()
+    threading.Thread(target=lambda: (engine.invalidate(), finished.set())).start()
+    assert finished.wait(1)
+    
+    release.set()
+    thread.join(5)
+    assert resolved and resolved[0].to_lang.code == 'de'
+    # The scan invalidate() overtook was repeated
+    assert argos.scans == 2
+
+
+class FakePackage:
+    """Stands in for argostranslate.package.Package, reading a package directory"""
+    
+    loaded = []
+    
+    def __init__(self, package_path):
+        FakePackage.loaded.append(package_path)
+        self.package_path = package_path
+        self.from_code, self.to_code, self.package_version = package_path.name.split('_')
+        self.from_name = self.from_code.upper()
+        self.to_name = self.to_code.upper()
+
+
+class FakePackageTranslation(FakeTranslation):
+    def __init__(self, from_lang, to_lang, pkg):
+        super().__init__(from_lang, to_lang, pkg.package_version)
+        self.pkg = pkg
+
+
+@pytest.fixture
+def package_argos(argos, monkeypatch):
+    argos.Language = FakeLanguage
+    argos.PackageTranslation = FakePackageTranslation
+    argos.CachedTranslation = lambda underlying: underlying
+    FakePackage.loaded = []
+    monkeypatch.setattr(translation_engine, 'package', SimpleNamespace(Package=FakePackage))
+    return argos
+
+
+def test_known_package_path_skips_the_scan(package_argos, tmp_path):
+    engine = TranslationEngine()
+    engine.set_package_paths({('en', 'de'): tmp_path / "en_de_1.0"})
+    
+    assert engine.translate_segments(["Hello."], 'en', 'de') == ["de:Hello."]
+    assert package_argos.scans == 0
+    assert FakePackage.loaded == [tmp_path / "en_de_1.0"]
+
+
+def test_translation_loaded_from_its_package_survives_the_first_scan(package_argos, tmp_path):
+    engine = TranslationEngine()
+    engine.set_package_paths({('en', 'de'): tmp_path / "en_de_1.0"})
+    from_package = engine.get_translation('en', 'de')
+    
+    # A pair without a recorded directory needs every package
+    engine.get_translation('de', 'en')
+    
+    assert package_argos.scans == 1
+    assert engine.get_translation('en', 'de') is from_package
+
+
+def test_unreadable_package_path_falls_back_to_a_scan(package_argos, tmp_path):
+    engine = TranslationEngine()
+    engine.set_package_paths({('en', 'de'): tmp_path / "not-a-package"})
+    
+    assert engine.get_translation('en', 'de').to_lang.code == 'de'
+    assert package_argos.scans == 1
+
+
+def test_package_paths_of_a_scan(argos, tmp_path):
+    for language in argos.languages.values():
+        for translation in language.translations_from:
+            translation.pkg.package_path = tmp_path / f"{translation.pkg.from_code}_{translation.pkg.to_code}"
+    engine = TranslationEngine()
+    engine.load_languages()
+    
+    assert engine.package_paths() == {('en', 'de'): tmp_path / "en_de", ('de', 'en'): tmp_path / "de_en"}
+
+
+class RecordingEngine:
+    """Engine stand-in that records which sentences reach the model"""
+    
+    def __init__(self):
+        self.package_signature = frozenset({('en', 'de', '1.0')})
+        self.calls = []
+    
+    def translate_segments(self, sentences, from_code, to_code, on_segment=None, cancelled=None):
+        self.calls.append(list(sentences))
+        results = [f"{to_code}:{sentence}" for sentence in sentences]
+        if on_segment is not None:
+            for index, result in enumerate(results):
+                on_segment(index, result)
+        return results
+
+
+@pytest.fixture
+def incremental():
+    engine = RecordingEngine()
+    return engine, IncrementalTranslator(engine)
+
+
+def test_only_edited_sentences_are_translated_again(incremental):
+    engine, translator = incremental
+    translator.translate_segments(["One.", "Two.", "Three."], 'en', 'de')
+    
+    results = translator.translate_segments(["One.", "Two, edited.", "Three."], 'en', 'de')
+    
+    assert results == ["de:One.", "de:Two, edited.", "de:Three."]
+    assert engine.calls[-1] == ["Two, edited."]
+
+
+def test_moved_sentence_is_translated_again(incremental):
+    engine, translator = incremental
+    translator.translate_segments(["A.", "B.", "C."], 'en', 'de')
+    
+    results = translator.translate_segments(["B.", "C.", "A."], 'en', 'de')
+    
+    assert results == ["de:B.", "de:C.", "de:A."]
+    assert engine.calls[-1] == ["A."]
+
+
+def test_every_segment_is_reported_at_its_position(incremental):
+    engine, translator = incremental
+    translator.translate_segments(["One.", "Two."], 'en', 'de')
+    reported = {}
+    
+    translator.translate_segments(["Zero.", "One.", "Two."], 'en', 'de', reported.__setitem__)
+    
+    assert reported == {0: "de:Zero.", 1: "de:One.", 2: "de:Two."}
+
+
+def test_other_pair_is_not_reused(incremental):
+    engine, translator = incremental
+    translator.translate_segments(["One.", "Two."], 'en', 'de')
+    
+    assert translator.translate_segments(["One.", "Two."], 'en', 'fr') == ["fr:One.", "fr:Two."]
+    assert engine.calls[-1] == ["One.", "Two."]
+
+
+def test_changed_packages_are_not_reused(incremental):
+    engine, translator = incremental
+    translator.translate_segments(["One.", "Two."], 'en', 'de')
+    
+    engine.package_signature = frozenset({('en', 'de', '1.1')})
+    translator.translate_segments(["One.", "Two."], 'en', 'de')
+    
+    assert engine.calls[-1] == ["One.", "Two."]
+
+
+def test_reset_forgets_the_previous_run(incremental):
+    engine, translator = incremental
+    translator.translate_segments(["One."], 'en', 'de')
+    
+    translator.reset()
+    translator.translate_segments(["One."], 'en', 'de')
+    
+    assert engine.calls == [["One."], ["One."]]
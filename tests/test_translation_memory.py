@@ -0,0 +1,74 @@
+"""
+Tests for the two-tier translation memory
+"""
+
+from translation_memory import MB, TranslationMemory, normalize_segment
+
+
+def test_normalize_collapses_whitespace():
+    assert normalize_segment("  Hello \t\n world  ") == "Hello world"
+
+
+def test_lookup_ignores_whitespace_differences():
+    memory = TranslationMemory()
+    memory.store('en', 'de', '1.0', ["Hello  world"], ["Hallo Welt"])
+    assert memory.lookup('en', 'de', '1.0', [" Hello world\n", "Other"]) == {0: "Hallo Welt"}
+    assert memory.stats()['hits'] == 1
+    assert memory.stats()['misses'] == 1
+
+
+def test_key_includes_pair_and_package_version():
+    memory = TranslationMemory()
+    memory.store('en', 'de', '1.0', ["Hello"], ["Hallo"])
+    assert memory.lookup('en', 'fr', '1.0', ["Hello"]) == {}
+    assert memory.lookup('de', 'en', '1.0', ["Hello"]) == {}
+    assert memory.lookup('en', 'de', '1.1', ["Hello"]) == {}
+
+
+def test_memory_tier_evicts_least_recently_used():
+    entry_size = TranslationMemory._entry_size("segment 0", "translation 0")
+    memory = TranslationMemory(memory_limit_mb=(entry_size * 2.5) / MB)
+    for index in range(2):
+        memory.store('en', 'de', '1', [f"segment {index}"], [f"translation {index}"])
+    # Touch segment 0 so segment 1 becomes the least recently used
+    assert memory.lookup('en', 'de', '1', ["segment 0"]) == {0: "translation 0"}
+    memory.store('en', 'de', '1', ["segment 2"], ["translation 2"])
+    
+    assert memory.lookup('en', 'de', '1', ["segment 0", "segment 1", "segment 2"]) == {
+        0: "translation 0",
+        2: "translation 2",
+    }
+    assert memory.stats()['memory_entries'] == 2
+
+
+def test_disk_tier_survives_reopen(tmp_path):
+    db_path = tmp_path / "memory.sqlite3"
+    memory = TranslationMemory(db_path)
+    memory.store('en', 'de', '1', ["Hello"], ["Hallo"])
+    memory.close()
+    
+    reopened = TranslationMemory(db_path)
+    assert reopened.lookup('en', 'de', '1', ["Hello"]) == {0: "Hallo"}
+    assert reopened.stats()['disk_bytes'] > 0
+    reopened.close()
+
+
+def test_disk_tier_evicts_least_recently_used(tmp_path):
+    entry_size = TranslationMemory._entry_size("segment 00", "translation 00")
+    memory = TranslationMemory(tmp_path / "memory.sqlite3", memory_limit_mb=0,
+                               disk_limit_mb=(entry_size * 10) / MB)
+    for index in range(20):
+        memory.store('en', 'de', '1', [f"segment {index:02}"], [f"translation {index:02}"])
+    
+    found = memory.lookup('en', 'de', '1', [f"segment {index:02}" for index in range(20)])
+    assert memory.stats()['disk_bytes'] <= entry_size * 10
+    # The newest entries are kept, the oldest are gone
+    assert 19 in found and 0 not in found
+    memory.close()
+
+
+def test_configure_shrinks_memory_tier():
+    memory = TranslationMemory()
+    memory.store('en', 'de', '1', [f"s{index}" for index in range(10)], [f"t{index}" for index in range(10)])
+    memory.configure(memory_limit_mb=0)
+    assert memory.stats()['memory_entries'] == 0
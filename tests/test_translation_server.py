@@ -0,0 +1,119 @@
+"""
+Tests for the local HTTP translation API, served on localhost
+"""
+
+import json
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from types import SimpleNamespace
+
+import pytest
+
+from model_registry import ModelRegistry
+from translation_server import TranslationServer
+
+
+class FakeEngine:
+    """Tags sentences with the target language; only en->de is installed"""
+    
+    max_batch_size = 32
+    
+    def __init__(self):
+        self.models = ModelRegistry()
+        english = SimpleNamespace(code='en', name='English', translations_from=[])
+        german = SimpleNamespace(code='de', name='German', translations_from=[])
+        english.translations_from.append(SimpleNamespace(to_lang=german))
+        self.languages = [english, german]
+    
+    def translate_segments(self, sentences, from_code, to_code):
+        if (from_code, to_code) != ('en', 'de'):
+            raise RuntimeError(f"No installed translation from {from_code} to {to_code}")
+        return [f"[{to_code}] {sentence}" for sentence in sentences]
+
+
+@pytest.fixture
+def server():
+    translation_server = TranslationServer(FakeEngine(), port=0, max_delay_ms=1)
+    thread = threading.Thread(target=translation_server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield translation_server
+    translation_server.shutdown()
+    translation_server.server_close()
+    translation_server.scheduler.shutdown()
+
+
+def request(server, path, body=None, content_type='application/json'):
+    """Send a request and return (status, decoded JSON body)"""
+    url = f"http://127.0.0.1:{server.server_address[1]}{path}"
+    data = None
+    if body is not None:
+        data = json.dumps(body).encode('utf-8') if content_type == 'application/json' else body.encode('utf-8')
+    http_request = urllib.request.Request(url, data=data, headers={'Content-Type': content_type})
+    try:
+        with urllib.request.urlopen(http_request, timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_languages(server):
+    status, languages = request(server, '/languages')
+    assert status == 200
+    assert languages == [{'code': 'en', 'name': 'English', 'targets': ['de']},
+                         {'code': 'de', 'name': 'German', 'targets': []}]
+
+
+def test_translate_json(server):
+    status, result = request(server, '/translate', {'q': "Hello. Bye.", 'source': 'en', 'target': 'de'})
+    assert status == 200
+    assert result == {'translatedText': "[de] Hello. [de] Bye."}
+
+
+def test_translate_list(server):
+    status, result = request(server, '/translate', {'q': ["One.", "Two.\nThree."], 'source': 'en', 'target': 'de'})
+    assert result == {'translatedText': ["[de] One.", "[de] Two.\n[de] Three."]}
+
+
+def test_translate_form_encoded(server):
+    body = urllib.parse.urlencode({'q': "Hello.", 'source': 'en', 'target': 'de'})
+    status, result = request(server, '/translate', body, 'application/x-www-form-urlencoded')
+    assert status == 200
+    assert result == {'translatedText': "[de] Hello."}
+
+
+def test_same_language_is_passed_through(server):
+    status, result = request(server, '/translate', {'q': "Hallo.", 'source': 'de', 'target': 'de'})
+    assert result == {'translatedText': "Hallo."}
+
+
+@pytest.mark.parametrize("body, message", [
+    ({'q': "Hi."}, "'source' and 'target' are required"),
+    ({'q': "Hi.", 'source': 'auto', 'target': 'de'}, "detection is not supported"),
+    ({'q': 5, 'source': 'en', 'target': 'de'}, "'q' must be a string"),
+    ([1, 2], "must be a JSON object"),
+])
+def test_bad_requests(server, body, message):
+    status, result = request(server, '/translate', body)
+    assert status == 400
+    assert message in result['error']
+
+
+def test_engine_errors_are_server_errors(server):
+    status, result = request(server, '/translate', {'q': "Hi.", 'source': 'en', 'target': 'ja'})
+    assert status == 500
+    assert "No installed translation from en to ja" in result['error']
+
+
+def test_unknown_paths(server):
+    assert request(server, '/nowhere')[0] == 404
+    assert request(server, '/languages', {})[0] == 404
+
+
+def test_stats(server):
+    request(server, '/translate', {'q': "Hi.", 'source': 'en', 'target': 'de'})
+    status, stats = request(server, '/stats')
+    assert status == 200
+    assert stats['models'] == {'resident': [], 'evictions': 0}
+    assert set(stats['scheduler']) == set(server.scheduler.stats())
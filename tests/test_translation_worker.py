@@ -0,0 +1,113 @@
+"""
+Tests for the latest-request-wins translation worker
+"""
+
+import threading
+
+import pytest
+
+from translation_worker import TranslationWorker
+
+
+class BlockingHandler:
+    """Records jobs; the first one blocks until released"""
+    
+    def __init__(self):
+        self.jobs = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self._finished = threading.Condition()
+        self.finished = 0
+    
+    def __call__(self, request_id, text):
+        self.jobs.append((request_id, text))
+        if len(self.jobs) == 1:
+            self.started.set()
+            self.release.wait(5)
+        with self._finished:
+            self.finished += 1
+            self._finished.notify_all()
+    
+    def wait_finished(self, count: int) -> bool:
+        with self._finished:
+            return self._finished.wait_for(lambda: self.finished >= count, 5)
+
+
+@pytest.fixture
+def handler():
+    return BlockingHandler()
+
+
+@pytest.fixture
+def worker(handler):
+    translation_worker = TranslationWorker(handler, max_pending=1)
+    yield translation_worker
+    handler.release.set()
+    translation_worker.shutdown(timeout=5)
+
+
+def test_runs_submitted_job(worker, handler):
+    request_id = worker.submit("hello")
+    handler.release.set()
+    assert handler.wait_finished(1)
+    assert handler.jobs == [(request_id, "hello")]
+    assert worker.is_current(request_id)
+
+
+def test_waiting_jobs_are_superseded(worker, handler):
+    worker.submit("first")
+    assert handler.started.wait(5)
+    worker.submit("second")
+    third = worker.submit("third")
+    
+    handler.release.set()
+    assert handler.wait_finished(2)
+    
+    # "second" was dropped from the queue without running
+    assert [text for _, text in handler.jobs] == ["first", "third"]
+    assert handler.jobs[-1][0] == third
+
+
+def test_running_job_learns_it_was_superseded(worker, handler):
+    first = worker.submit("first")
+    assert handler.started.wait(5)
+    
+    second = worker.submit("second")
+    
+    assert not worker.is_current(first)
+    assert worker.is_current(second)
+    assert worker.latest_request_id == second
+
+
+def test_cancel_supersedes_without_a_new_job(worker, handler):
+    worker.submit("first")
+    assert handler.started.wait(5)
+    pending = worker.submit("second")
+    
+    worker.cancel()
+    handler.release.set()
+    worker.shutdown(timeout=5)
+    
+    assert not worker.is_current(pending)
+    assert [text for _, text in handler.jobs] == ["first"]
+
+
+def test_failing_job_does_not_stop_the_worker(capsys):
+    failed = threading.Event()
+    ran = threading.Event()
+    
+    def handler(request_id, text):
+        if text == "fail":
+            failed.set()
+            raise RuntimeError("model crashed")
+        ran.set()
+    
+    worker = TranslationWorker(handler)
+    try:
+        worker.submit("fail")
+        assert failed.wait(5)
+        worker.submit("ok")
+        assert ran.wait(5)
+    finally:
+        worker.shutdown(timeout=5)
+    assert "model crashed" in capsys.readouterr().out